@@ -0,0 +1,129 @@
+"""Compare reading tasks from the TaskChampion replica with `task export`.
+
+Run with `uv run python benchmarks/bench_data_sources.py [SIZES...]`. For every size a replica with that many tasks is
+generated. If the `task` CLI is installed, the same tasks are imported into a scratch taskwarrior data directory and
+exported through the CLI as well. Otherwise only the JSON decoding that follows a `task export` is measured, which is a
+lower bound for the subprocess backend.
+"""
+
+import json
+import os
+import shutil
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+from typing import Callable
+from uuid import uuid4
+
+from task_tui.data_sources import REPLICA_FILE_NAME, TaskChampionSource
+from task_tui.task_cli import BaseTaskCli
+from task_tui.utils import format_task_datetime
+
+DEFAULT_SIZES = [1_000, 10_000, 100_000]
+PROJECTS = ["home", "work", "work.reports", "garden", None]
+
+
+def generate_records(count: int) -> list[dict[str, str]]:
+    start = datetime(2024, 1, 1, tzinfo=UTC)
+    records: list[dict[str, str]] = []
+    for index in range(count):
+        entry = start + timedelta(minutes=index)
+        record = {
+            "uuid": str(uuid4()),
+            "description": f"Benchmark task number {index}",
+            "status": "pending" if index % 3 else "completed",
+            "entry": str(int(entry.timestamp())),
+            "modified": str(int(entry.timestamp()) + 60),
+        }
+        project = PROJECTS[index % len(PROJECTS)]
+        if project is not None:
+            record["project"] = project
+        if index % 4 == 0:
+            record["due"] = str(int((entry + timedelta(days=7)).timestamp()))
+        if index % 5 == 0:
+            record["tag_next"] = ""
+        records.append(record)
+    return records
+
+
+def write_replica(path: Path, records: list[dict[str, str]]) -> None:
+    connection = sqlite3.connect(path)
+    connection.execute("CREATE TABLE tasks (uuid STRING PRIMARY KEY, data STRING)")
+    connection.execute("CREATE TABLE working_set (id INTEGER PRIMARY KEY, uuid STRING)")
+    rows = [(r["uuid"], json.dumps({k: v for k, v in r.items() if k != "uuid"})) for r in records]
+    connection.executemany("INSERT INTO tasks VALUES (?, ?)", rows)
+    pending = [r["uuid"] for r in records if r["status"] == "pending"]
+    connection.executemany("INSERT INTO working_set VALUES (?, ?)", list(enumerate(pending, start=1)))
+    connection.commit()
+    connection.close()
+
+
+def to_export_json(record: dict[str, str], id: int) -> dict[str, object]:
+    exported: dict[str, object] = {"id": id, "urgency": 0.0, "tags": [], "depends": []}
+    for key, value in record.items():
+        if key in {"entry", "modified", "due"}:
+            exported[key] = format_task_datetime(datetime.fromtimestamp(int(value), UTC))
+        elif key.startswith("tag_"):
+            exported["tags"] = [key[4:]]
+        else:
+            exported[key] = value
+    return exported
+
+
+def best_of(repeat: int, function: Callable[[], object]) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def bench_size(count: int, scratch: Path) -> None:
+    records = generate_records(count)
+    replica_dir = scratch / f"replica-{count}"
+    replica_dir.mkdir()
+    write_replica(replica_dir / REPLICA_FILE_NAME, records)
+    source = TaskChampionSource(replica_dir / REPLICA_FILE_NAME)
+    repeat = 3 if count >= 100_000 else 5
+
+    sqlite_time = best_of(repeat, lambda: source.export("all", "", None))
+    print(f"{count:>8} tasks  taskchampion replica     {sqlite_time * 1000:9.1f} ms  {count / sqlite_time:10.0f} tasks/s")
+
+    ids = iter(range(1, count + 1))
+    export_lines = "\n".join(json.dumps(to_export_json(r, next(ids) if r["status"] == "pending" else 0)) for r in records)
+    parse_time = best_of(repeat, lambda: BaseTaskCli()._parse_export(export_lines))
+    print(f"{count:>8} tasks  export JSON decode only  {parse_time * 1000:9.1f} ms  {count / parse_time:10.0f} tasks/s")
+
+    if shutil.which("task") is None:
+        return
+    task_dir = scratch / f"task-{count}"
+    task_dir.mkdir()
+    environment = {**os.environ, "TASKDATA": str(task_dir), "TASKRC": os.devnull}
+    import_file = scratch / f"import-{count}.json"
+    import_file.write_text("[" + ",".join(json.dumps(to_export_json(r, 0)) for r in records) + "]")
+    subprocess.run(["task", "rc.confirmation=off", "import", str(import_file)], env=environment, capture_output=True, check=True)
+
+    def task_export() -> None:
+        completed = subprocess.run(["task", "rc.json.array=0", "export", "all"], env=environment, capture_output=True, text=True)
+        BaseTaskCli()._parse_export(completed.stdout)
+
+    cli_time = best_of(repeat, task_export)
+    print(f"{count:>8} tasks  task export subprocess   {cli_time * 1000:9.1f} ms  {count / cli_time:10.0f} tasks/s")
+
+
+def main() -> None:
+    sizes = [int(size) for size in sys.argv[1:]] or DEFAULT_SIZES
+    if shutil.which("task") is None:
+        print("`task` is not installed, only measuring the JSON decoding of the subprocess backend")
+    with tempfile.TemporaryDirectory() as scratch:
+        for count in sizes:
+            bench_size(count, Path(scratch))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""Compare the throughput of the ways to decode `task export` output into `Task` models.
+
+Run with `uv run python benchmarks/bench_decoders.py [SIZES...]`. Every size is exported once as JSON lines
+(`rc.json.array=0`, what the streaming export reads) and once as a JSON array (`rc.json.array=1`, what a complete export
+reads), with dates in taskwarrior's compact format. Decoders that need an optional dependency (orjson) are skipped if it
+isn't installed.
+"""
+
+import json
+import sys
+from datetime import UTC, datetime, timedelta
+from uuid import uuid4
+
+from bench_data_sources import best_of
+
+from task_tui.data_models import Task
+from task_tui.decoders import available_decoders
+from task_tui.utils import format_task_datetime
+
+DEFAULT_SIZES = [1_000, 10_000, 100_000]
+PROJECTS = ["home", "work", "work.reports", "garden", None]
+
+
+def generate_export(count: int) -> list[dict[str, object]]:
+    start = datetime(2024, 1, 1, tzinfo=UTC)
+    tasks: list[dict[str, object]] = []
+    for index in range(count):
+        entry = start + timedelta(minutes=index)
+        task: dict[str, object] = {
+            "id": index + 1,
+            "description": f"Benchmark task number {index}",
+            "entry": format_task_datetime(entry),
+            "modified": format_task_datetime(entry + timedelta(minutes=1)),
+            "status": "pending",
+            "uuid": str(uuid4()),
+            "urgency": 1.5,
+        }
+        project = PROJECTS[index % len(PROJECTS)]
+        if project is not None:
+            task["project"] = project
+        if index % 4 == 0:
+            task["due"] = format_task_datetime(entry + timedelta(days=7))
+        if index % 5 == 0:
+            task["tags"] = ["next", "review"]
+        if index % 10 == 0:
+            task["annotations"] = [{"entry": format_task_datetime(entry), "description": "a note"}]
+        tasks.append(task)
+    return tasks
+
+
+def report(count: int, name: str, seconds: float) -> None:
+    print(f"{count:>8} tasks  {name:<28} {seconds * 1000:9.1f} ms  {count / seconds:10.0f} tasks/s")
+
+
+def bench_size(count: int) -> None:
+    tasks = generate_export(count)
+    lines = "\n".join(json.dumps(task, separators=(",", ":")) for task in tasks)
+    array = json.dumps(tasks, separators=(",", ":"))
+    repeat = 3 if count >= 100_000 else 5
+
+    # the decoding before the bulk decoders: one validation per line of an `rc.json.array=0` export
+    report(count, "per line, gc enabled", best_of(repeat, lambda: [Task.model_validate_json(line) for line in lines.split("\n")]))
+    for name, decoder in available_decoders().items():
+        report(count, f"{name} lines", best_of(repeat, lambda: [decoder.decode_line(line) for line in lines.split("\n")]))
+        report(count, f"{name} array", best_of(repeat, lambda: decoder.decode_array(array)))
+
+
+def main() -> None:
+    sizes = [int(size) for size in sys.argv[1:]] or DEFAULT_SIZES
+    print(f"available decoders: {', '.join(available_decoders())}")
+    for count in sizes:
+        bench_size(count)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""Measure how long switching to another context takes when its filter is evaluated in-process.
+
+Run with `uv run python benchmarks/bench_filters.py [SIZES...]`. The first switch builds the filter indexes of the
+report's tasks, later switches reuse them; both include building the filtered store, as the app does. Compare with the
+`task export` of the report, which a context switch had to wait for before.
+"""
+
+import sys
+
+from bench_data_sources import best_of
+from bench_table_preparation import generate_tasks
+
+from task_tui.app import TaskStore
+from task_tui.config import Config
+from task_tui.filters import parse_filter
+from task_tui.utils import get_current_datetime
+
+DEFAULT_SIZES = [10_000, 50_000]
+FILTERS = ["project:home", "( +next or project.not:home ) and due.before:eom", "-next"]
+
+
+def report(count: int, name: str, seconds: float) -> None:
+    print(f"{count:>8} tasks  {name:<56} {seconds * 1000:9.1f} ms")
+
+
+def bench_size(count: int) -> None:
+    config = Config("")
+    store = TaskStore(generate_tasks(count), config)
+    for text in FILTERS:
+        task_filter = parse_filter(text, get_current_datetime())
+
+        def switch() -> None:
+            TaskStore(store.select(task_filter), config)
+
+        store.refresh_virtual_tags(config)
+        report(count, f"{text} (cold)", best_of(1, switch))
+        report(count, f"{text} (warm)", best_of(5, switch))
+
+
+def main() -> None:
+    sizes = [int(size) for size in sys.argv[1:]] or DEFAULT_SIZES
+    for count in sizes:
+        bench_size(count)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""Measure showing a huge report and moving around in it.
+
+Run with `uv run python benchmarks/bench_large_report.py [SIZES...]`. The app runs headless without talking to
+taskwarrior. The report is shown in an empty table and painted, then the cursor is moved by a page and by a row, each
+including the repaint. Reports of `VIRTUAL_REPORT_SIZE` tasks or more are read by the table as they are shown; up to
+`MATERIALIZED_SIZES` tasks they are also shown with every row added to the table, for comparison. The memory is the
+peak traced by `tracemalloc` while showing the report, it is measured in a separate run as tracing slows it down.
+"""
+
+import asyncio
+import sys
+import time
+import tracemalloc
+from typing import Awaitable, Callable
+from unittest.mock import patch
+
+from bench_table_preparation import HEADINGS, generate_tasks
+from bench_table_update import HeadlessApp
+
+import task_tui.app
+from task_tui.app import TaskStore
+from task_tui.config import Config
+from task_tui.widgets import TaskReport
+
+DEFAULT_SIZES = [10_000, 150_000]
+# adding every row takes about a minute for 150k tasks
+MATERIALIZED_SIZES = 20_000
+
+
+def report(count: int, name: str, seconds: float, peak: int | None = None) -> None:
+    memory = "" if peak is None else f" {peak / 2**20:9.1f} MiB"
+    print(f"{count:>8} tasks  {name:<40} {seconds * 1000:9.1f} ms{memory}")
+
+
+async def timed(function: Callable[[], Awaitable[object]]) -> float:
+    started = time.perf_counter()
+    await function()
+    return time.perf_counter() - started
+
+
+async def bench_size(count: int, mode: str) -> None:
+    app = HeadlessApp("next")
+    async with app.run_test(size=(160, 50)) as pilot:
+        table = app.query_one(TaskReport)
+        app.headings = HEADINGS
+        app.tasks = TaskStore(generate_tasks(count), Config(""))
+        # the store's columns are formatted once for either table
+        app._prepare_columns()
+
+        async def show() -> None:
+            app._update_table()
+            await pilot.pause()
+
+        seconds = await timed(show)
+        tracemalloc.start()
+        table.clear(columns=True)
+        app._table_columns = []
+        await show()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        report(count, f"{mode}: show the report", seconds, peak)
+        table.focus()
+
+        async def page_down() -> None:
+            table.action_page_down()
+            await pilot.pause()
+
+        report(count, f"{mode}: page down", min([await timed(page_down) for _ in range(5)]))
+
+        async def cursor_down() -> None:
+            table.action_cursor_down()
+            await pilot.pause()
+
+        report(count, f"{mode}: cursor down", min([await timed(cursor_down) for _ in range(5)]))
+
+
+def main() -> None:
+    sizes = [int(size) for size in sys.argv[1:]] or DEFAULT_SIZES
+    for count in sizes:
+        if count >= task_tui.app.VIRTUAL_REPORT_SIZE:
+            asyncio.run(bench_size(count, "virtual"))
+        if count <= MATERIALIZED_SIZES:
+            with patch.object(task_tui.app, "VIRTUAL_REPORT_SIZE", sys.maxsize):
+                asyncio.run(bench_size(count, "materialized"))
+
+
+if __name__ == "__main__":
+    main()
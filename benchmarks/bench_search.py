@@ -0,0 +1,63 @@
+"""Measure the incremental search over task descriptions and annotations, keystroke by keystroke.
+
+Run with `uv run python benchmarks/bench_search.py [SIZES...]`. The generated descriptions are drawn from a vocabulary
+of random words, like real ones they share most words with other tasks, and every tenth task has an annotation. The
+index is built by the first search of a report; after that every keystroke of a query is timed, including a single
+letter that matches most tasks, and so is keeping the index current when a task changes.
+"""
+
+import random
+import sys
+
+from bench_data_sources import best_of
+from bench_table_preparation import generate_tasks
+
+from task_tui.app import TaskStore
+from task_tui.config import Config
+from task_tui.data_models import Annotation, Task
+
+DEFAULT_SIZES = [10_000, 100_000]
+VOCABULARY_SIZE = 20_000
+WORDS_PER_DESCRIPTION = 6
+
+
+def report(count: int, name: str, seconds: float) -> None:
+    print(f"{count:>8} tasks  {name:<40} {seconds * 1000:9.3f} ms")
+
+
+def generate_searchable_tasks(count: int) -> list[Task]:
+    rng = random.Random(count)
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    vocabulary = ["".join(rng.choices(letters, k=rng.randint(3, 10))) for _ in range(VOCABULARY_SIZE)]
+    tasks = generate_tasks(count)
+    for index, task in enumerate(tasks):
+        task.description = " ".join(rng.choices(vocabulary, k=WORDS_PER_DESCRIPTION)).capitalize()
+        if index % 10 == 0:
+            task.annotations = [Annotation(description=" ".join(rng.choices(vocabulary, k=WORDS_PER_DESCRIPTION)))]
+    return tasks
+
+
+def bench_size(count: int) -> None:
+    tasks = generate_searchable_tasks(count)
+    config = Config("")
+    store = TaskStore(tasks, config)
+    # the description of a task in the middle, typed up to its third word
+    query = " ".join(tasks[count // 2].description.split()[:3])
+    report(count, "build index (first search)", best_of(1, lambda: store.search(query)))
+    for length in range(1, len(query) + 1):
+        prefix = query[:length]
+        matches = len(store.search(prefix))
+        report(count, f"{prefix!r} ({matches} matches)", best_of(5, lambda: store.search(prefix)))
+
+    changed = [task.model_copy(update={"description": task.description + " changed"}) for task in tasks[:100]]
+    report(count, "update 100 tasks", best_of(1, lambda: [store.update_task(task) for task in changed]))
+
+
+def main() -> None:
+    sizes = [int(size) for size in sys.argv[1:]] or DEFAULT_SIZES
+    for count in sizes:
+        bench_size(count)
+
+
+if __name__ == "__main__":
+    main()
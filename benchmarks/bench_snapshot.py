@@ -0,0 +1,45 @@
+"""Measure saving and loading the startup snapshot of a large report.
+
+Run with `uv run python benchmarks/bench_snapshot.py [SIZES...]`. Loading includes the check of the modification
+times and validating the tasks, i.e. everything before the first paint; the size is that of the compressed file.
+"""
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+from bench_data_sources import best_of
+from bench_table_preparation import HEADINGS, generate_tasks
+
+from task_tui.config import Config
+from task_tui.snapshot import Snapshot, load_snapshot, save_snapshot
+
+DEFAULT_SIZES = [10_000, 50_000]
+
+
+def report(count: int, name: str, seconds: float, size: int | None = None) -> None:
+    file_size = "" if size is None else f" {size / 2**10:9.1f} KiB"
+    print(f"{count:>8} tasks  {name:<24} {seconds * 1000:9.1f} ms{file_size}")
+
+
+def bench_size(count: int, scratch: Path) -> None:
+    path = scratch / f"{count}.snapshot"
+    snapshot = Snapshot(generate_tasks(count), Config(""), HEADINGS)
+    report(count, "save", best_of(3, lambda: save_snapshot(path, snapshot)), path.stat().st_size)
+    assert load_snapshot(path) is not None
+    report(count, "load", best_of(3, lambda: load_snapshot(path)))
+
+
+def main() -> None:
+    sizes = [int(size) for size in sys.argv[1:]] or DEFAULT_SIZES
+    with tempfile.TemporaryDirectory() as scratch:
+        # a data directory of its own, so that the snapshot isn't outdated by a running taskwarrior
+        os.environ["TASKRC"] = os.path.join(scratch, "taskrc")
+        os.environ["TASKDATA"] = os.path.join(scratch, "data")
+        for count in sizes:
+            bench_size(count, Path(scratch))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""Measure styling the rows of a large report with taskwarrior's color rules.
+
+Run with `uv run python benchmarks/bench_styles.py [SIZES...]`. The rules are those of taskwarrior's default theme plus
+a rule per project, tag, keyword and UDA value. Styling every task is timed with compiled rules whose memo is empty,
+which is what the first table update after loading the config costs, with a warm memo, and with every task's style
+merged from all rules without the memo, for comparison.
+"""
+
+import sys
+
+from bench_data_sources import best_of
+from bench_table_preparation import generate_tasks
+
+from task_tui.config import Config
+from task_tui.styles import ColorRules
+
+DEFAULT_SIZES = [10_000, 50_000]
+COLOR_CONFIG = """
+rule.precedence.color deleted,completed,active,keyword.,tag.,project.,overdue,scheduled,due.today,due,blocked,blocking,recurring,tagged,uda.
+color.active rgb555 on rgb410
+color.blocked white on color8
+color.blocking black on color15
+color.completed black on rgb013
+color.deleted black on rgb100
+color.due color1
+color.due.today rgb400
+color.overdue color9
+color.recurring rgb013
+color.scheduled on rgb001
+color.tagged rgb031
+color.project.home cyan
+color.project.none color8
+color.tag.next bold
+color.tag.none yellow
+color.keyword.number underline
+color.uda.priority.H color255
+color.uda.priority.L color245
+color.uda.priority.M color250
+"""
+
+
+def report(count: int, name: str, seconds: float) -> None:
+    print(f"{count:>8} tasks  {name:<24} {seconds * 1000:9.1f} ms")
+
+
+def bench_size(count: int) -> None:
+    tasks = generate_tasks(count)
+    config = Config(COLOR_CONFIG.strip())
+
+    def cold() -> None:
+        rules = ColorRules(config.color, config.color_precedence)
+        for task in tasks:
+            rules.style_for(task)
+
+    report(count, "cold memo", best_of(3, cold))
+    rules = config.color_rules
+    report(count, "warm memo", best_of(3, lambda: [rules.style_for(task) for task in tasks]))
+    report(count, "without the memo", best_of(3, lambda: [rules._merge_styles(rules._key(task)) for task in tasks]))
+
+
+def main() -> None:
+    sizes = [int(size) for size in sys.argv[1:]] or DEFAULT_SIZES
+    for count in sizes:
+        bench_size(count)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""Measure how long `_update_table` takes to prepare the rows of a large report, before any widget is touched.
+
+Run with `uv run python benchmarks/bench_table_preparation.py [SIZES...]`. The preparation is timed three times:
+with a cold column cache (what every table update cost before the columns were cached), with a warm cache and after
+changing a single task, which is what a mutation followed by an incremental refresh or an optimistic update costs.
+Updating the relative dates whose text changed within an hour is timed as well, that is what keeps them current, and
+so is sorting by the report's sort order and by another column, once with cold and once with cached sort keys. The
+last row is computing the urgency of every task locally, which the TaskChampion replica doesn't store.
+"""
+
+import sys
+from datetime import UTC, datetime, timedelta
+from uuid import UUID
+
+from bench_data_sources import best_of
+
+from task_tui.app import TaskStore, TaskTuiApp
+from task_tui.config import Config
+from task_tui.data_models import Status, Task
+from task_tui.sorting import parse_sort
+from task_tui.utils import get_current_datetime
+
+DEFAULT_SIZES = [10_000, 50_000]
+# the columns of taskwarrior's default `next` report
+HEADINGS = [
+    ("id", "ID"),
+    ("start.age", "Active"),
+    ("entry.age", "Age"),
+    ("depends.indicator", "D"),
+    ("priority", "P"),
+    ("project", "Project"),
+    ("tags", "Tag"),
+    ("recur.indicator", "R"),
+    ("scheduled.countdown", "S"),
+    ("due.relative", "Due"),
+    ("until.remaining", "Until"),
+    ("description.count", "Description"),
+    ("urgency", "Urg"),
+]
+
+
+def generate_tasks(count: int) -> list[Task]:
+    start = datetime(2024, 1, 1, tzinfo=UTC)
+    tasks: list[Task] = []
+    for index in range(count):
+        entry = start + timedelta(minutes=index)
+        tasks.append(
+            Task(
+                id=index + 1,
+                description=f"Benchmark task number {index}",
+                entry=entry,
+                modified=entry,
+                due=entry + timedelta(days=7) if index % 4 == 0 else None,
+                status=Status.PENDING,
+                uuid=UUID(int=index + 1),
+                urgency=1.0,
+                project="home" if index % 2 else None,
+                tags={"next"} if index % 5 == 0 else set(),
+                depends={UUID(int=index)} if index % 10 == 1 else set(),
+            )
+        )
+    return tasks
+
+
+def prepare_rows(app: TaskTuiApp) -> list[tuple[object, ...]]:
+    columns, _ = app._prepare_columns()
+    return list(zip(*(app.tasks.get_column(column) for column in columns)))
+
+
+def report(count: int, name: str, seconds: float) -> None:
+    print(f"{count:>8} tasks  {name:<24} {seconds * 1000:9.1f} ms")
+
+
+def bench_size(count: int) -> None:
+    tasks = generate_tasks(count)
+    app = TaskTuiApp("next")
+    app.headings = HEADINGS
+
+    cold_timings = []
+    for _ in range(5):
+        app.tasks = TaskStore(tasks, Config(""))
+        cold_timings.append(best_of(1, lambda: prepare_rows(app)))
+    report(count, "cold cache", min(cold_timings))
+    report(count, "warm cache", best_of(5, lambda: prepare_rows(app)))
+
+    def after_change() -> None:
+        task = app.tasks[count // 2]
+        app.tasks.update_task(task.model_copy(update={"description": task.description + "!"}))
+        prepare_rows(app)
+
+    report(count, "after one task changed", best_of(5, after_change))
+
+    app.tasks = TaskStore(tasks, Config(""))
+    prepare_rows(app)
+    later = get_current_datetime() + timedelta(hours=1)
+    report(count, "live ages after an hour", best_of(1, lambda: app.tasks.update_live_ages(later)))
+
+    orders = [parse_sort("urgency-,due+"), parse_sort("project+/,entry-")]
+    app.tasks = TaskStore(tasks, Config(""))
+    report(count, "sort (cold keys)", best_of(1, lambda: [app.tasks.sort(order) for order in orders]) / len(orders))
+    report(count, "sort (cached keys)", best_of(3, lambda: [app.tasks.sort(order) for order in orders]) / len(orders))
+    report(count, "urgency of all tasks", best_of(3, lambda: app.tasks.refresh_urgency()))
+
+
+def main() -> None:
+    sizes = [int(size) for size in sys.argv[1:]] or DEFAULT_SIZES
+    for count in sizes:
+        bench_size(count)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""Measure how long `_update_table` takes to bring a mounted table up to date with the store.
+
+Run with `uv run python benchmarks/bench_table_update.py [SIZES...]`. The app runs headless without talking to
+taskwarrior. The first rows fill the empty table and rebuild it after its columns changed. The former update cleared
+the table and added every row with `add_row` and `set_row_style`, which repaint the cursor's row every time; that is
+timed for comparison with the updates after a mutation: one task changed, one removed and one added, and all tasks in
+another order. All of them include styling every task. From `VIRTUAL_REPORT_SIZE` tasks on, the table reads the rows
+as they are shown instead, see `bench_large_report.py`.
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+from bench_data_sources import best_of
+from bench_table_preparation import HEADINGS, generate_tasks
+from textual import on
+from textual.events import Mount
+
+import task_tui.app
+from task_tui.app import TaskStore, TaskTuiApp
+from task_tui.config import Config
+from task_tui.sorting import SortKey
+from task_tui.utils import get_style_for_task
+from task_tui.widgets import TaskReport
+
+# the former update takes quadratic time, so larger reports take minutes
+DEFAULT_SIZES = [1_000, 10_000]
+
+
+class HeadlessApp(TaskTuiApp):
+    # a relative path would be resolved next to this file
+    CSS_PATH = Path(task_tui.app.__file__).parent / "TasTuiApp.tscc"
+
+    @on(Mount)
+    def _skip_export(self, event: Mount) -> None:
+        # the tasks are set by the benchmark instead of being exported, so `TaskTuiApp.on_mount` isn't called
+        event.prevent_default()
+
+
+def report(count: int, name: str, seconds: float) -> None:
+    print(f"{count:>8} tasks  {name:<32} {seconds * 1000:9.1f} ms")
+
+
+async def bench_size(count: int) -> None:
+    tasks = generate_tasks(count)
+    app = HeadlessApp("next")
+    async with app.run_test():
+        table = app.query_one(TaskReport)
+        app.headings = HEADINGS
+        app.tasks = TaskStore(tasks, Config(""))
+        report(count, "fill the empty table", best_of(1, app._update_table))
+
+        def rebuild() -> None:
+            table.clear(columns=True)
+            app._update_table()
+
+        report(count, "after the columns changed", best_of(3, rebuild))
+
+        def former_update() -> None:
+            table.clear(columns=True)
+            table.clear_row_styles()
+            columns, labels = app._prepare_columns()
+            table.add_columns(*labels)
+            rows = zip(*(app.tasks.get_column(column) for column in columns))
+            for task, row in zip(app.tasks, rows):
+                row_key = table.add_row(*row, key=str(task.uuid))
+                table.set_row_style(row_key, get_style_for_task(task, app.config))
+
+        report(count, "former clear and rebuild", best_of(1, former_update))
+        table.clear(columns=True)
+        app._update_table()
+
+        def change_one() -> None:
+            task = app.tasks[count // 2]
+            app.tasks.update_task(task.model_copy(update={"description": task.description + "!"}))
+            app._update_table()
+
+        report(count, "after one task changed", best_of(5, change_one))
+
+        def remove_and_add() -> None:
+            removed = app.tasks.remove([app.tasks[count // 3].uuid])
+            app.tasks.extend(removed)
+            app._update_table()
+
+        report(count, "after one removed and one added", best_of(5, remove_and_add))
+
+        def reverse() -> None:
+            app.sort_column = SortKey("id", descending=app.sort_column is None or not app.sort_column.descending)
+            app._update_table()
+
+        report(count, "after reversing the order", best_of(3, reverse))
+
+
+def main() -> None:
+    sizes = [int(size) for size in sys.argv[1:]] or DEFAULT_SIZES
+    for count in sizes:
+        asyncio.run(bench_size(count))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,31 +1,62 @@
+import asyncio
 import logging
+from contextlib import aclosing
+from datetime import date, datetime, timedelta
 from enum import Enum, auto
 from itertools import compress
-from typing import Any
+from pathlib import Path
+from typing import Any, Iterable, Iterator
 from uuid import UUID
 
-from textual import on
+from rich.style import Style
+from textual import on, work
 from textual.app import App, ComposeResult
 from textual.binding import Binding
 from textual.containers import Vertical
+from textual.coordinate import Coordinate
 from textual.message import Message
-from textual.widgets import Footer, TabbedContent, TabPane
+from textual.timer import Timer
+from textual.widgets import Footer, Input, TabbedContent, TabPane
+from textual.widgets.data_table import RowKey
 
 from task_tui.config import Config
-from task_tui.data_models import Status, Task, VirtualTag
-from task_tui.exceptions import TaskStoreError
-from task_tui.task_cli import TaskCli
+from task_tui.daemon import fetch_report
+from task_tui.data_models import ContextInfo, Status, Task, VirtualTag
+from task_tui.data_sources import TaskChampionSource
+from task_tui.dependencies import DependencyGraph
+from task_tui.exceptions import DaemonError, TaskStoreError, UnsupportedFilterError
+from task_tui.filters import FilterIndex, TaskFilter, parse_filter
+from task_tui.live_ages import LiveAgeSchedule
+from task_tui.refresh import PhaseTiming, RefreshPipeline, RefreshRequest, RefreshScheduler, SyncState
+from task_tui.search import SearchIndex
+from task_tui.snapshot import Snapshot, load_snapshot, save_snapshot
+from task_tui.sorting import SortKey, parse_sort, priority_ranks, sort_value, sorts_in_reverse
+from task_tui.task_cli import AsyncTaskCli
+from task_tui.urgency import UrgencyMismatch, UrgencyModel
 from task_tui.utils import (
+    batched_async,
     format_vague_datetime,
+    format_vague_duration,
     get_current_date,
     get_current_datetime,
     get_style_for_task,
 )
-from task_tui.widgets import ConfirmDialog, ContextSelected, ContextSummary, ProjectSummary, TaskReport, TextInput
+from task_tui.widgets import ConfirmDialog, ContextSelected, ContextSummary, ProjectSummary, SearchBar, TaskReport, TextInput
 
 log = logging.getLogger(__name__)
 
-task_cli = TaskCli()
+task_cli = AsyncTaskCli()
+
+# Number of streamed tasks that are collected before they are shown, the first batch is painted before the export is done.
+STREAM_BATCH_SIZE = 500
+# Only show the loading indicator for refreshes that take noticeably long, so quick mutations don't flicker.
+LOADING_INDICATOR_DELAY = 0.2
+# Added to the style of the last row of a group, for the break markers of the report's sort order (e.g. `project+/`).
+GROUP_BREAK_STYLE = Style(underline=True)
+# Longest the due date timer sleeps at once, the monotonic clock of the timer doesn't advance while the machine is suspended.
+DUE_TIMER_MAX_DELAY = 3600.0
+# Reports with at least this many tasks are shown through a `TaskRows` source, which only formats the rows that are shown.
+VIRTUAL_REPORT_SIZE = 2000
 
 
 class DueState(Enum):
@@ -34,7 +65,30 @@ class DueState(Enum):
     DUE = auto()
 
 
+def _get_due_state(due_date: date, today: date, due_days: int) -> DueState | None:
+    due_delta_days = (due_date - today).days
+    if due_delta_days < 0:
+        return DueState.OVERDUE
+    if due_delta_days == 0:
+        return DueState.TODAY
+    if due_delta_days <= due_days:
+        return DueState.DUE
+    return None
+
+
+def _is_empty_cell(value: object) -> bool:
+    return value in ("", None, [])
+
+
 class TaskStore:
+    """The tasks of the report, with lookup indexes and cached table columns.
+
+    Columns (e.g. `store.due`) are formatted once and cached together with the number of non-empty cells, so a table
+    update doesn't have to format or scan every cell again. Changing a task through the store's methods updates the
+    cells of that task; only operations that rebuild the task list drop the whole cache. Relative dates (e.g. "3min")
+    are kept current by `update_live_ages`, which only touches the cells whose text changed.
+    """
+
     tasks: list[Task]
     VAGUE_DATETIME_COLUMNS = {"entry", "modified", "due", "start", "scheduled", "wait", "end", "until"}
 
@@ -42,127 +96,558 @@ class TaskStore:
         if attribute_name not in Task.model_fields:
             msg = "'{0}': object has no attribute '{1}'"
             raise AttributeError(msg.format(type(self).__name__, attribute_name))
-        if attribute_name in self.VAGUE_DATETIME_COLUMNS:
-            return self._get_vague_datetime_column(attribute_name)
-        try:
-            # if there is a special formatting function for this attribute we use that
-            ret = self.__getattribute__(attribute_name)
-        except AttributeError:
-            # otherwise we use the unprocessed values
-            ret = self._get_task_column(attribute_name)
-
-        return ret
+        return self.get_column(attribute_name)
 
     def __getitem__(self, idx: int) -> Task:
         if not isinstance(idx, int):
             raise IndexError("Index needs to be an integer")
         return self.tasks[idx]
 
-    def __init__(self, tasks: list[Task], config: Config) -> None:
-        self.tasks = tasks
-        self._update_virtual_tags(config)
+    def __init__(self, tasks: Iterable[Task], config: Config, virtual_tags: bool = True) -> None:
+        self.tasks = list(tasks)
+        self._priority_ranks = priority_ranks(config.priority_values)
+        self.urgency_model = UrgencyModel(config)
+        # built by the first `search` and kept up to date by every change from then on, unlike the other indexes
+        self._search_index: SearchIndex | None = None
+        self._build_indexes()
+        self.dependency_graph = DependencyGraph(self.tasks)
+        # dependencies dropped by `update_task`, their BLOCKING tag is recomputed by the next `refresh_virtual_tags_around`
+        self._former_dependencies: set[UUID] = set()
+        if virtual_tags:
+            self._update_virtual_tags(config)
+        else:
+            # the tasks were selected from another store, which computed their virtual tags (see `select_store`)
+            self._tags_date = get_current_date()
 
     def __len__(self) -> int:
         return len(self.tasks)
 
+    def __iter__(self) -> Iterator[Task]:
+        return iter(self.tasks)
+
+    def _build_indexes(self) -> None:
+        """Build the uuid -> task, uuid -> row and id -> task lookup tables.
+
+        Duplicates are not rejected here but remembered, so that a lookup of an ambiguous key raises a `TaskStoreError`
+        just like the former linear scans did.
+        """
+        self._columns: dict[str, list[Any]] = {}
+        self._non_empty_cells: dict[str, int] = {}
+        # typed sort keys by column and direction, in row order like the cached columns
+        self._sort_values: dict[tuple[str, bool], list[Any]] = {}
+        # the sort order the rows are in, until a task changes
+        self._sorted_by: list[SortKey] | None = None
+        # when the cached cells of the vague datetime columns change their text
+        self.live_ages = LiveAgeSchedule()
+        self._task_by_uuid: dict[UUID, Task] = {}
+        self._index_by_uuid: dict[UUID, int] = {}
+        self._task_by_id: dict[int, Task] = {}
+        self._uuids_by_due_date: dict[date, set[UUID]] = {}
+        self._duplicate_uuids: set[UUID] = set()
+        self._duplicate_ids: set[int] = set()
+        # built by the first `select`, any change of a task drops it
+        self._filter_index: FilterIndex | None = None
+        for index, task in enumerate(self.tasks):
+            self._index_task(index, task)
+
+    def _index_task(self, index: int, task: Task) -> None:
+        if task.uuid in self._task_by_uuid:
+            self._duplicate_uuids.add(task.uuid)
+        self._task_by_uuid[task.uuid] = task
+        self._index_by_uuid[task.uuid] = index
+        if task.id in self._task_by_id:
+            self._duplicate_ids.add(task.id)
+        self._task_by_id[task.id] = task
+        if task.due is not None:
+            self._uuids_by_due_date.setdefault(task.due.date(), set()).add(task.uuid)
+
+    def _unindex_due_date(self, task: Task) -> None:
+        if task.due is None:
+            return
+        uuids = self._uuids_by_due_date.get(task.due.date(), set())
+        uuids.discard(task.uuid)
+        if not uuids:
+            self._uuids_by_due_date.pop(task.due.date(), None)
+
     def _get_index_by_uuid(self, uuid: UUID) -> int | None:
-        ret = [i for i, t in enumerate(self.tasks) if t.uuid == uuid]
-        if len(ret) > 1:
+        if uuid in self._duplicate_uuids:
             raise TaskStoreError(f"Multiple tasks with the same UUID: {uuid}")
-        return ret[0] if ret else None
+        return self._index_by_uuid.get(uuid)
 
-    def _get_task_by_id(self, id: int) -> Task | None:
-        ret = [t for t in self.tasks if t.id == id]
-        if len(ret) > 1:
+    def _get_task_by_id(self, id: int) -> Task:
+        if id in self._duplicate_ids:
             raise TaskStoreError(f"Multiple tasks with the same ID: {id}")
-        if len(ret) == 0:
+        if id not in self._task_by_id:
             raise TaskStoreError(f"No task with this ID: {id}")
-        return ret[0]
+        return self._task_by_id[id]
 
     def _get_task_by_uuid(self, uuid: UUID) -> Task | None:
-        ret = [t for t in self.tasks if t.uuid == uuid]
-        if len(ret) > 1:
+        if uuid in self._duplicate_uuids:
             raise TaskStoreError(f"Multiple tasks with the same UUID: {uuid}")
-        return ret[0] if ret else None
+        return self._task_by_uuid.get(uuid)
 
-    def _get_task_column(self, col_name: str) -> list[Any]:
-        return [getattr(task, col_name) for task in self.tasks]
+    def get_index_by_id(self, id: int) -> int:
+        """Return the row of the task with the given ID."""
+        task = self._get_task_by_id(id)
+        index = self._get_index_by_uuid(task.uuid)
+        if index is None:
+            raise TaskStoreError(f"No task with this ID: {id}")
+        return index
+
+    def update_task(self, task: Task) -> None:
+        """Replace the task with the same UUID in place, keeping the indexes up to date."""
+        index = self._get_index_by_uuid(task.uuid)
+        if index is None:
+            raise TaskStoreError(f"No task with this UUID: {task.uuid}")
+        previous = self.tasks[index]
+        self.tasks[index] = task
+        self._task_by_uuid[task.uuid] = task
+        if previous.id != task.id and self._task_by_id.get(previous.id) is previous:
+            del self._task_by_id[previous.id]
+        if task.id in self._task_by_id and self._task_by_id[task.id] is not previous:
+            self._duplicate_ids.add(task.id)
+        self._task_by_id[task.id] = task
+        self._former_dependencies.update(previous.depends - task.depends)
+        if previous.due != task.due:
+            self._unindex_due_date(previous)
+            if task.due is not None:
+                self._uuids_by_due_date.setdefault(task.due.date(), set()).add(task.uuid)
+        self.dependency_graph.set_task(task)
+        if self._search_index is not None:
+            self._search_index.set_task(str(task.uuid), task)
+        self._filter_index = None
+        self._sorted_by = None
+        if previous.id != task.id:
+            # dependencies are shown by ID, so the cells of the tasks depending on this one change as well
+            self._drop_column("depends")
+        self._update_cells(index, task)
+
+    def merge(self, changed: Iterable[Task], removed: Iterable[UUID], config: Config) -> None:
+        """Merge the result of an incremental export into the store.
+
+        Changed tasks replace the task with the same UUID (or are appended if they are new) and removed tasks, i.e. tasks
+        that no longer match the report's filter, are dropped. Virtual tags are recomputed for all tasks, as a change of
+        one task can affect the BLOCKED/BLOCKING tags of others.
+        """
+        changed = list(changed)
+        changed_by_uuid = {task.uuid: task for task in changed}
+        removed_uuids = set(removed)
+        merged: list[Task] = []
+        for task in self.tasks:
+            if task.uuid in removed_uuids:
+                continue
+            merged.append(changed_by_uuid.pop(task.uuid, task))
+        merged.extend(task for task in changed_by_uuid.values() if task.uuid not in removed_uuids)
+        self.tasks = merged
+        self._build_indexes()
+        for uuid in removed_uuids:
+            self.dependency_graph.remove_task(uuid)
+            if self._search_index is not None:
+                self._search_index.remove_task(str(uuid))
+        for task in changed:
+            if task.uuid not in removed_uuids:
+                self.dependency_graph.set_task(task)
+                if self._search_index is not None:
+                    self._search_index.set_task(str(task.uuid), task)
+        self.refresh_virtual_tags(config)
+
+    def remove(self, uuids: Iterable[UUID]) -> list[Task]:
+        """Drop the tasks with the given UUIDs and return them.
+
+        Virtual tags of the remaining tasks are not touched, use `refresh_virtual_tags_around` for the removed tasks.
+        """
+        uuids = set(uuids)
+        removed = [task for task in self.tasks if task.uuid in uuids]
+        if removed:
+            self.tasks = [task for task in self.tasks if task.uuid not in uuids]
+            self._build_indexes()
+            for task in removed:
+                self.dependency_graph.remove_task(task.uuid)
+                if self._search_index is not None:
+                    self._search_index.remove_task(str(task.uuid))
+        return removed
+
+    def extend(self, tasks: Iterable[Task]) -> None:
+        """Append tasks, e.g. the next batch of a streamed export.
+
+        Virtual tags are not computed for the new tasks, call `refresh_virtual_tags` once all tasks are added.
+        """
+        # a new task can be the dependency of a task that is already in the store
+        self._drop_column("depends")
+        self._filter_index = None
+        self._sorted_by = None
+        for task in tasks:
+            index = len(self.tasks)
+            self._index_task(index, task)
+            self.tasks.append(task)
+            self.dependency_graph.set_task(task)
+            if self._search_index is not None:
+                self._search_index.set_task(str(task.uuid), task)
+            self._update_cells(index, task)
+
+    def refresh_virtual_tags(self, config: Config) -> None:
+        self._drop_column("virtual_tags")
+        self._filter_index = None
+        self._former_dependencies.clear()
+        for task in self.tasks:
+            task.virtual_tags.clear()
+        self._update_virtual_tags(config)
+
+    def refresh_virtual_tags_around(self, changed: Iterable[Task], config: Config) -> list[Task]:
+        """Recompute the virtual tags affected by changing (or removing) some tasks, without touching all tasks.
 
-    def _get_vague_datetime_column(self, col_name: str) -> list[str]:
+        Besides the changed tasks themselves, the BLOCKED tag of the tasks depending on them and the BLOCKING tag of
+        their dependencies can change. Returns the tasks of the store whose virtual tags were recomputed.
+        """
+        changed = list(changed)
+        # removed tasks are no longer part of the graph, so their former dependencies come from the tasks themselves
+        affected_uuids = self.dependency_graph.neighbourhood(task.uuid for task in changed)
+        affected_uuids.update(uuid for task in changed for uuid in task.depends)
+        affected_uuids.update(self._former_dependencies)
+        self._former_dependencies.clear()
+        affected = [task for uuid in affected_uuids if (task := self._task_by_uuid.get(uuid)) is not None]
+
+        self._drop_column("virtual_tags")
+        self._filter_index = None
+        today = get_current_date()
+        for task in affected:
+            task.virtual_tags.clear()
+            self._add_own_virtual_tags(task, config, today)
+            self._add_dependency_virtual_tags(task)
+        return affected
+
+    def refresh_urgency(self, tasks: Iterable[Task] | None = None) -> list[Task]:
+        """Compute the urgency of some tasks (or all) like taskwarrior would, e.g. after changing them locally.
+
+        Needs the virtual tags, as blocked and blocking tasks have their own coefficients. Returns the tasks whose urgency
+        changed; their cached cells are updated.
+        """
+        tasks = self.tasks if tasks is None else list(tasks)
+        urgencies = self.urgency_model.compute(tasks, get_current_datetime(), self._blocked_tasks)
+        changed = [task for task, urgency in zip(tasks, urgencies) if task.urgency != urgency]
+        for task, urgency in zip(tasks, urgencies):
+            task.urgency = urgency
+        if len(changed) > len(self.tasks) // 2:
+            self._drop_column("urgency")
+            self._sort_values = {key: values for key, values in self._sort_values.items() if key[0] != "urgency"}
+        else:
+            for task in changed:
+                index = self._index_by_uuid.get(task.uuid)
+                if index is not None:
+                    self._update_cells(index, task)
+        if changed:
+            self._sorted_by = None
+        return changed
+
+    def urgency_mismatches(self, tolerance: float) -> list[UrgencyMismatch]:
+        """Compare the exported urgency of every task with the locally computed one, without changing the tasks."""
+        urgencies = self.urgency_model.compute(self.tasks, get_current_datetime(), self._blocked_tasks)
+        return [
+            UrgencyMismatch(task, task.urgency, urgency) for task, urgency in zip(self.tasks, urgencies) if abs(task.urgency - urgency) > tolerance
+        ]
+
+    def _blocked_tasks(self, task: Task) -> list[Task]:
+        dependents = (self._task_by_uuid.get(uuid) for uuid in self.dependency_graph.dependents(task.uuid))
+        return [dependent for dependent in dependents if dependent is not None and dependent.status not in (Status.COMPLETED, Status.DELETED)]
+
+    def sort(self, sort_keys: list[SortKey]) -> bool:
+        """Sort the tasks stably by several columns, the first key being the most significant.
+
+        The typed keys of a column are computed once and reordered along with the cached columns, so sorting again
+        (e.g. by another column) only costs the sorting itself. Returns whether the order of the tasks changed.
+        """
+        if self._sorted_by == sort_keys:
+            return False
+        order = list(range(len(self.tasks)))
+        # sorting by the least significant key first, every later sort keeps the order of equal values
+        for key in reversed(sort_keys):
+            order.sort(key=self._get_sort_values(key).__getitem__, reverse=sorts_in_reverse(key))
+        self._sorted_by = list(sort_keys)
+        if order == list(range(len(self.tasks))):
+            return False
+        self.tasks = [self.tasks[index] for index in order]
+        for values in (*self._columns.values(), *self._sort_values.values()):
+            values[:] = [values[index] for index in order]
+        self._index_by_uuid = {task.uuid: index for index, task in enumerate(self.tasks)}
+        return True
+
+    def group_ends(self, sort_keys: list[SortKey]) -> list[int]:
+        """Return the rows after which the value of a sort key with a break marker (e.g. `project+/`) changes."""
+        ends: set[int] = set()
+        for key in sort_keys:
+            if key.group_break:
+                values = self._get_sort_values(key)
+                ends.update(index for index in range(len(values) - 1) if values[index] != values[index + 1])
+        return sorted(ends)
+
+    def _get_sort_values(self, key: SortKey) -> list[Any]:
+        values = self._sort_values.get((key.column, key.descending))
+        if values is None:
+            values = self._sort_values[(key.column, key.descending)] = [sort_value(task, key, self._priority_ranks) for task in self.tasks]
+        return values
+
+    def select(self, task_filter: TaskFilter) -> list[Task]:
+        """Return the tasks matching the filter, in the order of the store."""
+        if self._filter_index is None:
+            self._filter_index = FilterIndex(self.tasks)
+        # looking up the rows of the matches is cheaper than testing every task, UUIDs are slow to hash
+        rows = sorted(self._index_by_uuid[uuid] for uuid in task_filter.select(self._filter_index))
+        return [self.tasks[row] for row in rows]
+
+    def select_store(self, task_filter: TaskFilter, config: Config) -> "TaskStore":
+        """Return a store of the tasks matching the filter, e.g. the report's tasks in the active context.
+
+        The tasks are shared, not copied, and keep the virtual tags and urgency this store computed with all of its
+        tasks, so a task stays blocked by a dependency that doesn't match the filter. The selection must not compute
+        them itself: tasks are changed in this store, and the selection takes over the result with `update_selected`.
+        """
+        store = TaskStore(self.select(task_filter), config, virtual_tags=False)
+        store._tags_date = self._tags_date
+        return store
+
+    def update_selected(self, tasks: Iterable[Task]) -> None:
+        """Take over the tasks changed in the store this one was selected from, if they are part of the selection."""
+        for task in tasks:
+            if task.uuid in self._task_by_uuid:
+                self.update_task(task)
+
+    def search(self, query: str) -> set[str]:
+        """Return the UUIDs (as row keys) of the tasks whose description or an annotation contains the query, ignoring case."""
+        if self._search_index is None:
+            self._search_index = SearchIndex((str(task.uuid), task) for task in self.tasks)
+        return self._search_index.search(query)
+
+    def get_column(self, column: str) -> list[Any]:
+        """Return the formatted cells of a column, from the cache if possible. The returned list must not be modified."""
+        values = self._columns.get(column)
+        if values is not None:
+            return values
+        if column in self.VAGUE_DATETIME_COLUMNS:
+            now = get_current_datetime()
+            durations = [None if (target := getattr(task, column)) is None else (target - now).total_seconds() for task in self.tasks]
+            values = ["" if seconds is None else format_vague_duration(seconds) for seconds in durations]
+            self.live_ages.schedule_column(column, zip((task.uuid for task in self.tasks), durations), now)
+        elif column == "depends":
+            values = [self._format_depends(task) for task in self.tasks]
+        elif column == "tags":
+            values = [self._format_tags(task) for task in self.tasks]
+        else:
+            values = [getattr(task, column) for task in self.tasks]
+        self._columns[column] = values
+        self._non_empty_cells[column] = len(values) - sum(1 for value in values if _is_empty_cell(value))
+        return values
+
+    def column_is_empty(self, column: str) -> bool:
+        self.get_column(column)
+        return self._non_empty_cells[column] == 0
+
+    def update_live_ages(self, now: datetime) -> list[tuple[Task, str]]:
+        """Update the cached relative date cells whose text has changed by `now`.
+
+        Returns the tasks and columns of the updated cells.
+        """
+        updated: list[tuple[Task, str]] = []
+        for uuid, column in self.live_ages.pop_due(now):
+            index = self._index_by_uuid.get(uuid)
+            values = self._columns.get(column)
+            if index is None or values is None:
+                continue
+            task = self.tasks[index]
+            value = format_vague_datetime(getattr(task, column), now)
+            self._non_empty_cells[column] += (not _is_empty_cell(value)) - (not _is_empty_cell(values[index]))
+            values[index] = value
+            self.live_ages.schedule(uuid, column, getattr(task, column), now)
+            updated.append((task, column))
+        return updated
+
+    def _drop_column(self, column: str) -> None:
+        self._columns.pop(column, None)
+        self._non_empty_cells.pop(column, None)
+
+    def _update_cells(self, index: int, task: Task) -> None:
+        """Update the cached cells and sort keys of the task at `index`, which was replaced or appended."""
+        for (column, descending), sort_values in self._sort_values.items():
+            value = sort_value(task, SortKey(column, descending), self._priority_ranks)
+            if index < len(sort_values):
+                sort_values[index] = value
+            else:
+                sort_values.append(value)
         now = get_current_datetime()
-        return [format_vague_datetime(getattr(task, col_name), now) for task in self.tasks]
+        for column, values in self._columns.items():
+            value = self._format_cell(task, column, now)
+            if index < len(values):
+                self._non_empty_cells[column] -= not _is_empty_cell(values[index])
+                values[index] = value
+            else:
+                values.append(value)
+            self._non_empty_cells[column] += not _is_empty_cell(value)
+            if column in self.VAGUE_DATETIME_COLUMNS:
+                self.live_ages.schedule(task.uuid, column, getattr(task, column), now)
+
+    def next_due_boundary(self, config: Config) -> date | None:
+        """Return the next day on which the due tags of a task change, or None if no task is due.
+
+        That is the day a task enters the `due` window, is due today or becomes overdue.
+        """
+        due_window = timedelta(days=config.due)
+        one_day = timedelta(days=1)
+        boundaries = (
+            boundary
+            for due_date in self._uuids_by_due_date
+            for boundary in (due_date - due_window, due_date, due_date + one_day)
+            if boundary > self._tags_date
+        )
+        return min(boundaries, default=None)
+
+    def refresh_due_virtual_tags(self, config: Config) -> list[Task]:
+        """Recompute the virtual tags of the tasks whose due state changed since the tags were computed, e.g. at midnight.
+
+        Only the due date index is scanned, so this is cheap enough to run from a timer. Returns the updated tasks.
+        """
+        today = get_current_date()
+        previous, self._tags_date = self._tags_date, today
+        if previous == today:
+            return []
+        affected = [
+            task
+            for due_date, uuids in self._uuids_by_due_date.items()
+            if _get_due_state(due_date, previous, config.due) != _get_due_state(due_date, today, config.due)
+            for uuid in uuids
+            if (task := self._task_by_uuid.get(uuid)) is not None
+        ]
+        if affected:
+            self._drop_column("virtual_tags")
+            self._filter_index = None
+        for task in affected:
+            task.virtual_tags.clear()
+            self._add_own_virtual_tags(task, config, today)
+            self._add_dependency_virtual_tags(task)
+        return affected
 
     def _update_virtual_tags(self, config: Config) -> None:
         today = get_current_date()
+        # the day the due tags were computed for, see `refresh_due_virtual_tags`
+        self._tags_date = today
         for task in self.tasks:
-            if task.start is not None:
-                task.virtual_tags.add(VirtualTag.ACTIVE)
-            if task.priority is not None:
-                task.virtual_tags.add(VirtualTag.PRIORITY)
-            if task.tags:
-                task.virtual_tags.add(VirtualTag.TAGGED)
-            else:
-                task.virtual_tags.add(VirtualTag.NO_TAG)
-            if task.scheduled is not None:
-                task.virtual_tags.add(VirtualTag.SCHEDULED)
-            if task.until is not None:
-                task.virtual_tags.add(VirtualTag.UNTIL)
-            if task.project is None:
-                task.virtual_tags.add(VirtualTag.NO_PROJECT)
-            if task.status == Status.WAITING:
-                task.virtual_tags.add(VirtualTag.WAITING)
-            if task.status == Status.RECURRING:
-                task.virtual_tags.add(VirtualTag.RECURRING)
-            if task.status == Status.COMPLETED:
-                task.virtual_tags.add(VirtualTag.COMPLETED)
-            if task.status == Status.DELETED:
-                task.virtual_tags.add(VirtualTag.DELETED)
-
-            for dependency_uuid in task.depends:
-                dependency = self._get_task_by_uuid(dependency_uuid)
-                if dependency is None:
-                    continue
-                if dependency.status not in (Status.COMPLETED, Status.DELETED) and task.status not in (
-                    Status.COMPLETED,
-                    Status.DELETED,
-                ):
-                    dependency.virtual_tags.add(VirtualTag.BLOCKING)
-                    task.virtual_tags.add(VirtualTag.BLOCKED)
-
-            if task.due:
-                due_delta_days = (task.due.date() - today).days
-                if due_delta_days < 0:
-                    task.virtual_tags.add(VirtualTag.OVERDUE)
-                elif due_delta_days == 0:
-                    task.virtual_tags.add(VirtualTag.DUE)
-                    task.virtual_tags.add(VirtualTag.DUETODAY)
-                elif due_delta_days <= config.due:
-                    task.virtual_tags.add(VirtualTag.DUE)
+            self._add_own_virtual_tags(task, config, today)
+        for tag, uuids in ((VirtualTag.BLOCKED, self.dependency_graph.blocked()), (VirtualTag.BLOCKING, self.dependency_graph.blocking())):
+            for uuid in uuids:
+                self._task_by_uuid[uuid].virtual_tags.add(tag)
+
+    def _add_dependency_virtual_tags(self, task: Task) -> None:
+        if self.dependency_graph.is_blocked(task.uuid):
+            task.virtual_tags.add(VirtualTag.BLOCKED)
+        if self.dependency_graph.is_blocking(task.uuid):
+            task.virtual_tags.add(VirtualTag.BLOCKING)
+
+    def _add_own_virtual_tags(self, task: Task, config: Config, today: date) -> None:
+        """Add the virtual tags that only depend on the task itself, i.e. all but BLOCKED and BLOCKING."""
+        if task.start is not None:
+            task.virtual_tags.add(VirtualTag.ACTIVE)
+        if task.priority is not None:
+            task.virtual_tags.add(VirtualTag.PRIORITY)
+        if task.tags:
+            task.virtual_tags.add(VirtualTag.TAGGED)
+        else:
+            task.virtual_tags.add(VirtualTag.NO_TAG)
+        if task.scheduled is not None:
+            task.virtual_tags.add(VirtualTag.SCHEDULED)
+        if task.until is not None:
+            task.virtual_tags.add(VirtualTag.UNTIL)
+        if task.project is None:
+            task.virtual_tags.add(VirtualTag.NO_PROJECT)
+        if task.status == Status.WAITING:
+            task.virtual_tags.add(VirtualTag.WAITING)
+        if task.status == Status.RECURRING:
+            task.virtual_tags.add(VirtualTag.RECURRING)
+        if task.status == Status.COMPLETED:
+            task.virtual_tags.add(VirtualTag.COMPLETED)
+        if task.status == Status.DELETED:
+            task.virtual_tags.add(VirtualTag.DELETED)
+
+        if task.due:
+            due_state = _get_due_state(task.due.date(), today, config.due)
+            if due_state == DueState.OVERDUE:
+                task.virtual_tags.add(VirtualTag.OVERDUE)
+            elif due_state == DueState.TODAY:
+                task.virtual_tags.add(VirtualTag.DUE)
+                task.virtual_tags.add(VirtualTag.DUETODAY)
+            elif due_state == DueState.DUE:
+                task.virtual_tags.add(VirtualTag.DUE)
+
+    def get_cell(self, task: Task, column: str) -> object:
+        """Return the value of a single task in a column, formatted like the column attributes (e.g. `store.due`) do."""
+        return self._format_cell(task, column, get_current_datetime())
+
+    def _format_cell(self, task: Task, column: str, now: datetime) -> object:
+        if column in self.VAGUE_DATETIME_COLUMNS:
+            return format_vague_datetime(getattr(task, column), now)
+        if column == "depends":
+            return self._format_depends(task)
+        if column == "tags":
+            return self._format_tags(task)
+        return getattr(task, column)
+
+    def _format_depends(self, task: Task) -> str:
+        dep_ids = []
+        for uuid in task.depends:
+            dep_task = self._get_task_by_uuid(uuid)
+            if dep_task is not None:
+                dep_ids.append(str(dep_task.id))
+        return ",".join(dep_ids)
+
+    def _format_tags(self, task: Task) -> str:
+        return ",".join(task.tags or [])
+
+
+class TaskRows:
+    """The rows of a report too long to add to the table, read from the store's tasks and columns when they are shown.
+
+    The rows are the tasks that are in the store now; tasks appended later, e.g. by a streamed export, are left out
+    until the table is updated.
+    """
+
+    def __init__(self, tasks: TaskStore, columns: list[str], group_ends: set[UUID], config: Config) -> None:
+        self.tasks = tasks
+        self.columns = columns
+        self.group_ends = group_ends
+        self.config = config
+        self._length = len(tasks)
 
-    @property
-    def depends(self) -> list[str]:
-        ret = []
-        for task in self.tasks:
-            dep_ids = []
-            for uuid in task.depends:
-                dep_task = self._get_task_by_uuid(uuid)
-                if dep_task is not None:
-                    dep_ids.append(str(dep_task.id))
-            ret.append(",".join(dep_ids))
-        return ret
+    def __len__(self) -> int:
+        return self._length
 
-    @property
-    def tags(self) -> list[str]:
-        ret = []
-        for task in self.tasks:
-            ret.append(",".join(task.tags or []))
-        return ret
+    def key_at(self, index: int) -> str:
+        return str(self.tasks[index].uuid)
+
+    def index_of(self, key: str) -> int | None:
+        try:
+            index = self.tasks._get_index_by_uuid(UUID(key))
+        except ValueError:
+            return None
+        return index if index is not None and index < self._length else None
+
+    def row_at(self, index: int) -> tuple[tuple[object, ...], Style]:
+        task = self.tasks[index]
+        cells = tuple(self.tasks.get_column(column)[index] for column in self.columns)
+        style = get_style_for_task(task, self.config)
+        return cells, style + GROUP_BREAK_STYLE if task.uuid in self.group_ends else style
+
+    def column(self, index: int) -> list[Any]:
+        return self.tasks.get_column(self.columns[index])[: self._length]
 
 
 class TasksChanged(Message):
-    def __init__(self, select_task_id: int | None = None) -> None:
+    """Request to refresh the tasks.
+
+    By default only the tasks modified since the last sync are exported. `full` forces a complete export, e.g. when the
+    set of exported tasks changes because another context was selected.
+    """
+
+    def __init__(self, select_task_id: int | None = None, full: bool = False) -> None:
         super().__init__()
         self.select_task_id = select_task_id
+        self.full = full
 
 
 class TaskTuiApp(App):
@@ -171,64 +656,301 @@ class TaskTuiApp(App):
     tasks: TaskStore
     report: str
     config: Config
+    last_refresh_timings: list[PhaseTiming] = list()
     BINDINGS = [
         Binding("q,escape", "quit", "Quit"),
         Binding("[", "activate_previous_tab", "Prev tab"),
         Binding("]", "activate_next_tab", "Next tab"),
     ]
 
-    def __init__(self, report: str) -> None:
+    def __init__(self, report: str, data_source: str = "task", snapshot_path: Path | None = None, daemon_socket: Path | None = None) -> None:
         self.report = report
-        self.config = task_cli.get_config()
+        self.data_source = data_source
+        # where the report is saved after every refresh and painted from on the next launch, None disables snapshots
+        self.snapshot_path = snapshot_path
+        # the socket of a `task-tui serve` daemon that exports the report, None once it can't be reached
+        self.daemon_socket = daemon_socket
+        # the real configuration is loaded asynchronously with the first refresh
+        self.config = Config("")
+        self._config_loaded = False
         self.tasks = TaskStore([], self.config)
+        # the task attributes shown in the table, i.e. the report's columns without the empty ones
+        self._table_columns: list[str] = []
+        self.sync_state = SyncState()
+        self.refresh_scheduler = RefreshScheduler(self._refresh_tasks)
+        self._loading_timer: Timer | None = None
+        self._due_timer: Timer | None = None
+        self._live_age_timer: Timer | None = None
+        # the filter entered in the report, applied on top of the context's filter
+        self.user_filter = ""
+        # the context of the last sync
+        self._current_context: ContextInfo | None = None
+        # the report's tasks without the context and user filter, only kept while these filters can be evaluated in-process
+        self._report_tasks: TaskStore | None = None
+        # the column chosen by selecting its header, sorted by before the report's sort order
+        self.sort_column: SortKey | None = None
+        # keys of the rows that end a group of the sort order, they are underlined
+        self._group_end_keys: set[RowKey] = set()
+        # the text of the incremental search, its matches stay highlighted until the search is cancelled
+        self.search_query = ""
+        # the cursor row when the search was started, the cursor moves to the first match from there on
+        self._search_start_row = 0
         super().__init__()
 
     def compose(self) -> ComposeResult:
         with TabbedContent(initial="tasks", id="main-tabs"):
             with TabPane("Tasks", id="tasks"):
-                yield Vertical(TaskReport(), Footer())
+                yield Vertical(TaskReport(), SearchBar(id="search", placeholder="Search descriptions and annotations"), Footer())
             with TabPane("Projects", id="projects"):
                 yield Vertical(ProjectSummary(), Footer())
             with TabPane("Contexts", id="contexts"):
                 yield Vertical(ContextSummary(), Footer())
 
-    def _clean_empty_columns(
-        self,
-        columns: list[str],
-        labels: list[str],
-        data: list[Any],
-    ) -> tuple[list[str], list[str], list[Any]]:
-        keep = [not self._data_empty(d) for d in data]
-        return (
-            list(compress(columns, keep)),
-            list(compress(labels, keep)),
-            list(compress(data, keep)),
-        )
-
-    def _data_empty(self, data: list[Any]) -> bool:
-        return all(v in ("", None, []) for v in data)
+    def _prepare_columns(self) -> tuple[list[str], list[str]]:
+        """Return the attributes and labels of the report's columns that have at least one non-empty cell."""
+        columns = [h[0].split(".")[0] for h in self.headings]
+        labels = [h[1] for h in self.headings]
+        keep = [not self.tasks.column_is_empty(column) for column in columns]
+        return list(compress(columns, keep)), list(compress(labels, keep))
 
     def _update_table(self) -> None:
+        """Show the store's tasks, changing only the rows, cells and styles of the table that differ.
+
+        The columns are only rebuilt when they change, e.g. because a column is no longer empty.
+        """
         log.debug("Updating table")
         table: TaskReport = self.query_one(TaskReport)
-        table.clear(columns=True)
-        table.clear_row_styles()
-        columns = [h[0].split(".")[0] for h in self.headings]
-        labels = [h[1] for h in self.headings]
-        data = [getattr(self.tasks, col) for col in columns]
-        columns, labels, data = self._clean_empty_columns(columns, labels, data)
-        rows = list(map(list, zip(*data)))
-        table.add_columns(*labels)
-        styles = [get_style_for_task(task, self.config) for task in self.tasks]
-        for index, (row, style) in enumerate(zip(rows, styles)):
-            label = "▶" if table.cursor_row == index else " "
-            table.add_row(*row, label=label)
-            table.set_row_style(index, style)
-
-    def _update_projects(self) -> None:
+        sort_keys = self._sort_keys()
+        self.tasks.sort(sort_keys)
+        columns, labels = self._prepare_columns()
+        duplicate_uuids = self.tasks._duplicate_uuids
+        if columns != self._table_columns or [str(column.label) for column in table.ordered_columns] != labels:
+            table.clear(columns=True)
+            table.clear_row_styles()
+            table.add_columns(*labels)
+            self._table_columns = columns
+        elif duplicate_uuids:
+            # the rows of duplicates have generated keys, which can't be matched with the tasks
+            table.clear()
+            table.clear_row_styles()
+        group_ends = set(self.tasks.group_ends(sort_keys))
+        if len(self.tasks) >= VIRTUAL_REPORT_SIZE and not duplicate_uuids:
+            # formatting, styling and measuring every row takes seconds for huge reports, only the shown rows are read
+            group_end_uuids = {self.tasks[index].uuid for index in group_ends}
+            table.show_row_source(TaskRows(self.tasks, columns, group_end_uuids, self.config))
+            self._group_end_keys = {RowKey(str(uuid)) for uuid in group_end_uuids}
+        else:
+            rows: list[tuple[str | None, tuple[Any, ...], Style]] = []
+            for index, (task, cells) in enumerate(zip(self.tasks, zip(*(self.tasks.get_column(column) for column in columns)))):
+                # rows are keyed by UUID so that the cursor and a selection stay on their task, a (broken) duplicate UUID gets a generated key
+                key = str(task.uuid) if task.uuid not in duplicate_uuids else None
+                style = get_style_for_task(task, self.config)
+                rows.append((key, cells, style + GROUP_BREAK_STYLE if index in group_ends else style))
+            row_keys = table.update_rows(rows)
+            self._group_end_keys = {row_keys[index] for index in group_ends}
+        self._update_search_matches()
+        self._schedule_live_ages()
+
+    def _sort_keys(self) -> list[SortKey]:
+        """Return the sort order of the table, the report's `sort` setting after the column whose header was selected."""
+        report_keys = parse_sort(self.config.report_sorts.get(self.report, ""))
+        if self.sort_column is None:
+            return report_keys
+        return [self.sort_column, *(key for key in report_keys if key.column != self.sort_column.column)]
+
+    def _update_group_ends(self, row_keys: list[RowKey], sort_keys: list[SortKey]) -> None:
+        """Underline the rows that end a group of the sort order, and restore the style of the rows that no longer do."""
+        table: TaskReport = self.query_one(TaskReport)
+        group_end_keys = {row_keys[index] for index in self.tasks.group_ends(sort_keys)}
+        for row_key in group_end_keys ^ self._group_end_keys:
+            if row_key not in table.rows:
+                continue
+            task = self.tasks[table.get_row_index(row_key)]
+            style = get_style_for_task(task, self.config)
+            table.set_row_style(row_key, style + GROUP_BREAK_STYLE if row_key in group_end_keys else style)
+        self._group_end_keys = group_end_keys
+
+    @on(TaskReport.HeaderSelected)
+    def _sort_by_column(self, event: TaskReport.HeaderSelected) -> None:
+        """Sort by the column of the selected header, selecting it again reverses the direction."""
+        column = self._table_columns[event.column_index]
+        descending = self.sort_column is not None and self.sort_column.column == column and not self.sort_column.descending
+        self.sort_column = SortKey(column, descending)
+        if self.tasks._duplicate_uuids:
+            # the rows of duplicates have generated keys, which can't be told apart by task
+            self._update_table()
+            return
+        table: TaskReport = self.query_one(TaskReport)
+        cursor_key = table.coordinate_to_cell_key(table.cursor_coordinate).row_key if table.row_count else None
+        if table.row_source is not None:
+            # the rows are read in the order of the store, which is sorted by the update
+            self._update_table()
+        else:
+            sort_keys = self._sort_keys()
+            reordered = self.tasks.sort(sort_keys)
+            row_keys = [RowKey(str(task.uuid)) for task in self.tasks]
+            if reordered:
+                table.set_row_order(row_keys)
+            self._update_group_ends(row_keys, sort_keys)
+        if cursor_key is not None:
+            table.move_cursor(row=table.get_row_index(cursor_key), scroll=True)
+
+    def _repaint_tasks(self, tasks: Iterable[Task]) -> None:
+        """Update the rows of some tasks in place, which is much cheaper than rebuilding the table."""
+        table: TaskReport = self.query_one(TaskReport)
+        hidden_columns = [column for column in (h[0].split(".")[0] for h in self.headings) if column not in self._table_columns]
+        for task in tasks:
+            row_key = RowKey(str(task.uuid))
+            if row_key not in table.rows:
+                continue
+            if not all(_is_empty_cell(self.tasks.get_cell(task, column)) for column in hidden_columns):
+                # the task now has a value in a column that was hidden because it was empty
+                self._update_table()
+                return
+            row_index = table.get_row_index(row_key)
+            for column_index, column in enumerate(self._table_columns):
+                table.update_cell_at(Coordinate(row_index, column_index), self.tasks.get_cell(task, column))
+            style = get_style_for_task(task, self.config)
+            table.set_row_style(row_key, style + GROUP_BREAK_STYLE if row_key in self._group_end_keys else style)
+        self._update_search_matches()
+        self._schedule_live_ages()
+
+    def _update_search_matches(self) -> None:
+        table: TaskReport = self.query_one(TaskReport)
+        table.set_search_matches(self.tasks.search(self.search_query) if self.search_query else set())
+
+    def action_search_tasks(self) -> None:
+        table: TaskReport = self.query_one(TaskReport)
+        search_bar = self.query_one(SearchBar)
+        self._search_start_row = table.cursor_row
+        self.search_query = ""
+        table.set_search_matches(set())
+        search_bar.value = ""
+        search_bar.display = True
+        search_bar.focus()
+
+    @on(Input.Changed, "#search")
+    def _search_changed(self, event: Input.Changed) -> None:
+        """Highlight the matches of the search as it is typed, and move the cursor to the first one."""
+        table: TaskReport = self.query_one(TaskReport)
+        self.search_query = event.value
+        self._update_search_matches()
+        if not table.move_to_search_match(self._search_start_row, 1) and table.row_count:
+            table.move_cursor(row=self._search_start_row, scroll=True)
+
+    @on(Input.Submitted, "#search")
+    def _search_submitted(self, event: Input.Submitted) -> None:
+        table: TaskReport = self.query_one(TaskReport)
+        self._close_search_bar()
+        if self.search_query and not table.search_matches:
+            self.notify(f'No task matches "{self.search_query}"', severity="warning")
+
+    @on(SearchBar.Cancelled)
+    def _search_cancelled(self) -> None:
+        table: TaskReport = self.query_one(TaskReport)
+        self.search_query = ""
+        table.set_search_matches(set())
+        if table.row_count:
+            table.move_cursor(row=self._search_start_row, scroll=True)
+        self._close_search_bar()
+
+    def _close_search_bar(self) -> None:
+        search_bar = self.query_one(SearchBar)
+        search_bar.display = False
+        self.query_one(TaskReport).focus()
+
+    def _schedule_live_ages(self) -> None:
+        if self._live_age_timer is not None:
+            self._live_age_timer.stop()
+            self._live_age_timer = None
+        deadline = self.tasks.live_ages.next_deadline()
+        if deadline is not None:
+            delay = deadline - get_current_datetime().timestamp()
+            self._live_age_timer = self.set_timer(max(delay, 0.0), self._update_live_ages)
+
+    def _update_live_ages(self) -> None:
+        """Update the relative date cells whose text changed, instead of repainting the whole table."""
+        self._live_age_timer = None
+        table: TaskReport = self.query_one(TaskReport)
+        for task, column in self.tasks.update_live_ages(get_current_datetime()):
+            row_key = RowKey(str(task.uuid))
+            if row_key not in table.rows:
+                continue
+            if column not in self._table_columns:
+                # only the report's columns are cached, so this one was hidden because all of its cells were empty
+                if not self.tasks.column_is_empty(column):
+                    self._update_table()
+                    return
+                continue
+            coordinate = Coordinate(table.get_row_index(row_key), self._table_columns.index(column))
+            table.update_cell_at(coordinate, self.tasks.get_cell(task, column), update_width=True)
+        self._schedule_live_ages()
+
+    @property
+    def _owning_tasks(self) -> TaskStore:
+        """The store that computes the virtual tags and urgency of the shown tasks.
+
+        That is the report's tasks while they are kept for in-process filtering, as the shown tasks are selected from
+        them and may depend on tasks that aren't shown (see `TaskStore.select_store`).
+        """
+        return self.tasks if self._report_tasks is None else self._report_tasks
+
+    def _update_tasks_locally(self, tasks: list[Task]) -> None:
+        """Replace tasks in the store and repaint their rows, without waiting for taskwarrior."""
+        store = self._owning_tasks
+        for task in tasks:
+            store.update_task(task)
+        affected = store.refresh_virtual_tags_around(tasks, self.config)
+        # e.g. starting a task makes it more urgent, which taskwarrior would only report with the next export
+        store.refresh_urgency(affected)
+        if store is not self.tasks:
+            self.tasks.update_selected(affected)
+        self._repaint_tasks(affected)
+
+    def _remove_tasks_locally(self, tasks: list[Task]) -> list[Task]:
+        """Remove tasks from the store and the table, without waiting for taskwarrior. Returns the removed tasks."""
+        table: TaskReport = self.query_one(TaskReport)
+        store = self._owning_tasks
+        uuids = [task.uuid for task in tasks]
+        removed = store.remove(uuids)
+        if store is not self.tasks:
+            self.tasks.remove(uuids)
+        if table.row_source is not None:
+            # the rows are read from the store by index, which changed for the tasks after the removed ones
+            self._update_table()
+        else:
+            for task in removed:
+                if RowKey(str(task.uuid)) in table.rows:
+                    table.remove_row(str(task.uuid))
+            table.sync_cursor_marker()
+        affected = store.refresh_virtual_tags_around(removed, self.config)
+        store.refresh_urgency(affected)
+        if store is not self.tasks:
+            self.tasks.update_selected(affected)
+        self._repaint_tasks(affected)
+        return removed
+
+    @work(exclusive=True, group="projects")
+    async def _update_projects(self) -> None:
         log.debug("Updating projects")
         projects = self.query_one(ProjectSummary)
-        projects.refresh_from_tasks(task_cli.export_tasks("all"))
+        if self._computes_urgency:
+            # urgencies depend on the blocked and blocking tasks, so the sums need all tasks at once
+            async with aclosing(task_cli.stream_tasks("all")) as stream:
+                store = TaskStore([task async for task in stream], self.config)
+            store.refresh_urgency()
+            projects.refresh_from_tasks(store.tasks)
+            return
+        first_batch = True
+        async with aclosing(task_cli.stream_tasks("all")) as stream:
+            async for batch in batched_async(stream, STREAM_BATCH_SIZE):
+                if first_batch:
+                    # keep showing the previous aggregates until the first batch arrives
+                    projects.reset_aggregates()
+                    first_batch = False
+                projects.add_tasks(batch)
+        if first_batch:
+            projects.refresh_from_tasks([])
 
     def _cycle_tabs(self, direction: int) -> None:
         tabs: TabbedContent = self.query_one(TabbedContent)
@@ -260,28 +982,302 @@ class TaskTuiApp(App):
         self.query_one(TaskReport).focus()
 
     @on(TasksChanged)
-    async def _update_tasks(self, event: TasksChanged) -> None:
+    def _update_tasks(self, event: TasksChanged) -> None:
         """Update the tasks using the task cli.
 
+        Requests are debounced and merged by the refresh scheduler, which also cancels (and kills) an export that a newer
+        request made stale, so at most one export runs at a time.
+
         NOTE: Updating the task will trigger a table update.
         """
+        if self.refresh_scheduler.request(RefreshRequest(event.select_task_id, event.full)):
+            self._drain_refreshes()
+
+    @work(group="refresh")
+    async def _drain_refreshes(self) -> None:
+        await self.refresh_scheduler.drain()
+
+    def _build_refresh_pipeline(self) -> RefreshPipeline:
+        """Build the taskwarrior calls of a full refresh.
+
+        The export needs the context filter. It also waits for the columns, as the streamed tasks are painted batch by
+        batch; the columns are read from the config that the first refresh loads, so that call is usually done before
+        the context is known anyway.
+        """
+
+        async def load_config() -> None:
+            self.config = await task_cli.get_config()
+            self._config_loaded = True
+            self._configure_data_sources()
+
+        async def export(context: ContextInfo | None, headings: list[tuple[str, str]], *_: object) -> TaskStore:
+            self._current_context = context
+            # a filter that can be evaluated in-process is applied to the whole report, so changing it needs no export
+            task_filter = self._parse_read_filter(context)
+            read_filter = "" if task_filter is not None else self._read_filter(context)
+            store: TaskStore | None = None
+            async with aclosing(task_cli.stream_tasks(self.report, read_filter=read_filter)) as stream:
+                async for batch in batched_async(stream, STREAM_BATCH_SIZE):
+                    if store is None:
+                        # paint the first rows while the export is still running
+                        store = TaskStore(batch, self.config)
+                        # the store is incomplete until the export finishes, so nothing may be merged into it
+                        self.sync_state.invalidate()
+                        self._report_tasks = None
+                        self.tasks = store if task_filter is None else store.select_store(task_filter, self.config)
+                        self.headings = headings
+                        self._update_table()
+                        self._hide_loading()
+                    else:
+                        store.extend(batch)
+            if store is None:
+                store = TaskStore([], self.config)
+            store.refresh_virtual_tags(self.config)
+            if self._computes_urgency:
+                store.refresh_urgency()
+            for cycle in store.dependency_graph.find_cycles():
+                log.warning("Dependency cycle between tasks %s", ", ".join(str(uuid) for uuid in cycle))
+            if task_filter is None:
+                self._report_tasks = None
+                return store
+            self._report_tasks = store
+            return store.select_store(task_filter, self.config)
+
+        pipeline = RefreshPipeline()
+        export_dependencies: tuple[str, ...] = ("context", "columns")
+        config_dependencies: tuple[str, ...] = ()
+        if not self._config_loaded:
+            pipeline.add_phase("config", load_config)
+            config_dependencies = ("config",)
+        pipeline.add_phase("context", task_cli.get_context)
+        pipeline.add_phase("columns", lambda *_: task_cli.get_report_columns(self.report), depends_on=config_dependencies)
+        pipeline.add_phase("export", export, depends_on=export_dependencies)
+        return pipeline
+
+    def _build_incremental_pipeline(self, modified_after: datetime) -> RefreshPipeline:
+        """Build the taskwarrior calls of an incremental refresh.
+
+        Two exports of the tasks modified after the high-water mark are made: one with the report and context filter
+        (the tasks to merge) and one without any filter, which reveals the changed tasks that left the report. While the
+        report's tasks are kept for in-process filtering, the first export leaves out the context filter as well.
+        """
+        filter_in_process = self._report_tasks is not None
+
+        async def changed_in_report(context: ContextInfo | None) -> list[Task]:
+            read_filter = "" if filter_in_process else self._read_filter(context)
+            return await task_cli.export_tasks(self.report, read_filter=read_filter, modified_after=modified_after)
+
+        pipeline = RefreshPipeline()
+        pipeline.add_phase("context", task_cli.get_context)
+        pipeline.add_phase("changed", lambda: task_cli.export_tasks(None, read_filter="", modified_after=modified_after))
+        pipeline.add_phase("changed_in_report", changed_in_report, depends_on=("context",))
+        return pipeline
+
+    async def _sync_from_daemon(self) -> bool:
+        """Take the report from the daemon, which only exports it again if taskwarrior changed something since.
+
+        Like a full sync, the whole report is kept to filter it in-process, unless the daemon had to apply the context's
+        filter. The config is only applied again if the daemon's differs, e.g. after the taskrc changed.
+
+        Returns:
+            False if there is no daemon to ask or the filters of the report need taskwarrior, which the daemon doesn't
+            apply; a sync with the task CLI is needed instead. A daemon that fails is not asked again.
+        """
+        if self.daemon_socket is None:
+            return False
+        try:
+            daemon_report = await fetch_report(self.daemon_socket, self.report, self.data_source)
+        except DaemonError as e:
+            log.info("Running standalone: %s", e)
+            self.daemon_socket = None
+            self.sync_state.invalidate()
+            return False
+        if not self._config_loaded or daemon_report.config.settings != self.config.settings:
+            self.config = daemon_report.config
+            self._config_loaded = True
+            self._configure_data_sources()
+        self._current_context = daemon_report.context
+        task_filter = None if daemon_report.read_filter else self._parse_read_filter(daemon_report.context)
+        # the entered filter can't be applied to the tasks, or only taskwarrior can evaluate it
+        if task_filter is None and (self.user_filter or not daemon_report.read_filter):
+            return False
+        store = TaskStore(daemon_report.tasks, self.config)
+        if self._computes_urgency:
+            store.refresh_urgency()
+        if task_filter is None:
+            self._report_tasks = None
+            self.tasks = store
+        else:
+            self._report_tasks = store
+            self.tasks = store.select_store(task_filter, self.config)
+        self.headings = daemon_report.headings
+        self.sync_state.record_full_sync(self._owning_tasks.tasks)
+        return True
+
+    async def _sync_full(self) -> None:
+        pipeline = self._build_refresh_pipeline()
+        results = await pipeline.run()
+        self.last_refresh_timings = pipeline.timings
+        self.tasks = results["export"]
+        self.headings = results["columns"]
+        self.sync_state.record_full_sync(self._owning_tasks.tasks)
+
+    @property
+    def _computes_urgency(self) -> bool:
+        """Whether the urgency is computed locally, as the TaskChampion replica doesn't store it."""
+        return self.data_source == TaskChampionSource.name
+
+    def _configure_data_sources(self) -> None:
+        if self.data_source != TaskChampionSource.name:
+            return
+        source = TaskChampionSource.from_config(self.config)
+        if source is None:
+            self.notify("No TaskChampion replica found, using `task export`", severity="warning")
+            return
+        task_cli.data_sources = [source]
+
+    async def _sync_incremental(self, modified_after: datetime) -> bool:
+        """Merge the tasks modified since the last sync into the store.
+
+        Returns:
+            False if the changes can't be merged and a full sync is needed instead.
+        """
+        report_tasks = self._report_tasks
+        pipeline = self._build_incremental_pipeline(modified_after)
+        results = await pipeline.run()
+        self.last_refresh_timings = pipeline.timings
+        changed: list[Task] = results["changed"]
+        if any(task.status in (Status.COMPLETED, Status.DELETED) for task in changed):
+            # a task left the working set, so taskwarrior renumbers the IDs of unchanged tasks as well
+            log.debug("Completed or deleted tasks since last sync, falling back to a full sync")
+            return False
+        task_filter: TaskFilter | None = None
+        if report_tasks is not None:
+            self._current_context = results["context"]
+            task_filter = self._parse_read_filter(self._current_context)
+            if task_filter is None:
+                log.debug("The context's filter can no longer be evaluated in-process, falling back to a full sync")
+                return False
+        changed_in_report: list[Task] = results["changed_in_report"]
+        in_report = {task.uuid for task in changed_in_report}
+        removed = [task.uuid for task in changed if task.uuid not in in_report]
+        log.debug("Merging %d changed tasks, removing %d tasks", len(changed_in_report), len(removed))
+        if report_tasks is None or task_filter is None:
+            self.tasks.merge(changed_in_report, removed, self.config)
+            if self._computes_urgency:
+                self.tasks.refresh_urgency()
+        else:
+            # merging rebuilds the indexes of a store anyway, so the filtered store is simply made anew
+            report_tasks.merge(changed_in_report, removed, self.config)
+            if self._computes_urgency:
+                report_tasks.refresh_urgency()
+            self.tasks = report_tasks.select_store(task_filter, self.config)
+        self.sync_state.record_incremental_sync(changed)
+        return True
+
+    def _read_filter(self, context: ContextInfo | None) -> str:
+        """Return the filter of the context combined with the filter entered in the report."""
+        filters = [text for text in (context.read_filter if context else "", self.user_filter) if text]
+        if len(filters) == 1:
+            return filters[0]
+        return " ".join(f"( {text} )" for text in filters)
+
+    def _parse_read_filter(self, context: ContextInfo | None) -> TaskFilter | None:
+        """Parse the combined filter for in-process evaluation, or return None if only taskwarrior can evaluate it."""
+        try:
+            return parse_filter(self._read_filter(context), get_current_datetime(), self.config.weekstart)
+        except UnsupportedFilterError as e:
+            log.debug("Filtering with taskwarrior: %s", e)
+            return None
+
+    def _apply_filter_in_process(self) -> bool:
+        """Show the kept report tasks matching the current filters, without an export.
+
+        Returns:
+            False if there are no report tasks to filter or the filters need taskwarrior, i.e. a full sync is needed.
+        """
+        if self._report_tasks is None:
+            return False
+        task_filter = self._parse_read_filter(self._current_context)
+        if task_filter is None:
+            return False
+        self.tasks = self._report_tasks.select_store(task_filter, self.config)
+        self._update_table()
+        self.query_one(TaskReport).retain_selection()
+        self._schedule_due_boundary()
+        return True
+
+    def _filter_changed(self) -> None:
+        if self._apply_filter_in_process():
+            return
+        self.sync_state.invalidate()
+        self.post_message(TasksChanged(full=True))
+
+    def _show_loading_later(self) -> None:
+        table: TaskReport = self.query_one(TaskReport)
+        self._hide_loading()
+        self._loading_timer = self.set_timer(LOADING_INDICATOR_DELAY, lambda: setattr(table, "loading", True))
+
+    def _hide_loading(self) -> None:
+        if self._loading_timer is not None:
+            self._loading_timer.stop()
+            self._loading_timer = None
+        self.query_one(TaskReport).loading = False
+
+    def _schedule_due_boundary(self) -> None:
+        """Update the due tags at the next local midnight on which they change, without asking taskwarrior."""
+        if self._due_timer is not None:
+            self._due_timer.stop()
+            self._due_timer = None
+        boundary = self._owning_tasks.next_due_boundary(self.config)
+        if boundary is None:
+            return
+        delay = (datetime.combine(boundary, datetime.min.time()).astimezone() - get_current_datetime()).total_seconds()
+        self._due_timer = self.set_timer(min(max(delay, 0.0), DUE_TIMER_MAX_DELAY), self._handle_due_boundary)
+
+    def _handle_due_boundary(self) -> None:
+        self._due_timer = None
+        store = self._owning_tasks
+        affected = store.refresh_due_virtual_tags(self.config)
+        if store is not self.tasks:
+            self.tasks.update_selected(affected)
+        self._repaint_tasks(affected)
+        self._schedule_due_boundary()
+
+    async def _refresh_tasks(self, request: RefreshRequest) -> None:
+        select_task_id = request.select_task_id
         table: TaskReport = self.query_one(TaskReport)
+        # the streamed export repaints the table early, so remember the cursor's task before syncing
         previous_row: int = table.cursor_row
+        previous_key = table.coordinate_to_cell_key(table.cursor_coordinate).row_key if table.row_count else None
+        # a report painted from the snapshot stays visible, dimmed, instead of being covered by the loading indicator
+        if not table.has_class("-stale"):
+            self._show_loading_later()
+        try:
+            if not await self._sync_from_daemon():
+                modified_after = self.sync_state.modified_after()
+                if request.full or modified_after is None or self.sync_state.full_sync_due() or not await self._sync_incremental(modified_after):
+                    await self._sync_full()
+        finally:
+            self._hide_loading()
+        table.remove_class("-stale")
+        self._save_snapshot()
+
         log.debug("Updating tasks")
         log.debug("Previous row: %d, Previous number of tasks: %d", previous_row, len(self.tasks))
-        tasks = task_cli.export_tasks(self.report)
-        self.tasks = TaskStore(tasks, self.config)
-        self.headings = task_cli.get_report_columns(self.report)
         self._update_table()
+        table.retain_selection()
+        self._schedule_due_boundary()
 
-        if event.select_task_id is not None:
+        if select_task_id is not None:
             try:
-                task = self.tasks._get_task_by_id(event.select_task_id)
-                select_task_index = self.tasks._get_index_by_uuid(task.uuid)
+                select_task_index = self.tasks.get_index_by_id(select_task_id)
             except TaskStoreError as e:
                 log.error("Failed to get task by id: %s", e)
-                self.notify(f"Failed to select task with id: {event.select_task_id}")
+                self.notify(f"Failed to select task with id: {select_task_id}")
                 select_task_index = 0
+        elif previous_key is not None and previous_key in table.rows:
+            select_task_index = table.get_row_index(previous_key)
         else:
             select_task_index = previous_row
         # move_cursor already handles upper out-of-bounds by selecting the highest available row so this is not handled manually
@@ -293,32 +1289,85 @@ class TaskTuiApp(App):
 
     def on_mount(self) -> None:
         log.debug("Mounting app")
+        self._show_snapshot()
         self.post_message(TasksChanged())
         self._focus_tab_content("tasks")
 
-    def _update_contexts(self) -> None:
+    def _show_snapshot(self) -> None:
+        """Paint the report saved by the last session, marked as stale until the first refresh has replaced it.
+
+        The config of the snapshot is only used for painting, the first refresh still loads the current one.
+        """
+        if self.snapshot_path is None:
+            return
+        snapshot = load_snapshot(self.snapshot_path)
+        if snapshot is None:
+            return
+        self.config = snapshot.config
+        self.headings = snapshot.headings
+        self.tasks = TaskStore(snapshot.tasks, self.config)
+        self._update_table()
+        self.query_one(TaskReport).add_class("-stale")
+
+    def _save_snapshot(self) -> None:
+        # the snapshot is painted before any filter is entered, so a filtered report would show the wrong tasks
+        if self.snapshot_path is None or not self._config_loaded or self.user_filter:
+            return
+        self._write_snapshot(self.snapshot_path, Snapshot(list(self.tasks), self.config, list(self.headings)))
+
+    @work(exclusive=True, group="snapshot")
+    async def _write_snapshot(self, path: Path, snapshot: Snapshot) -> None:
+        try:
+            await asyncio.to_thread(save_snapshot, path, snapshot)
+        except OSError as e:
+            log.warning("Could not save the snapshot to %s: %s", path, e)
+
+    @work(exclusive=True, group="contexts")
+    async def _update_contexts(self) -> None:
         log.debug("Updating contexts")
         context_summary: ContextSummary = self.query_one(ContextSummary)
-        context_summary.refresh_from_contexts(task_cli.list_contexts())
+        context_summary.refresh_from_contexts(await task_cli.list_contexts())
 
     @on(ContextSelected)
-    def _handle_context_selected(self, event: ContextSelected) -> None:
-        task_cli.set_context(event.context.name)
+    @work(group="mutation")
+    async def _handle_context_selected(self, event: ContextSelected) -> None:
+        await task_cli.set_context(event.context.name)
         self._update_contexts()
-        self.post_message(TasksChanged())
+        self._current_context = event.context
+        self._filter_changed()
         self.notify(f'Context set to "{event.context.name}"')
 
-    def action_add_task(self) -> None:
-        def add_task(description: str) -> None:
-            try:
-                new_task_id = task_cli.add_task(description)
-            except ValueError as e:
-                self.notify(f"Failed to create task:\n{str(e)}", severity="error", markup=True)
-                return
-            self.post_message(TasksChanged(select_task_id=new_task_id))
+    @work(group="mutation")
+    async def action_add_task(self) -> None:
+        description = await self.push_screen_wait(TextInput("Enter task description"))
+        if description is None:
+            return
+        try:
+            new_task_id = await task_cli.add_task(description)
+        except ValueError as e:
+            self.notify(f"Failed to create task:\n{str(e)}", severity="error", markup=True)
+            return
+        self.post_message(TasksChanged(select_task_id=new_task_id))
+
+    @work(group="mutation")
+    async def action_filter_tasks(self) -> None:
+        user_filter = await self.push_screen_wait(TextInput("Filter tasks (empty to clear)"))
+        if user_filter is None:
+            return
+        self.user_filter = user_filter.strip()
+        self._filter_changed()
 
-        add_task_screen = TextInput("Enter task description")
-        self.push_screen(add_task_screen, add_task)
+    def _target_tasks(self) -> list[Task]:
+        """Return the selected tasks in report order, or the task under the cursor if nothing is selected."""
+        table: TaskReport = self.query_one(TaskReport)
+        if table.selected_row_keys:
+            return [task for task in self.tasks if str(task.uuid) in table.selected_row_keys]
+        return [self.tasks[table.cursor_row]]
+
+    def _describe_tasks(self, tasks: list[Task]) -> str:
+        if len(tasks) == 1:
+            return f'task "{tasks[0].description}" ({tasks[0].id})'
+        return f"{len(tasks)} tasks"
 
     def action_quit(self) -> None:
         # confirm_quit_sqreen = ConfirmDialog("Are you sure you want to quit?")
@@ -328,42 +1377,74 @@ class TaskTuiApp(App):
 
     def action_refresh_tasks(self) -> None:
         log.debug("Refreshing tasks")
-        self.post_message(TasksChanged())
+        self.post_message(TasksChanged(full=True))
         self.notify("Tasks refreshed")
 
-    def action_set_done(self) -> None:
-        def set_done(quit: bool | None) -> None:
-            task_cli.set_task_done(current_task)
-            self.post_message(TasksChanged())
-
+    @work(group="mutation")
+    async def action_set_done(self) -> None:
         table: TaskReport = self.query_one(TaskReport)
-        current_task = self.tasks[table.cursor_row]
-        confirm_done_scree = ConfirmDialog(f'Are you sure you want set task "{current_task.description}" ({current_task.id}) to done?')
-        self.push_screen(confirm_done_scree, set_done)
-
-    def action_delete_task(self) -> None:
-        def delete_task(quit: bool | None) -> None:
-            task_cli.delete_task(current_task)
-            self.post_message(TasksChanged())
+        if len(self.tasks) == 0:
+            return
+        tasks = self._target_tasks()
+        prompt = f"Are you sure you want set {self._describe_tasks(tasks)} to done?"
+        if not await self.push_screen_wait(ConfirmDialog(prompt)):
+            return
+        table.action_clear_selection()
+        # remove the rows right away, taskwarrior is only asked afterwards
+        removed = self._remove_tasks_locally(tasks)
+        try:
+            await task_cli.set_tasks_done(tasks)
+        except ValueError as e:
+            self.notify(f"Failed to set tasks to done:\n{str(e)}", severity="error", markup=True)
+            # put the tasks back until the full refresh restores the report order
+            self._owning_tasks.merge(removed, [], self.config)
+            if not self._apply_filter_in_process():
+                self._update_table()
+            self.post_message(TasksChanged(full=True))
+            return
+        self.post_message(TasksChanged())
 
+    @work(group="mutation")
+    async def action_delete_task(self) -> None:
         table: TaskReport = self.query_one(TaskReport)
         if len(self.tasks) == 0:
             return
-        current_task = self.tasks[table.cursor_row]
-        confirm_delete_screen = ConfirmDialog(f'Are you sure you want to delete task "{current_task.description}" ({current_task.id})?')
-        self.push_screen(confirm_delete_screen, delete_task)
+        tasks = self._target_tasks()
+        prompt = f"Are you sure you want to delete {self._describe_tasks(tasks)}?"
+        if not await self.push_screen_wait(ConfirmDialog(prompt)):
+            return
+        try:
+            await task_cli.delete_tasks(tasks)
+        except ValueError as e:
+            self.notify(f"Failed to delete task:\n{str(e)}", severity="error", markup=True)
+            return
+        table.action_clear_selection()
+        self.post_message(TasksChanged())
 
-    def action_toggle_start_stop(self) -> None:
+    @work(group="mutation")
+    async def action_toggle_start_stop(self) -> None:
         table: TaskReport = self.query_one(TaskReport)
         if len(self.tasks) == 0:
             return
         current_task = self.tasks[table.cursor_row]
-        if current_task.start is None:
-            task_cli.start_task(current_task)
-            self.notify(f'Task "{current_task.description}" started')
-        else:
-            task_cli.stop_task(current_task)
-            self.notify(f'Task "{current_task.description}" stopped')
+        tasks = self._target_tasks()
+        # a mixed selection is started, only a selection of active tasks is stopped
+        to_start = [task for task in tasks if task.start is None]
+        changed = to_start or tasks
+        start = get_current_datetime() if to_start else None
+        table.action_clear_selection()
+        # show the new state right away, taskwarrior is only asked afterwards
+        self._update_tasks_locally([task.model_copy(update={"start": start, "virtual_tags": set()}) for task in changed])
+        try:
+            if to_start:
+                await task_cli.start_tasks(to_start)
+                self.notify(f"Started {self._describe_tasks(to_start)}")
+            else:
+                await task_cli.stop_tasks(tasks)
+                self.notify(f"Stopped {self._describe_tasks(tasks)}")
+        except ValueError as e:
+            self.notify(f"Failed to start/stop tasks:\n{str(e)}", severity="error", markup=True)
+            self._update_tasks_locally(changed)
 
         self.post_message(TasksChanged(select_task_id=current_task.id))
 
@@ -373,64 +1454,62 @@ class TaskTuiApp(App):
     def action_activate_next_tab(self) -> None:
         self._cycle_tabs(1)
 
-    def action_modify_task(self) -> None:
+    @work(group="mutation")
+    async def action_modify_task(self) -> None:
         table: TaskReport = self.query_one(TaskReport)
         if len(self.tasks) == 0:
             return
-
         current_task = self.tasks[table.cursor_row]
+        tasks = self._target_tasks()
 
-        def modify_task(modification: str | None) -> None:
-            if modification is None or modification.strip() == "":
-                return
-
-            try:
-                task_cli.modify_task(current_task, modification)
-            except ValueError as e:
-                self.notify(f"Failed to modify task:\n{str(e)}", severity="error", markup=True)
-                return
+        prompt = "Enter modification" if len(tasks) == 1 else f"Enter modification for {len(tasks)} tasks"
+        modification = await self.push_screen_wait(TextInput(prompt))
+        if modification is None or modification.strip() == "":
+            return
 
-            self.notify(f'Task "{current_task.description}" modified')
-            self.post_message(TasksChanged(select_task_id=current_task.id))
+        try:
+            await task_cli.modify_tasks(tasks, modification)
+        except ValueError as e:
+            self.notify(f"Failed to modify task:\n{str(e)}", severity="error", markup=True)
+            return
 
-        modify_task_screen = TextInput("Enter modification")
-        self.push_screen(modify_task_screen, modify_task)
+        self.notify(f"Modified {self._describe_tasks(tasks)}")
+        table.action_clear_selection()
+        self.post_message(TasksChanged(select_task_id=current_task.id))
 
-    def action_annotate_task(self) -> None:
+    @work(group="mutation")
+    async def action_annotate_task(self) -> None:
         table: TaskReport = self.query_one(TaskReport)
         if len(self.tasks) == 0:
             return
         current_task = self.tasks[table.cursor_row]
 
-        def annotate_task(annotation: str) -> None:
-            if annotation.strip() == "":
-                return
-
-            try:
-                task_cli.annotate_task(current_task, annotation)
-            except ValueError as e:
-                self.notify(f"Failed to annotate task:\n{str(e)}", severity="error", markup=True)
-                return
-
-            self.notify(f'Task "{current_task.description}" annotated with "{annotation}"')
-            self.post_message(TasksChanged(select_task_id=current_task.id))
+        annotation = await self.push_screen_wait(TextInput("Enter annotation"))
+        if annotation is None or annotation.strip() == "":
+            return
 
-        annotation_screen = TextInput("Enter annotation")
-        self.push_screen(annotation_screen, annotate_task)
+        try:
+            await task_cli.annotate_task(current_task, annotation)
+        except ValueError as e:
+            self.notify(f"Failed to annotate task:\n{str(e)}", severity="error", markup=True)
+            return
 
-    def action_log_task(self) -> None:
-        def log_task(description: str) -> None:
-            try:
-                task_cli.log_task(description)
-            except ValueError as e:
-                self.notify(f"Failed to log task:\n{str(e)}", severity="error", markup=True)
-                return
+        self.notify(f'Task "{current_task.description}" annotated with "{annotation}"')
+        self.post_message(TasksChanged(select_task_id=current_task.id))
 
-            self.post_message(TasksChanged())
-            self.notify(f'Logged task "{description}"')
+    @work(group="mutation")
+    async def action_log_task(self) -> None:
+        description = await self.push_screen_wait(TextInput("Enter task description"))
+        if description is None:
+            return
+        try:
+            await task_cli.log_task(description)
+        except ValueError as e:
+            self.notify(f"Failed to log task:\n{str(e)}", severity="error", markup=True)
+            return
 
-        log_task_screen = TextInput("Enter task description")
-        self.push_screen(log_task_screen, log_task)
+        self.post_message(TasksChanged())
+        self.notify(f'Logged task "{description}"')
 
     def action_edit_task(self) -> None:
         table: TaskReport = self.query_one(TaskReport)
@@ -439,6 +1518,7 @@ class TaskTuiApp(App):
         current_task = self.tasks[table.cursor_row]
         try:
             with self.suspend():
+                # the editor owns the terminal, so this intentionally blocks until it is closed
                 task_cli.edit_task(current_task)
                 self.post_message(TasksChanged(select_task_id=current_task.id))
         except ValueError as e:
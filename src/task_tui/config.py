@@ -1,10 +1,14 @@
 # ruff: noqa: F841
 import logging
+from dataclasses import dataclass
 from typing import Callable, TypeVar
 
 from rich.color import Color
 from rich.style import Style
 
+from task_tui.data_models import ContextInfo
+from task_tui.styles import ColorRules
+
 log = logging.getLogger(__name__)
 
 COLOR_INDEXES = {
@@ -18,47 +22,222 @@ COLOR_INDEXES = {
     "white": 7,
 }
 
+# taskwarrior's default urgency coefficients, `task show` lists the configured ones (including these defaults)
+DEFAULT_URGENCY_COEFFICIENTS = {
+    "urgency.user.tag.next.coefficient": 15.0,
+    "urgency.due.coefficient": 12.0,
+    "urgency.blocking.coefficient": 8.0,
+    "urgency.uda.priority.H.coefficient": 6.0,
+    "urgency.scheduled.coefficient": 5.0,
+    "urgency.active.coefficient": 4.0,
+    "urgency.uda.priority.M.coefficient": 3.9,
+    "urgency.age.coefficient": 2.0,
+    "urgency.uda.priority.L.coefficient": 1.8,
+    "urgency.annotations.coefficient": 1.0,
+    "urgency.tags.coefficient": 1.0,
+    "urgency.project.coefficient": 1.0,
+    "urgency.waiting.coefficient": -3.0,
+    "urgency.blocked.coefficient": -5.0,
+}
+
 T = TypeVar("T")
 
+# values taskwarrior reads as true in boolean settings
+TRUE_VALUES = ("1", "yes", "on", "true", "y")
+
+
+@dataclass(frozen=True)
+class ReportConfig:
+    """The `report.<name>.*` settings of a report."""
+
+    name: str
+    columns: tuple[str, ...] = ()
+    labels: tuple[str, ...] = ()
+    sort: str = ""
+    filter: str = ""
+    description: str = ""
+
+    @property
+    def headings(self) -> list[tuple[str, str]]:
+        """The columns of the report with their labels."""
+        return list(zip(self.columns, self.labels))
+
+
+@dataclass(frozen=True)
+class UdaConfig:
+    """The `uda.<name>.*` settings of a user defined attribute."""
+
+    name: str
+    type: str = "string"
+    label: str = ""
+    values: tuple[str, ...] | None = None
+
 
 class Config:
+    """taskwarrior's configuration, as listed by `task show`.
+
+    The output is parsed into an index of all settings in one pass. Settings are read with the typed accessors (e.g.
+    `get_int`), the reports, contexts, UDAs, urgency coefficients and colors are available as structured views.
+    """
+
+    settings: dict[str, str]
     color: dict[str, Style]
 
     def __init__(self, config_data: str) -> None:
-        config_lines = config_data.splitlines()
-        self.color = self._parse_color_config(config_lines)
-        self.due = self._get_config(config_lines, "due", 7, int)
-        self.color_precedence = self._get_config(
-            config_lines,
+        self.settings = self._parse_settings(config_data.splitlines())
+        self.color = self._parse_colors(self.settings)
+        self.due = self.get_int("due", 7)
+        self.data_location = self.get_str("data.location", "~/.task")
+        self.weekstart = self.get_str("weekstart", "sunday").lower()
+        self.priority_values = self.get_list("uda.priority.values", ["H", "M", "L", ""])
+        self.reports = self._parse_reports(self.settings)
+        self.contexts = self._parse_contexts(self.settings)
+        self.udas = self._parse_udas(self.settings)
+        self.urgency_coefficients = {**DEFAULT_URGENCY_COEFFICIENTS, **self._parse_urgency_coefficients(self.settings)}
+        self.urgency_age_max = self.get_int("urgency.age.max", 365)
+        self.urgency_inherit = self.get_bool("urgency.inherit", False)
+        self.color_precedence = self.get_str(
             "rule.precedence.color",
             "deleted,completed,active,keyword.,tag.,project.,overdue,scheduled,due.today,due,blocked,blocking,recurring,tagged,uda.",
-            str,
         )
+        self.color_rules = ColorRules(self.color, self.color_precedence)
+
+    @classmethod
+    def from_settings(cls, settings: dict[str, str]) -> "Config":
+        """Create the config from the settings index of another one, e.g. after it was stored as JSON."""
+        return cls("\n".join(f"{name} {value}" for name, value in settings.items()))
+
+    @staticmethod
+    def _parse_settings(config_lines: list[str]) -> dict[str, str]:
+        """Return the settings of `task show` by name, settings that are listed more than once keep their last value.
+
+        A setting without a value is listed as its name alone and gets an empty value. The headings and notes of `task
+        show` end up in the index too, which is harmless as no setting is named like their first word.
+        """
+        settings: dict[str, str] = {}
+        for config_line in config_lines:
+            config_split = config_line.split(maxsplit=1)
+            if config_split:
+                settings[config_split[0]] = config_split[1].strip() if len(config_split) == 2 else ""
+        return settings
+
+    def get(self, name: str, default: T, parser: Callable[[str], T]) -> T:
+        """Return the setting parsed by `parser`, or the default if it isn't set or `parser` raises a `ValueError`."""
+        value = self.settings.get(name)
+        if value is None:
+            return default
+        try:
+            return parser(value)
+        except ValueError:
+            log.warning("Ignoring invalid setting %s: %s", name, value)
+            return default
 
-    def _get_config(self, config_lines: list[str], config_name: str, default: T, parser: Callable[[str], T]) -> T:
-        for line in config_lines:
-            config_split = line.split(maxsplit=1)
-            if len(config_split) == 1:
-                return default
+    def get_str(self, name: str, default: str = "") -> str:
+        return self.settings.get(name, default)
+
+    def get_int(self, name: str, default: int) -> int:
+        return self.get(name, default, int)
+
+    def get_float(self, name: str, default: float) -> float:
+        return self.get(name, default, float)
+
+    def get_bool(self, name: str, default: bool) -> bool:
+        return self.get(name, default, lambda value: value.lower() in TRUE_VALUES)
+
+    def get_list(self, name: str, default: list[str]) -> list[str]:
+        """Return a comma separated setting as a list, an empty entry is kept (e.g. the no priority of `H,M,L,`)."""
+        return self.get(name, default, lambda value: value.split(","))
+
+    @property
+    def report_sorts(self) -> dict[str, str]:
+        """The `report.<name>.sort` settings by report name."""
+        return {name: report.sort for name, report in self.reports.items() if report.sort}
+
+    @staticmethod
+    def _parse_reports(settings: dict[str, str]) -> dict[str, ReportConfig]:
+        """Return the reports that have `report.<name>.*` settings by name, report names may contain dots."""
+        report_settings: dict[str, dict[str, str]] = {}
+        for key, value in settings.items():
+            if key.startswith("report."):
+                name, _, attribute = key.removeprefix("report.").rpartition(".")
+                if name and attribute in ("columns", "labels", "sort", "filter", "description"):
+                    report_settings.setdefault(name, {})[attribute] = value
+        return {
+            name: ReportConfig(
+                name,
+                columns=tuple(attributes["columns"].split(",")) if attributes.get("columns") else (),
+                labels=tuple(attributes["labels"].split(",")) if attributes.get("labels") else (),
+                sort=attributes.get("sort", ""),
+                filter=attributes.get("filter", ""),
+                description=attributes.get("description", ""),
+            )
+            for name, attributes in report_settings.items()
+        }
+
+    @staticmethod
+    def _parse_contexts(settings: dict[str, str]) -> dict[str, ContextInfo]:
+        """Return the defined contexts by name, marking the one that `context` activates.
+
+        The filter of a context is `context.<name>.read`, or `context.<name>` as taskwarrior before 2.6 defined it.
+        """
+        read_filters: dict[str, str] = {}
+        legacy_filters: dict[str, str] = {}
+        for key, value in settings.items():
+            if not key.startswith("context."):
+                continue
+            name = key.removeprefix("context.")
+            if name.endswith(".read"):
+                read_filters[name.removesuffix(".read")] = value
+            elif name.endswith(".write"):
+                legacy_filters.setdefault(name.removesuffix(".write"), "")
             else:
-                config_key, config_value = config_split
-            if config_key == config_name:
-                return parser(config_value)
-        return default
+                legacy_filters[name] = value
+        active_context = settings.get("context", "")
+        return {
+            name: ContextInfo(name=name, read_filter=read_filters.get(name) or legacy_filters.get(name, ""), is_active=name == active_context)
+            for name in sorted(read_filters.keys() | legacy_filters.keys())
+        }
+
+    @staticmethod
+    def _parse_udas(settings: dict[str, str]) -> dict[str, UdaConfig]:
+        """Return the user defined attributes by name, with the `type`, `label` and `values` taskwarrior lists for them."""
+        uda_settings: dict[str, dict[str, str]] = {}
+        for key, value in settings.items():
+            if key.startswith("uda."):
+                # UDA names can't contain dots
+                name, _, attribute = key.removeprefix("uda.").partition(".")
+                if name and attribute in ("type", "label", "values"):
+                    uda_settings.setdefault(name, {})[attribute] = value
+        return {
+            name: UdaConfig(
+                name,
+                type=attributes.get("type", "string"),
+                label=attributes.get("label", ""),
+                values=tuple(attributes["values"].split(",")) if "values" in attributes else None,
+            )
+            for name, attributes in uda_settings.items()
+        }
+
+    @staticmethod
+    def _parse_urgency_coefficients(settings: dict[str, str]) -> dict[str, float]:
+        """Return the `urgency.*.coefficient` settings by name."""
+        coefficients: dict[str, float] = {}
+        for config_key, config_value in settings.items():
+            if config_key.startswith("urgency.") and config_key.endswith(".coefficient"):
+                try:
+                    coefficients[config_key] = float(config_value)
+                except ValueError:
+                    log.warning("Ignoring invalid urgency coefficient %s: %s", config_key, config_value)
+        return coefficients
 
     @classmethod
     def _parse_color_config(cls, config_lines: list[str]) -> dict[str, Style]:
-        color_config: dict[str, Style] = {}
-        for config_line in config_lines:
-            config_line = config_line.strip()
-            if not config_line.startswith("color."):
-                continue
-            config_line_split = config_line.split()
-            attribute = config_line_split[0].split(".", maxsplit=1)[1]
-            config_line_colors = " ".join(config_line_split[1:])
-            style = cls._parse_style(config_line_colors)
-            color_config[attribute] = style
-        return color_config
+        return cls._parse_colors(cls._parse_settings(config_lines))
+
+    @classmethod
+    def _parse_colors(cls, settings: dict[str, str]) -> dict[str, Style]:
+        """Return the styles of the `color.*` settings by the name after `color.`."""
+        return {key.removeprefix("color."): cls._parse_style(value) for key, value in settings.items() if key.startswith("color.")}
 
     @classmethod
     def _parse_style(cls, style_config: str) -> Style:
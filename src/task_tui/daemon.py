@@ -0,0 +1,248 @@
+import asyncio
+import json
+import logging
+import os
+import stat
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from task_tui.config import Config
+from task_tui.data_models import ContextInfo, Task
+from task_tui.data_sources import TaskChampionSource
+from task_tui.decoders import PydanticDecoder, encode_tasks
+from task_tui.exceptions import DaemonError, UnsupportedFilterError
+from task_tui.filters import parse_filter
+from task_tui.refresh import RefreshPipeline
+from task_tui.snapshot import snapshot_key
+from task_tui.task_cli import STREAM_LINE_LIMIT, AsyncTaskCli
+from task_tui.utils import get_current_datetime
+
+log = logging.getLogger(__name__)
+
+# a daemon that doesn't accept a connection within this many seconds is taken for gone
+CONNECT_TIMEOUT = 1.0
+
+
+@dataclass(frozen=True)
+class DaemonReport:
+    """A report as the daemon exported it, with the config and context it was exported with.
+
+    The tasks are the whole report unless the daemon had to apply the context's filter, which is then the read filter.
+    """
+
+    config: Config
+    context: ContextInfo | None
+    headings: list[tuple[str, str]]
+    tasks: list[Task]
+    read_filter: str = ""
+
+
+def default_socket_path() -> Path:
+    """Return the socket of the daemon, in the user's runtime directory if there is one.
+
+    Otherwise it is in a directory of the user in the temporary directory, which `TaskDaemon.serve` creates so that
+    only the user may enter it.
+    """
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime_dir:
+        return Path(runtime_dir) / "task-tui.sock"
+    return Path(tempfile.gettempdir()) / f"task-tui-{os.getuid()}" / "task-tui.sock"
+
+
+def check_socket(socket_path: Path) -> None:
+    """Make sure that the socket and its directory belong to the user, so that nobody else can pose as the daemon.
+
+    The socket must be owned by the user and neither the group nor others may access it.
+
+    Raises:
+        DaemonError: If there is no socket or it may belong to someone else.
+    """
+    try:
+        socket_stat = socket_path.lstat()
+    except OSError as e:
+        raise DaemonError(f"No daemon is listening on {socket_path}: {e}") from e
+    if not stat.S_ISSOCK(socket_stat.st_mode) or socket_stat.st_uid != os.getuid() or socket_stat.st_mode & 0o077:
+        raise DaemonError(f"{socket_path} isn't a socket that only the user may access")
+    _check_directory(socket_path.parent)
+
+
+def _check_directory(directory: Path) -> None:
+    """Make sure that nobody else can replace a socket in the directory.
+
+    It must be owned by the user or root, and others may only write to it if it is sticky like /tmp.
+    """
+    try:
+        directory_stat = directory.stat()
+    except OSError as e:
+        raise DaemonError(f"Can't check the directory {directory}: {e}") from e
+    if directory_stat.st_uid not in (os.getuid(), 0) or (directory_stat.st_mode & 0o022 and not directory_stat.st_mode & stat.S_ISVTX):
+        raise DaemonError(f"Others may replace the socket in {directory}")
+
+
+class TaskDaemon:
+    """A long-lived process that answers the exports of task-tui instances, e.g. one per tmux pane.
+
+    The daemon keeps the config, the active context and the exported reports warm and only asks taskwarrior again after
+    it wrote to the taskrc or the data directory (see `snapshot_key`), so any number of TUIs share one set of data and
+    one pipeline of `task` calls. Requests are answered one after another, a refresh that several TUIs ask for at once
+    runs only once. The answers are kept encoded, so a TUI attaching to a warm daemon costs no more than copying them.
+
+    It listens on a Unix socket. A request is a line of JSON, e.g. `{"op": "report", "report": "next"}`, the answer a
+    line of JSON followed by as many bytes of tasks (encoded by `encode_tasks`) as its `size` says.
+    """
+
+    def __init__(self, task_cli: AsyncTaskCli, data_source: str = "task") -> None:
+        self.task_cli = task_cli
+        self.data_source = data_source
+        self._config: Config | None = None
+        self._context: ContextInfo | None = None
+        # the modification times the config and the exports belong to, see `snapshot_key`
+        self._key: dict[str, int | None] | None = None
+        self._answers: dict[str, bytes] = {}
+        self._lock = asyncio.Lock()
+        self.exports = 0
+
+    async def serve(self, socket_path: Path) -> None:
+        """Listen on the socket until cancelled, only the user may connect.
+
+        A missing directory of the socket is created for the user alone. A socket left behind is only replaced if
+        `check_socket` finds that it belongs to the user.
+        """
+        socket_path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+        _check_directory(socket_path.parent)
+        if socket_path.exists():
+            check_socket(socket_path)
+            if await _is_listening(socket_path):
+                raise DaemonError(f"A daemon is already listening on {socket_path}")
+            socket_path.unlink()
+        # created without access for the group and others, instead of changing its mode after binding
+        umask = os.umask(0o177)
+        try:
+            server = await asyncio.start_unix_server(self._handle_connection, path=socket_path, limit=STREAM_LINE_LIMIT)
+        finally:
+            os.umask(umask)
+        log.info("Serving on %s", socket_path)
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            socket_path.unlink(missing_ok=True)
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while line := await reader.readline():
+                request = json.loads(line)
+                writer.write(await self.answer(request if isinstance(request, dict) else {}))
+                await writer.drain()
+        except (ConnectionError, ValueError) as e:
+            log.debug("Dropping connection: %s", e)
+        finally:
+            writer.close()
+
+    async def answer(self, request: dict[str, Any]) -> bytes:
+        """Return the encoded answer to a request, errors are answered instead of raised."""
+        if request.get("op") != "report":
+            return _encode_answer({"ok": False, "error": f"Unknown request {request.get('op')}"})
+        if request.get("data_source", self.data_source) != self.data_source:
+            return _encode_answer({"ok": False, "error": f"The daemon reads tasks from {self.data_source}"})
+        try:
+            return await self._report_answer(str(request["report"]))
+        except Exception as e:
+            log.warning("Failed to answer %s: %s", request, e)
+            return _encode_answer({"ok": False, "error": str(e)})
+
+    async def _report_answer(self, report: str) -> bytes:
+        async with self._lock:
+            if self._config is None or snapshot_key(self._config) != self._key:
+                await self._reload()
+            answer = self._answers.get(report)
+            if answer is None:
+                answer = self._answers[report] = await self._export(report)
+            return answer
+
+    async def _reload(self) -> None:
+        """Load the config and context again and forget the exports, which may be outdated."""
+        pipeline = RefreshPipeline()
+        pipeline.add_phase("config", self.task_cli.get_config)
+        pipeline.add_phase("context", self.task_cli.get_context)
+        results = await pipeline.run()
+        self._config = results["config"]
+        self._context = results["context"]
+        # taken before exporting, so that a change while exporting leads to another reload
+        self._key = snapshot_key(self._config)
+        self._answers.clear()
+        if self.data_source == TaskChampionSource.name:
+            source = TaskChampionSource.from_config(self._config)
+            self.task_cli.data_sources = [source] if source is not None else []
+        log.debug("Reloaded the config, context %s", self._context.name if self._context else None)
+
+    async def _export(self, report: str) -> bytes:
+        assert self._config is not None
+        headings = await self.task_cli.get_report_columns(report)
+        read_filter = self._context.read_filter if self._context else ""
+        try:
+            # the TUIs filter the whole report themselves, so they can switch contexts without another export
+            parse_filter(read_filter, get_current_datetime(), self._config.weekstart)
+            read_filter = ""
+        except UnsupportedFilterError:
+            pass
+        tasks = await self.task_cli.export_tasks(report, read_filter=read_filter)
+        self.exports += 1
+        log.info("Exported %d tasks of report %s", len(tasks), report)
+        header = {
+            "ok": True,
+            "settings": self._config.settings,
+            "context": None if self._context is None else {"name": self._context.name, "read_filter": self._context.read_filter},
+            "headings": headings,
+            "read_filter": read_filter,
+        }
+        return _encode_answer(header, encode_tasks(tasks))
+
+
+def _encode_answer(header: dict[str, Any], payload: bytes = b"") -> bytes:
+    return json.dumps({**header, "size": len(payload)}).encode() + b"\n" + payload
+
+
+async def _is_listening(socket_path: Path) -> bool:
+    try:
+        _, writer = await asyncio.wait_for(asyncio.open_unix_connection(socket_path), CONNECT_TIMEOUT)
+    # including the TimeoutError of `wait_for`
+    except OSError:
+        return False
+    writer.close()
+    return True
+
+
+async def fetch_report(socket_path: Path, report: str, data_source: str = "task") -> DaemonReport:
+    """Ask the daemon listening on the socket for a report.
+
+    Raises:
+        DaemonError: If no daemon is listening, the socket may belong to someone else (see `check_socket`) or the
+            daemon couldn't export the report.
+    """
+    check_socket(socket_path)
+    try:
+        reader, writer = await asyncio.wait_for(asyncio.open_unix_connection(socket_path, limit=STREAM_LINE_LIMIT), CONNECT_TIMEOUT)
+    except OSError as e:
+        raise DaemonError(f"No daemon is listening on {socket_path}: {e}") from e
+    try:
+        writer.write(json.dumps({"op": "report", "report": report, "data_source": data_source}).encode() + b"\n")
+        await writer.drain()
+        header = json.loads(await reader.readline())
+        if not header["ok"]:
+            raise DaemonError(header["error"])
+        payload = await reader.readexactly(header["size"])
+        context = header["context"]
+        return DaemonReport(
+            config=Config.from_settings(header["settings"]),
+            context=None if context is None else ContextInfo(name=context["name"], read_filter=context["read_filter"], is_active=True),
+            headings=[(column, label) for column, label in header["headings"]],
+            tasks=PydanticDecoder().decode_array(payload),
+            read_filter=header["read_filter"],
+        )
+    except (OSError, ValueError, KeyError, TypeError, asyncio.IncompleteReadError) as e:
+        raise DaemonError(f"The daemon on {socket_path} didn't answer: {e!r}") from e
+    finally:
+        writer.close()
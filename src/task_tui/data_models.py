@@ -4,9 +4,17 @@ from enum import StrEnum, auto
 from typing import Annotated
 from uuid import UUID
 
-from pydantic import BaseModel, BeforeValidator, ConfigDict
+from pydantic import BaseModel, BeforeValidator, ConfigDict, Field
 
-IsoDateTime = Annotated[datetime, BeforeValidator(datetime.fromisoformat)]
+
+def _parse_iso_datetime(value: str | datetime) -> datetime:
+    # pydantic-core can't parse the compact ISO 8601 format taskwarrior exports (`20240101T120000Z`), `fromisoformat` can
+    if isinstance(value, datetime):
+        return value
+    return datetime.fromisoformat(value)
+
+
+IsoDateTime = Annotated[datetime, BeforeValidator(_parse_iso_datetime)]
 
 
 class VirtualTag(StrEnum):
@@ -65,9 +73,10 @@ class Task(BaseModel):
     urgency: float
     annotations: list[Annotation] | None = None
     priority: str | None = None
-    tags: set[str] = set()
-    depends: set[UUID] = set()
-    virtual_tags: set[VirtualTag] = set()
+    # default factories instead of `set()` defaults, which pydantic would deep-copy for every validated task
+    tags: set[str] = Field(default_factory=set)
+    depends: set[UUID] = Field(default_factory=set)
+    virtual_tags: set[VirtualTag] = Field(default_factory=set)
 
     model_config = ConfigDict(extra="allow")
 
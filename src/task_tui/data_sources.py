@@ -0,0 +1,110 @@
+import json
+import logging
+import os
+import sqlite3
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any, Protocol
+from uuid import UUID
+
+from task_tui.config import Config
+from task_tui.data_models import Status, Task
+from task_tui.utils import gc_paused
+
+log = logging.getLogger(__name__)
+
+REPLICA_FILE_NAME = "taskchampion.sqlite3"
+# reports whose filter doesn't restrict the exported tasks, so they can be served without evaluating a filter
+UNFILTERED_REPORTS = {None, "all"}
+TIMESTAMP_KEYS = {"entry", "modified", "due", "start", "scheduled", "wait", "end", "until"}
+
+
+class TaskDataSource(Protocol):
+    """A read-only source of tasks that can replace `task export` for some exports.
+
+    Writes always go through the `task` CLI; a data source only has to answer exports, and may decline any export it
+    can't answer exactly (e.g. because it can't evaluate the report's filter), in which case `task export` is used.
+    """
+
+    name: str
+
+    def supports(self, report: str | None, read_filter: str, modified_after: datetime | None) -> bool: ...
+
+    def export(self, report: str | None, read_filter: str, modified_after: datetime | None) -> list[Task]: ...
+
+
+class TaskChampionSource:
+    """Read tasks directly from the TaskChampion SQLite replica used by taskwarrior 3.
+
+    The replica is opened read-only, so it can be read while `task` is writing to it. Values are stored as strings:
+    timestamps are unix epochs, tags, dependencies and annotations are encoded in the key (`tag_<name>`, `dep_<uuid>`,
+    `annotation_<epoch>`) and IDs come from the `working_set` table.
+
+    NOTE: urgency is not stored in the replica, so exported tasks have an urgency of 0.
+    """
+
+    name = "taskchampion"
+
+    def __init__(self, replica_path: Path) -> None:
+        self.replica_path = replica_path
+
+    @classmethod
+    def from_config(cls, config: Config) -> "TaskChampionSource | None":
+        """Create the source for the replica in the configured data location, if there is one."""
+        data_location = os.environ.get("TASKDATA") or config.data_location
+        replica_path = Path(data_location).expanduser() / REPLICA_FILE_NAME
+        if not replica_path.is_file():
+            log.debug("No TaskChampion replica at %s", replica_path)
+            return None
+        return cls(replica_path)
+
+    def supports(self, report: str | None, read_filter: str, modified_after: datetime | None) -> bool:
+        return report in UNFILTERED_REPORTS and not read_filter
+
+    def export(self, report: str | None, read_filter: str, modified_after: datetime | None) -> list[Task]:
+        connection = sqlite3.connect(f"{self.replica_path.as_uri()}?mode=ro", uri=True)
+        try:
+            ids = {uuid: id for id, uuid in connection.execute("SELECT id, uuid FROM working_set WHERE uuid IS NOT NULL")}
+            rows = connection.execute("SELECT uuid, data FROM tasks").fetchall()
+        finally:
+            connection.close()
+
+        now = datetime.now(UTC)
+        modified_after_epoch = modified_after.timestamp() if modified_after is not None else None
+        tasks: list[Task] = []
+        with gc_paused():
+            for uuid, data in rows:
+                properties: dict[str, str] = json.loads(data)
+                if modified_after_epoch is not None and int(properties.get("modified", 0)) <= modified_after_epoch:
+                    continue
+                tasks.append(self._decode_task(uuid, properties, ids.get(uuid, 0), now))
+        log.debug("Read %d tasks from %s", len(tasks), self.replica_path)
+        return tasks
+
+    @staticmethod
+    def _decode_task(uuid: str, properties: dict[str, str], id: int, now: datetime) -> Task:
+        fields: dict[str, Any] = {"id": id, "uuid": uuid, "urgency": 0.0}
+        tags: set[str] = set()
+        depends: set[UUID] = set()
+        annotations: list[dict[str, Any]] = []
+        for key, value in properties.items():
+            if key in TIMESTAMP_KEYS:
+                fields[key] = datetime.fromtimestamp(int(value), UTC)
+            elif key.startswith("tag_"):
+                tags.add(key[4:])
+            elif key.startswith("dep_"):
+                depends.add(UUID(key[4:]))
+            elif key.startswith("annotation_"):
+                annotations.append({"entry": datetime.fromtimestamp(int(key[11:]), UTC), "description": value})
+            else:
+                fields[key] = value
+        fields["tags"] = tags
+        fields["depends"] = depends
+        if annotations:
+            fields["annotations"] = sorted(annotations, key=lambda a: a["entry"])
+        # taskwarrior derives the waiting status from the wait date instead of storing it
+        if fields.get("status") == Status.PENDING and fields.get("wait") is not None and fields["wait"] > now:
+            fields["status"] = Status.WAITING
+        fields.setdefault("entry", fields.get("modified", now))
+        fields.setdefault("modified", fields["entry"])
+        return Task.model_validate(fields)
@@ -0,0 +1,91 @@
+from typing import Protocol
+
+from pydantic import TypeAdapter
+
+from task_tui.data_models import Task
+from task_tui.utils import gc_paused
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on the installed extras
+    orjson = None
+
+_task_list_adapter = TypeAdapter(list[Task])
+
+
+class TaskDecoder(Protocol):
+    """Decodes the JSON written by `task export` into `Task` models."""
+
+    name: str
+
+    def decode_line(self, line: str | bytes) -> Task:
+        """Decode a single task, i.e. one line of an export with `rc.json.array=0`."""
+        ...
+
+    def decode_array(self, data: str | bytes) -> list[Task]:
+        """Decode a complete export made with `rc.json.array=1`."""
+        ...
+
+
+class PydanticDecoder:
+    """Parse and validate with pydantic-core, which validates a whole export array in a single call."""
+
+    name = "pydantic"
+
+    def decode_line(self, line: str | bytes) -> Task:
+        return Task.model_validate_json(line)
+
+    def decode_array(self, data: str | bytes) -> list[Task]:
+        if not data.strip():
+            return []
+        with gc_paused():
+            return _task_list_adapter.validate_json(data)
+
+
+class OrjsonDecoder:
+    """Parse with orjson and validate the parsed objects with pydantic. Only available if orjson is installed."""
+
+    name = "orjson"
+
+    def __init__(self) -> None:
+        if orjson is None:
+            raise ImportError("The orjson decoder needs orjson to be installed")
+        self._loads = orjson.loads
+
+    def decode_line(self, line: str | bytes) -> Task:
+        return Task.model_validate(self._loads(line))
+
+    def decode_array(self, data: str | bytes) -> list[Task]:
+        if not data.strip():
+            return []
+        with gc_paused():
+            return _task_list_adapter.validate_python(self._loads(data))
+
+
+def encode_tasks(tasks: list[Task]) -> bytes:
+    """Encode tasks as a JSON array that the decoders read back, e.g. to cache them.
+
+    Virtual tags are left out, a `TaskStore` recomputes them.
+    """
+    return _task_list_adapter.dump_json(tasks, exclude={"__all__": {"virtual_tags"}}, exclude_none=True)
+
+
+# pydantic-core is at least as fast as orjson plus `validate_python` (see `benchmarks/bench_decoders.py`), so it stays
+# the default even if orjson is installed
+DEFAULT_DECODER = PydanticDecoder.name
+
+
+def available_decoders() -> dict[str, TaskDecoder]:
+    decoders: dict[str, TaskDecoder] = {PydanticDecoder.name: PydanticDecoder()}
+    if orjson is not None:
+        decoders[OrjsonDecoder.name] = OrjsonDecoder()
+    return decoders
+
+
+def get_decoder(name: str | None = None) -> TaskDecoder:
+    """Return the decoder with the given name, or the default decoder if no name is given."""
+    decoders = available_decoders()
+    name = name or DEFAULT_DECODER
+    if name not in decoders:
+        raise ValueError(f"Unknown or unavailable decoder {name}, available decoders: {', '.join(decoders)}")
+    return decoders[name]
@@ -0,0 +1,190 @@
+from collections import deque
+from typing import Callable, Iterable, Iterator
+from uuid import UUID
+
+from task_tui.data_models import Status, Task
+
+_CLOSED = (Status.COMPLETED, Status.DELETED)
+_NO_DEPENDENCIES: frozenset[UUID] = frozenset()
+
+
+class DependencyGraph:
+    """The `depends` relations of a set of tasks, with forward and reverse edges keyed by UUID.
+
+    Edges to tasks that are not part of the graph (e.g. a dependency outside of the report's filter) are kept, so they
+    can be reported by `missing_dependencies` and take effect as soon as the task is added. Adding, changing or removing
+    a task only touches its own edges, the graph is never rebuilt.
+    """
+
+    def __init__(self, tasks: Iterable[Task] = ()) -> None:
+        self._dependencies: dict[UUID, frozenset[UUID]] = {}
+        self._dependents: dict[UUID, set[UUID]] = {}
+        # closed tasks are rare in a report, so they are the ones that are remembered
+        self._closed: set[UUID] = set()
+        # the initial edges are added directly, `set_task` would compare every task with its (empty) previous edges
+        for task in tasks:
+            dependencies = self._dependencies[task.uuid] = frozenset(task.depends) if task.depends else _NO_DEPENDENCIES
+            for uuid in dependencies:
+                self._dependents.setdefault(uuid, set()).add(task.uuid)
+            if task.status in _CLOSED:
+                self._closed.add(task.uuid)
+
+    def __contains__(self, uuid: object) -> bool:
+        return uuid in self._dependencies
+
+    def __len__(self) -> int:
+        return len(self._dependencies)
+
+    def __iter__(self) -> Iterator[UUID]:
+        return iter(self._dependencies)
+
+    def set_task(self, task: Task) -> None:
+        """Add the task, or update its dependencies and status if it is already part of the graph."""
+        previous = self._dependencies.get(task.uuid, _NO_DEPENDENCIES)
+        dependencies = frozenset(task.depends) if task.depends else _NO_DEPENDENCIES
+        for uuid in previous - dependencies:
+            self._remove_dependent(uuid, task.uuid)
+        for uuid in dependencies - previous:
+            self._dependents.setdefault(uuid, set()).add(task.uuid)
+        self._dependencies[task.uuid] = dependencies
+        if task.status in _CLOSED:
+            self._closed.add(task.uuid)
+        else:
+            self._closed.discard(task.uuid)
+
+    def remove_task(self, uuid: UUID) -> None:
+        """Remove the task and its own edges. Tasks depending on it keep their edges, which are missing from now on."""
+        for dependency_uuid in self._dependencies.pop(uuid, _NO_DEPENDENCIES):
+            self._remove_dependent(dependency_uuid, uuid)
+        self._closed.discard(uuid)
+
+    def _remove_dependent(self, uuid: UUID, dependent_uuid: UUID) -> None:
+        dependents = self._dependents[uuid]
+        dependents.discard(dependent_uuid)
+        if not dependents:
+            del self._dependents[uuid]
+
+    def dependencies(self, uuid: UUID) -> frozenset[UUID]:
+        """Return the UUIDs the task directly depends on, including the ones that are not part of the graph."""
+        return self._dependencies.get(uuid, _NO_DEPENDENCIES)
+
+    def dependents(self, uuid: UUID) -> frozenset[UUID]:
+        """Return the UUIDs of the tasks that directly depend on the task."""
+        return frozenset(self._dependents.get(uuid, ()))
+
+    def is_open(self, uuid: UUID) -> bool:
+        return uuid in self._dependencies and uuid not in self._closed
+
+    def is_blocked(self, uuid: UUID) -> bool:
+        """Whether the task is open and depends on an open task, i.e. the BLOCKED virtual tag."""
+        return self.is_open(uuid) and any(self.is_open(dependency_uuid) for dependency_uuid in self.dependencies(uuid))
+
+    def is_blocking(self, uuid: UUID) -> bool:
+        """Whether the task is open and an open task depends on it, i.e. the BLOCKING virtual tag."""
+        return self.is_open(uuid) and any(self.is_open(dependent_uuid) for dependent_uuid in self._dependents.get(uuid, ()))
+
+    def blocked(self) -> set[UUID]:
+        """Return all blocked tasks, in O(V+E) (only tasks with dependents are visited)."""
+        return {
+            uuid
+            for dependency_uuid, dependents in self._dependents.items()
+            if self.is_open(dependency_uuid)
+            for uuid in dependents
+            if self.is_open(uuid)
+        }
+
+    def blocking(self) -> set[UUID]:
+        """Return all blocking tasks, in O(V+E) (only tasks with dependents are visited)."""
+        return {uuid for uuid, dependents in self._dependents.items() if self.is_open(uuid) and any(map(self.is_open, dependents))}
+
+    def neighbourhood(self, uuids: Iterable[UUID]) -> set[UUID]:
+        """Return the tasks whose BLOCKED or BLOCKING tag can change with the given ones.
+
+        These are the tasks themselves, their dependencies and their dependents.
+        """
+        affected: set[UUID] = set()
+        for uuid in uuids:
+            affected.add(uuid)
+            affected.update(self.dependencies(uuid))
+            affected.update(self._dependents.get(uuid, ()))
+        return affected
+
+    def unblocks(self, uuid: UUID) -> set[UUID]:
+        """Return every task that directly or transitively depends on the task, i.e. everything finishing it unblocks."""
+        return self._reachable(uuid, lambda node: self._dependents.get(node, ()))
+
+    def transitive_dependencies(self, uuid: UUID) -> set[UUID]:
+        """Return every task the task directly or transitively depends on."""
+        return self._reachable(uuid, self.dependencies)
+
+    def _reachable(self, start: UUID, neighbours: Callable[[UUID], Iterable[UUID]]) -> set[UUID]:
+        seen: set[UUID] = set()
+        queue = deque(neighbours(start))
+        while queue:
+            uuid = queue.popleft()
+            if uuid in seen:
+                continue
+            seen.add(uuid)
+            queue.extend(neighbours(uuid))
+        seen.discard(start)
+        return seen
+
+    def missing_dependencies(self) -> dict[UUID, set[UUID]]:
+        """Return the dependencies that are not part of the graph, by the UUID of the depending task."""
+        missing: dict[UUID, set[UUID]] = {}
+        for uuid, dependents in self._dependents.items():
+            if uuid in self._dependencies:
+                continue
+            for dependent_uuid in dependents:
+                missing.setdefault(dependent_uuid, set()).add(uuid)
+        return missing
+
+    def find_cycles(self) -> list[list[UUID]]:
+        """Return the dependency cycles.
+
+        A cycle is a strongly connected component with more than one task, or a task depending on itself. This is Tarjan's algorithm with an explicit stack, so long dependency chains don't hit the recursion limit.
+        """
+        index_of: dict[UUID, int] = {}
+        low_link: dict[UUID, int] = {}
+        component_stack: list[UUID] = []
+        on_stack: set[UUID] = set()
+        cycles: list[list[UUID]] = []
+        # the tasks whose dependencies are being visited, with an iterator over the dependencies left to visit
+        work: list[tuple[UUID, Iterator[UUID]]] = []
+
+        def visit(uuid: UUID) -> None:
+            index_of[uuid] = low_link[uuid] = len(index_of)
+            component_stack.append(uuid)
+            on_stack.add(uuid)
+            work.append((uuid, iter(self._dependencies[uuid])))
+
+        for root in self._dependencies:
+            if root in index_of:
+                continue
+            visit(root)
+            while work:
+                uuid, dependencies = work[-1]
+                for dependency_uuid in dependencies:
+                    if dependency_uuid not in self._dependencies:
+                        continue
+                    if dependency_uuid not in index_of:
+                        visit(dependency_uuid)
+                        break
+                    if dependency_uuid in on_stack:
+                        low_link[uuid] = min(low_link[uuid], index_of[dependency_uuid])
+                else:
+                    work.pop()
+                    if work:
+                        parent = work[-1][0]
+                        low_link[parent] = min(low_link[parent], low_link[uuid])
+                    if low_link[uuid] == index_of[uuid]:
+                        component: list[UUID] = []
+                        while True:
+                            member = component_stack.pop()
+                            on_stack.discard(member)
+                            component.append(member)
+                            if member == uuid:
+                                break
+                        if len(component) > 1 or uuid in self._dependencies[uuid]:
+                            cycles.append(component)
+        return cycles
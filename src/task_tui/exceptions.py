@@ -1,2 +1,10 @@
 class TaskStoreError(Exception):
     pass
+
+
+class UnsupportedFilterError(Exception):
+    """A filter uses syntax that only taskwarrior itself can evaluate."""
+
+
+class DaemonError(Exception):
+    """The task-tui daemon can't be reached or couldn't answer a request."""
@@ -0,0 +1,414 @@
+import math
+import shlex
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Iterable, Protocol
+from uuid import UUID
+
+from task_tui.data_models import Status, Task, VirtualTag
+from task_tui.exceptions import UnsupportedFilterError
+
+DATE_ATTRIBUTES = ("due", "scheduled", "wait", "until", "entry", "modified", "start", "end")
+# every attribute taskwarrior knows, so that an abbreviation (e.g. `pro:`) is only resolved if it is unambiguous
+_ATTRIBUTES = (
+    "status",
+    "project",
+    "priority",
+    "limit",
+    *DATE_ATTRIBUTES,
+    "description",
+    "recur",
+    "tags",
+    "uuid",
+    "id",
+    "urgency",
+    "depends",
+    "parent",
+)
+_ABBREVIATION_MINIMUM = 2
+
+# taskwarrior's virtual tags that the store computes, see `TaskStore._add_own_virtual_tags`
+_STORED_VIRTUAL_TAGS = {
+    "ACTIVE": VirtualTag.ACTIVE,
+    "BLOCKED": VirtualTag.BLOCKED,
+    "BLOCKING": VirtualTag.BLOCKING,
+    "COMPLETED": VirtualTag.COMPLETED,
+    "DELETED": VirtualTag.DELETED,
+    "DUE": VirtualTag.DUE,
+    "DUETODAY": VirtualTag.DUETODAY,
+    "TODAY": VirtualTag.DUETODAY,
+    "OVERDUE": VirtualTag.OVERDUE,
+    "PRIORITY": VirtualTag.PRIORITY,
+    "SCHEDULED": VirtualTag.SCHEDULED,
+    "TAGGED": VirtualTag.TAGGED,
+    "UNTIL": VirtualTag.UNTIL,
+    "WAITING": VirtualTag.WAITING,
+}
+_UNSUPPORTED_VIRTUAL_TAGS = {
+    "ANNOTATED", "CHILD", "INSTANCE", "LATEST", "MONTH", "ORPHAN", "PARENT", "QUARTER", "READY", "TEMPLATE", "TOMORROW", "UDA",
+    "WEEK", "YEAR", "YESTERDAY",
+}  # fmt: skip
+_WEEKDAYS = ("monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday")
+
+
+class FilterIndex:
+    """Per-attribute indexes of a set of tasks, so that a filter is evaluated with set operations instead of a scan.
+
+    Every index is built the first time a filter needs it.
+    """
+
+    def __init__(self, tasks: Iterable[Task]) -> None:
+        self.tasks = list(tasks)
+        self.all_uuids = {task.uuid for task in self.tasks}
+        self._by_value: dict[str, dict[object, set[UUID]]] = {}
+        self._by_date: dict[str, tuple[list[float], list[UUID]]] = {}
+
+    def by_value(self, attribute: str) -> dict[object, set[UUID]]:
+        """Return the UUIDs of the tasks by value of an attribute, the elements of a set attribute (e.g. tags) count separately."""
+        index = self._by_value.get(attribute)
+        if index is None:
+            index = self._by_value[attribute] = {}
+            for task in self.tasks:
+                value = getattr(task, attribute)
+                for element in value if isinstance(value, set) else (value,):
+                    index.setdefault(element, set()).add(task.uuid)
+        return index
+
+    def with_value(self, attribute: str, value: object) -> set[UUID]:
+        return self.by_value(attribute).get(value, set())
+
+    def in_date_range(self, attribute: str, lower: datetime | None, upper: datetime | None, *, inclusive: bool = False) -> set[UUID]:
+        """Return the tasks with a date strictly between `lower` and `upper` (or including them), a missing bound is open."""
+        index = self._by_date.get(attribute)
+        if index is None:
+            dated = sorted((value.timestamp(), task.uuid) for task in self.tasks if (value := getattr(task, attribute)) is not None)
+            index = self._by_date[attribute] = ([timestamp for timestamp, _ in dated], [uuid for _, uuid in dated])
+        timestamps, uuids = index
+        start = 0 if lower is None else (bisect_left if inclusive else bisect_right)(timestamps, lower.timestamp())
+        end = len(timestamps) if upper is None else (bisect_right if inclusive else bisect_left)(timestamps, upper.timestamp())
+        return set(uuids[start:end])
+
+
+class _Node(Protocol):
+    def matches(self, task: Task) -> bool: ...
+
+    def select(self, index: FilterIndex) -> set[UUID]: ...
+
+
+@dataclass(frozen=True)
+class _Everything:
+    def matches(self, task: Task) -> bool:
+        return True
+
+    def select(self, index: FilterIndex) -> set[UUID]:
+        return set(index.all_uuids)
+
+
+@dataclass(frozen=True)
+class _And:
+    operands: tuple[_Node, ...]
+
+    def matches(self, task: Task) -> bool:
+        return all(operand.matches(task) for operand in self.operands)
+
+    def select(self, index: FilterIndex) -> set[UUID]:
+        selected = self.operands[0].select(index)
+        for operand in self.operands[1:]:
+            if not selected:
+                break
+            selected &= operand.select(index)
+        return selected
+
+
+@dataclass(frozen=True)
+class _Or:
+    operands: tuple[_Node, ...]
+
+    def matches(self, task: Task) -> bool:
+        return any(operand.matches(task) for operand in self.operands)
+
+    def select(self, index: FilterIndex) -> set[UUID]:
+        return set().union(*(operand.select(index) for operand in self.operands))
+
+
+@dataclass(frozen=True)
+class _Not:
+    operand: _Node
+
+    def matches(self, task: Task) -> bool:
+        return not self.operand.matches(task)
+
+    def select(self, index: FilterIndex) -> set[UUID]:
+        return index.all_uuids - self.operand.select(index)
+
+
+@dataclass(frozen=True)
+class _Equals:
+    """An attribute with the given value, or the given element for set attributes like tags."""
+
+    attribute: str
+    value: object
+
+    def matches(self, task: Task) -> bool:
+        value = getattr(task, self.attribute)
+        return self.value in value if isinstance(value, set) else value == self.value
+
+    def select(self, index: FilterIndex) -> set[UUID]:
+        return set(index.with_value(self.attribute, self.value))
+
+
+@dataclass(frozen=True)
+class _Project:
+    """The project or one of its subprojects, like taskwarrior's `project:` does."""
+
+    name: str
+
+    def matches(self, task: Task) -> bool:
+        return task.project is not None and (task.project == self.name or task.project.startswith(self.name + "."))
+
+    def select(self, index: FilterIndex) -> set[UUID]:
+        prefix = self.name + "."
+        matching = (
+            uuids
+            for project, uuids in index.by_value("project").items()
+            if isinstance(project, str) and (project == self.name or project.startswith(prefix))
+        )
+        return set().union(*matching)
+
+
+@dataclass(frozen=True)
+class _DateRange:
+    attribute: str
+    lower: datetime | None = None
+    upper: datetime | None = None
+    inclusive: bool = False
+
+    def matches(self, task: Task) -> bool:
+        value: datetime | None = getattr(task, self.attribute)
+        if value is None:
+            return False
+        # compared as timestamps like the index does, which treats naive datetimes as local time
+        timestamp = value.timestamp()
+        lower = -math.inf if self.lower is None else self.lower.timestamp()
+        upper = math.inf if self.upper is None else self.upper.timestamp()
+        return lower <= timestamp <= upper if self.inclusive else lower < timestamp < upper
+
+    def select(self, index: FilterIndex) -> set[UUID]:
+        return index.in_date_range(self.attribute, self.lower, self.upper, inclusive=self.inclusive)
+
+
+@dataclass(frozen=True)
+class TaskFilter:
+    """A parsed taskwarrior filter, see `parse_filter`."""
+
+    text: str
+    root: _Node
+
+    def matches(self, task: Task) -> bool:
+        return self.root.matches(task)
+
+    def select(self, index: FilterIndex) -> set[UUID]:
+        """Return the UUIDs of the indexed tasks that match the filter."""
+        return self.root.select(index)
+
+
+def resolve_named_date(name: str, now: datetime, weekstart: str = "sunday") -> datetime:
+    """Return the local time of one of taskwarrior's named dates (e.g. `eow`) or of an ISO 8601 date.
+
+    Raises:
+        UnsupportedFilterError: if the date can't be resolved without taskwarrior, e.g. date arithmetic like `today+2d`.
+    """
+    now = now.astimezone()
+    start_of_day = now.replace(hour=0, minute=0, second=0, microsecond=0)
+    one_day, last_second = timedelta(days=1), timedelta(seconds=1)
+    first_weekday = _WEEKDAYS.index(weekstart) if weekstart in _WEEKDAYS else _WEEKDAYS.index("sunday")
+    start_of_week = start_of_day - timedelta(days=(now.weekday() - first_weekday) % 7)
+    start_of_month = start_of_day.replace(day=1)
+    start_of_next_month = (start_of_month + timedelta(days=32)).replace(day=1)
+    start_of_year = start_of_month.replace(month=1)
+    start_of_next_year = start_of_year.replace(year=start_of_year.year + 1)
+    named_dates = {
+        "now": now,
+        "today": start_of_day,
+        "sod": start_of_day,
+        "eod": start_of_day + one_day - last_second,
+        "yesterday": start_of_day - one_day,
+        "tomorrow": start_of_day + one_day,
+        "socw": start_of_week,
+        "eow": start_of_week + 7 * one_day - last_second,
+        "eocw": start_of_week + 7 * one_day - last_second,
+        "sow": start_of_week + 7 * one_day,
+        "socm": start_of_month,
+        "eom": start_of_next_month - last_second,
+        "eocm": start_of_next_month - last_second,
+        "som": start_of_next_month,
+        "socy": start_of_year,
+        "eoy": start_of_next_year - last_second,
+        "eocy": start_of_next_year - last_second,
+        "soy": start_of_next_year,
+    }
+    if name.lower() in named_dates:
+        return named_dates[name.lower()]
+    try:
+        value = datetime.fromisoformat(name)
+    except ValueError:
+        raise UnsupportedFilterError(f"Unsupported date: {name}") from None
+    return value.astimezone() if value.tzinfo is None else value
+
+
+def _tokenize(text: str) -> list[str]:
+    try:
+        words = shlex.split(text)
+    except ValueError as e:
+        raise UnsupportedFilterError(str(e)) from e
+    tokens: list[str] = []
+    for word in words:
+        closing = len(word) - len(word.rstrip(")"))
+        word = word.rstrip(")")
+        while word.startswith("("):
+            tokens.append("(")
+            word = word[1:]
+        if word:
+            tokens.append(word)
+        tokens.extend(")" * closing)
+    return tokens
+
+
+class _Parser:
+    """Recursive descent parser for `or` of `and` (explicit or implicit) of optionally negated terms."""
+
+    def __init__(self, tokens: list[str], now: datetime, weekstart: str) -> None:
+        self.tokens = tokens
+        self.position = 0
+        self.now = now
+        self.weekstart = weekstart
+
+    def parse(self) -> _Node:
+        if not self.tokens:
+            return _Everything()
+        node = self._or()
+        if self.position < len(self.tokens):
+            raise UnsupportedFilterError(f"Unexpected {self.tokens[self.position]!r}")
+        return node
+
+    def _peek(self) -> str | None:
+        return self.tokens[self.position] if self.position < len(self.tokens) else None
+
+    def _or(self) -> _Node:
+        operands = [self._and()]
+        while self._peek() == "or":
+            self.position += 1
+            operands.append(self._and())
+        return operands[0] if len(operands) == 1 else _Or(tuple(operands))
+
+    def _and(self) -> _Node:
+        operands = [self._unary()]
+        while (token := self._peek()) is not None and token not in ("or", ")"):
+            if token == "and":
+                self.position += 1
+            operands.append(self._unary())
+        return operands[0] if len(operands) == 1 else _And(tuple(operands))
+
+    def _unary(self) -> _Node:
+        token = self._peek()
+        if token in ("not", "!"):
+            self.position += 1
+            return _Not(self._unary())
+        if token == "(":
+            self.position += 1
+            node = self._or()
+            if self._peek() != ")":
+                raise UnsupportedFilterError("Unbalanced parentheses")
+            self.position += 1
+            return node
+        if token is None or token in (")", "and", "or"):
+            raise UnsupportedFilterError(f"Expected a filter term instead of {token!r}")
+        self.position += 1
+        return self._term(token)
+
+    def _term(self, token: str) -> _Node:
+        if token[0] in "+-" and len(token) > 1 and ":" not in token:
+            node = self._tag(token[1:])
+            return node if token[0] == "+" else _Not(node)
+        name, separator, value = token.partition(":")
+        if not separator:
+            # a bare word is a search in the description
+            raise UnsupportedFilterError(f"Unsupported filter term: {token}")
+        attribute, _, modifier = name.partition(".")
+        return self._attribute(_resolve_attribute(attribute), modifier, value)
+
+    def _tag(self, tag: str) -> _Node:
+        if tag in _STORED_VIRTUAL_TAGS:
+            return _Equals("virtual_tags", _STORED_VIRTUAL_TAGS[tag])
+        if tag == "PENDING":
+            return _Equals("status", Status.PENDING)
+        if tag == "UNBLOCKED":
+            return _Not(_Equals("virtual_tags", VirtualTag.BLOCKED))
+        if tag == "PROJECT":
+            return _Not(_Equals("project", None))
+        if tag in _UNSUPPORTED_VIRTUAL_TAGS:
+            raise UnsupportedFilterError(f"Unsupported virtual tag: {tag}")
+        return _Equals("tags", tag)
+
+    def _attribute(self, attribute: str, modifier: str, value: str) -> _Node:
+        if modifier in ("none", "any") and attribute in ("project", "priority", *DATE_ATTRIBUTES):
+            missing = _Equals(attribute, None)
+            return missing if modifier == "none" else _Not(missing)
+        if attribute == "limit":
+            # the table shows the complete report, just like `task export` does
+            return _Everything()
+        if attribute == "status" and modifier in ("", "is"):
+            try:
+                return _Equals("status", Status(value.lower()))
+            except ValueError:
+                raise UnsupportedFilterError(f"Unknown status: {value}") from None
+        if attribute == "priority" and modifier in ("", "is", "not"):
+            priority = _Equals("priority", value or None)
+            return _Not(priority) if modifier == "not" else priority
+        if attribute == "project" and modifier in ("", "is", "not"):
+            project: _Node = _Equals("project", value or None) if modifier == "is" or not value else _Project(value)
+            return _Not(project) if modifier == "not" else project
+        if attribute in DATE_ATTRIBUTES:
+            return self._date(attribute, modifier, value)
+        raise UnsupportedFilterError(f"Unsupported filter attribute: {attribute}{'.' + modifier if modifier else ''}")
+
+    def _date(self, attribute: str, modifier: str, value: str) -> _Node:
+        if not value:
+            if modifier:
+                raise UnsupportedFilterError(f"Missing date for {attribute}.{modifier}")
+            return _Equals(attribute, None)
+        date = resolve_named_date(value, self.now, self.weekstart)
+        if modifier in ("before", "below"):
+            return _DateRange(attribute, upper=date)
+        if modifier in ("after", "above"):
+            return _DateRange(attribute, lower=date)
+        if modifier == "by":
+            return _DateRange(attribute, upper=date, inclusive=True)
+        if modifier in ("", "is", "equals"):
+            # a date attribute equals a date if it is on the same day
+            start_of_day = date.replace(hour=0, minute=0, second=0, microsecond=0)
+            return _DateRange(attribute, lower=start_of_day, upper=start_of_day + timedelta(days=1) - timedelta(microseconds=1), inclusive=True)
+        raise UnsupportedFilterError(f"Unsupported modifier: {attribute}.{modifier}")
+
+
+def _resolve_attribute(name: str) -> str:
+    if name in _ATTRIBUTES:
+        return name
+    candidates = [attribute for attribute in _ATTRIBUTES if len(name) >= _ABBREVIATION_MINIMUM and attribute.startswith(name)]
+    if len(candidates) != 1:
+        raise UnsupportedFilterError(f"Unknown or ambiguous attribute: {name}")
+    return candidates[0]
+
+
+def parse_filter(text: str, now: datetime, weekstart: str = "sunday") -> TaskFilter:
+    """Parse the common subset of taskwarrior's filter syntax, named dates are resolved relative to `now`.
+
+    Supported are `project:`, `status:`, `priority:`, the date attributes with the `before`, `after` and `by` modifiers
+    (and `none`/`any` for every attribute), `+tag`/`-tag` including most virtual tags, `and`, `or`, `not` and
+    parentheses. `limit:` is ignored.
+
+    Raises:
+        UnsupportedFilterError: if the filter uses anything else, so taskwarrior has to evaluate it.
+    """
+    return TaskFilter(text, _Parser(_tokenize(text), now, weekstart).parse())
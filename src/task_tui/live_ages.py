@@ -0,0 +1,68 @@
+import heapq
+from datetime import datetime
+from typing import Iterable
+from uuid import UUID
+
+from task_tui.utils import gc_paused, vague_duration_changes_in
+
+LiveAgeCell = tuple[UUID, str]
+
+
+class LiveAgeSchedule:
+    """The times at which relative date cells (e.g. "3min") change their text, in a min-heap.
+
+    Cells are identified by task UUID and column. Rescheduling a cell doesn't look for its previous entry in the heap,
+    outdated entries are skipped when they come up instead. Times are POSIX timestamps.
+    """
+
+    def __init__(self) -> None:
+        self._heap: list[tuple[float, UUID, str]] = []
+        self._deadlines: dict[LiveAgeCell, float] = {}
+
+    def __len__(self) -> int:
+        return len(self._deadlines)
+
+    def schedule_column(self, column: str, cells: Iterable[tuple[UUID, float | None]], now: datetime) -> None:
+        """Schedule the cells of a whole column at once.
+
+        The cells are given as task UUID and the shown duration, i.e. the seconds from `now` to the date, or None if the
+        cell has no date.
+        """
+        timestamp = now.timestamp()
+        changes_in = vague_duration_changes_in
+        # a column has tens of thousands of cells, creating their tuples would trigger several collections otherwise
+        with gc_paused():
+            entries = [(timestamp + changes_in(seconds), uuid, column) for uuid, seconds in cells if seconds is not None]
+            self._deadlines.update(((uuid, column), deadline) for deadline, uuid, column in entries)
+            self._heap.extend(entries)
+        heapq.heapify(self._heap)
+
+    def schedule(self, uuid: UUID, column: str, target: datetime | None, now: datetime) -> None:
+        """(Re)schedule the cell showing `target` relative to the current time, a cell without a date never changes."""
+        if target is None:
+            self._deadlines.pop((uuid, column), None)
+            return
+        deadline = now.timestamp() + vague_duration_changes_in((target - now).total_seconds())
+        self._deadlines[(uuid, column)] = deadline
+        heapq.heappush(self._heap, (deadline, uuid, column))
+
+    def next_deadline(self) -> float | None:
+        self._drop_outdated()
+        return self._heap[0][0] if self._heap else None
+
+    def pop_due(self, now: datetime) -> list[LiveAgeCell]:
+        """Remove and return the cells whose text has changed by `now`, they have to be scheduled again."""
+        timestamp = now.timestamp()
+        due: list[LiveAgeCell] = []
+        self._drop_outdated()
+        while self._heap and self._heap[0][0] <= timestamp:
+            _, uuid, column = heapq.heappop(self._heap)
+            self._deadlines.pop((uuid, column))
+            due.append((uuid, column))
+            self._drop_outdated()
+        return due
+
+    def _drop_outdated(self) -> None:
+        heap = self._heap
+        while heap and self._deadlines.get((heap[0][1], heap[0][2])) != heap[0][0]:
+            heapq.heappop(heap)
@@ -1,9 +1,12 @@
+import asyncio
 import logging
+from pathlib import Path
+from typing import Annotated
 
 import typer
 
-from task_tui.app import TaskTuiApp
-from task_tui.task_cli import TaskCli
+# the commands import the modules they need themselves: Textual and pydantic take a large part of the startup time,
+# which `--help` or `health` shouldn't pay for
 
 typer_app = typer.Typer(pretty_exceptions_enable=False)
 log = logging.getLogger(__name__)
@@ -13,6 +16,8 @@ DEFAULT_REPORT = "next"
 
 @typer_app.command()
 def health() -> None:
+    from task_tui.task_cli import TaskCli
+
     try:
         log.debug("Initiating TaskCli")
         TaskCli()
@@ -23,12 +28,65 @@ def health() -> None:
 
 
 @typer_app.command()
-def task_tui(report: str = DEFAULT_REPORT) -> None:
+def verify_urgency(report: str = "all", tolerance: float = 0.01) -> None:
+    """Compare the urgency taskwarrior exports with the urgency computed by task-tui, e.g. after changing coefficients."""
+    from task_tui.app import TaskStore
+    from task_tui.task_cli import TaskCli
+
+    task_cli = TaskCli()
+    config = task_cli.get_config()
+    store = TaskStore(task_cli.export_tasks(report), config)
+    mismatches = store.urgency_mismatches(tolerance)
+    for mismatch in mismatches:
+        print(
+            f"{mismatch.task.id or mismatch.task.uuid}: exported {mismatch.exported:.4f}, computed {mismatch.computed:.4f}  {mismatch.task.description}"
+        )
+    print(f"{len(store) - len(mismatches)} of {len(store)} tasks match")
+    if mismatches:
+        raise typer.Exit(code=1)
+
+
+@typer_app.command()
+def task_tui(
+    report: str = DEFAULT_REPORT,
+    data_source: Annotated[str, typer.Option(help="Where to read tasks from: `task` (task export) or `taskchampion` (the replica).")] = "task",
+    snapshot: Annotated[bool, typer.Option(help="Show the report of the last session while taskwarrior is asked for the current one.")] = True,
+    daemon: Annotated[bool, typer.Option(help="Take the tasks from a running `task-tui serve` instead of asking taskwarrior.")] = True,
+) -> None:
+    from task_tui.app import TaskTuiApp
+    from task_tui.daemon import check_socket, default_socket_path
+    from task_tui.exceptions import DaemonError
+    from task_tui.snapshot import default_snapshot_path
+
     log.debug("Starting TUI with report %s.", report)
-    task_tui_app = TaskTuiApp(report)
+    socket_path = default_socket_path()
+    daemon_socket = None
+    if daemon and socket_path.exists():
+        try:
+            check_socket(socket_path)
+            daemon_socket = socket_path
+        except DaemonError as e:
+            log.warning("Not taking the tasks from the daemon: %s", e)
+    task_tui_app = TaskTuiApp(report, data_source, default_snapshot_path(report, data_source) if snapshot else None, daemon_socket)
     task_tui_app.run()
 
 
+@typer_app.command()
+def serve(
+    data_source: Annotated[str, typer.Option(help="Where to read tasks from: `task` (task export) or `taskchampion` (the replica).")] = "task",
+    socket: Annotated[Path | None, typer.Option(help="The socket to listen on, by default in $XDG_RUNTIME_DIR.")] = None,
+) -> None:
+    """Keep the config and reports in a background process, which task-tui instances take their tasks from."""
+    from task_tui.daemon import TaskDaemon, default_socket_path
+    from task_tui.task_cli import AsyncTaskCli
+
+    daemon = TaskDaemon(AsyncTaskCli(), data_source)
+    try:
+        asyncio.run(daemon.serve(socket or default_socket_path()))
+    except KeyboardInterrupt:
+        log.info("Stopped serving")
+
+
 @typer_app.callback(invoke_without_command=True)
 def main(ctx: typer.Context, verbose: bool = False) -> None:
     logging_level = logging.DEBUG if verbose else logging.INFO
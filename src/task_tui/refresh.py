@@ -0,0 +1,191 @@
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Coroutine, Iterable
+
+from task_tui.data_models import Task
+
+log = logging.getLogger(__name__)
+
+PhaseFunction = Callable[..., Awaitable[Any]]
+
+
+@dataclass(frozen=True)
+class PhaseTiming:
+    name: str
+    # seconds since the start of the pipeline run
+    started: float
+    duration: float
+
+
+@dataclass(frozen=True)
+class _Phase:
+    name: str
+    function: PhaseFunction
+    depends_on: tuple[str, ...] = ()
+
+
+@dataclass
+class RefreshPipeline:
+    """Run the taskwarrior calls of a refresh concurrently, respecting the dependencies between them.
+
+    Every phase is a coroutine function that receives the results of the phases it depends on as positional arguments
+    (in the order given in `depends_on`). Phases without a dependency relation run in parallel. If one phase fails, the
+    remaining phases are cancelled and the error is propagated.
+    """
+
+    _phases: dict[str, _Phase] = field(default_factory=dict)
+    timings: list[PhaseTiming] = field(default_factory=list)
+
+    def add_phase(self, name: str, function: PhaseFunction, depends_on: tuple[str, ...] = ()) -> None:
+        if name in self._phases:
+            raise ValueError(f"Phase {name} is already part of the pipeline")
+        for dependency in depends_on:
+            if dependency not in self._phases:
+                raise ValueError(f"Phase {name} depends on unknown phase {dependency}")
+        self._phases[name] = _Phase(name, function, depends_on)
+
+    async def run(self) -> dict[str, Any]:
+        """Run all phases and return their results by phase name."""
+        self.timings = []
+        pipeline_start = time.perf_counter()
+        scheduled: dict[str, asyncio.Task[object]] = {}
+
+        async def run_phase(phase: _Phase) -> object:
+            arguments = [await scheduled[dependency] for dependency in phase.depends_on]
+            phase_start = time.perf_counter()
+            result = await phase.function(*arguments)
+            self.timings.append(PhaseTiming(phase.name, phase_start - pipeline_start, time.perf_counter() - phase_start))
+            return result
+
+        # phases can only depend on phases added before them, so insertion order is a valid topological order
+        try:
+            async with asyncio.TaskGroup() as task_group:
+                for phase in self._phases.values():
+                    scheduled[phase.name] = task_group.create_task(run_phase(phase), name=f"refresh-{phase.name}")
+        except ExceptionGroup as group:
+            # surface the original error so callers can handle it like a failed sequential call
+            raise group.exceptions[0]
+
+        log.debug("Refresh timings: %s", self.format_timings())
+        return {name: task.result() for name, task in scheduled.items()}
+
+    def format_timings(self) -> str:
+        return ", ".join(f"{t.name}={t.duration * 1000:.1f}ms (+{t.started * 1000:.1f}ms)" for t in self.timings)
+
+
+# Even with incremental syncs a full export is done regularly, as a safety net for changes that don't bump `modified`.
+FULL_RESYNC_INTERVAL = 300.0
+# `modified.after` compares with second granularity, so the high-water mark is moved back a bit to not miss any change.
+HIGH_WATER_OVERLAP = timedelta(seconds=1)
+
+
+@dataclass
+class SyncState:
+    """Bookkeeping for incremental exports.
+
+    Remembers the latest `modified` timestamp seen in an export (the high-water mark), so that the next sync only has to
+    export tasks that were modified after it.
+    """
+
+    full_resync_interval: float = FULL_RESYNC_INTERVAL
+    high_water: datetime | None = None
+    last_full_sync: float | None = None
+    incremental_syncs: int = 0
+    full_syncs: int = 0
+
+    def full_sync_due(self) -> bool:
+        if self.high_water is None or self.last_full_sync is None:
+            return True
+        return time.monotonic() - self.last_full_sync >= self.full_resync_interval
+
+    def modified_after(self) -> datetime | None:
+        if self.high_water is None:
+            return None
+        return self.high_water - HIGH_WATER_OVERLAP
+
+    def record_full_sync(self, tasks: Iterable[Task]) -> None:
+        self.high_water = max((task.modified for task in tasks), default=None)
+        self.last_full_sync = time.monotonic()
+        self.full_syncs += 1
+
+    def record_incremental_sync(self, tasks: Iterable[Task]) -> None:
+        self.high_water = max((task.modified for task in tasks), default=self.high_water)
+        self.incremental_syncs += 1
+
+    def invalidate(self) -> None:
+        """Force the next sync to be a full one, e.g. because the context and thereby the exported set changed."""
+        self.high_water = None
+        self.last_full_sync = None
+
+
+# Refresh requests arriving within this many seconds are merged into a single refresh.
+REFRESH_DEBOUNCE = 0.05
+
+
+@dataclass(frozen=True)
+class RefreshRequest:
+    select_task_id: int | None = None
+    full: bool = False
+
+    def merge(self, newer: "RefreshRequest") -> "RefreshRequest":
+        """Combine with a newer request, keeping its task selection (if it has one) and a full sync if either needs it."""
+        select_task_id = newer.select_task_id if newer.select_task_id is not None else self.select_task_id
+        return RefreshRequest(select_task_id, self.full or newer.full)
+
+
+class RefreshScheduler:
+    """Coalesce refresh requests, so that bursts of changes are answered by a single refresh.
+
+    Requests are collected for `debounce` seconds and merged before a refresh is started, and only one refresh runs at
+    a time. A request arriving while a refresh is running makes that refresh stale: it is cancelled (which kills the
+    export) and its request is merged into the next one. `request` tells the caller when `drain`, which runs the
+    refreshes until no request is pending, has to be started.
+    """
+
+    def __init__(self, refresh: Callable[[RefreshRequest], Coroutine[Any, Any, None]], debounce: float = REFRESH_DEBOUNCE) -> None:
+        self._refresh = refresh
+        self.debounce = debounce
+        self._pending: RefreshRequest | None = None
+        self._running: asyncio.Task[None] | None = None
+        self._draining = False
+        self.requested = 0
+        self.executed = 0
+        self.cancelled = 0
+
+    def request(self, request: RefreshRequest) -> bool:
+        """Schedule a refresh. Returns True if `drain` has to be started, i.e. no drain is running yet."""
+        self.requested += 1
+        self._pending = request if self._pending is None else self._pending.merge(request)
+        if self._running is not None and not self._running.done():
+            log.debug("Cancelling stale refresh")
+            self._running.cancel()
+        if self._draining:
+            return False
+        self._draining = True
+        return True
+
+    async def drain(self) -> None:
+        """Run refreshes until no request is pending."""
+        try:
+            while self._pending is not None:
+                await asyncio.sleep(self.debounce)
+                request, self._pending = self._pending, None
+                self._running = asyncio.create_task(self._refresh(request))
+                # `wait` instead of awaiting the task, a cancelled refresh must not cancel the drain
+                await asyncio.wait([self._running])
+                if self._running.cancelled():
+                    self.cancelled += 1
+                    # the refresh was cancelled by a newer request, which is pending now
+                    self._pending = request.merge(self._pending) if self._pending is not None else request
+                    continue
+                # re-raises the error of a failed refresh
+                self._running.result()
+                self.executed += 1
+        finally:
+            if self._running is not None and not self._running.done():
+                self._running.cancel()
+            self._running = None
+            self._draining = False
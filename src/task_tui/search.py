@@ -0,0 +1,121 @@
+from collections import defaultdict
+from typing import Iterable
+
+from task_tui.data_models import Task
+
+_TRIGRAM_LENGTH = 3
+# separates the description and the annotations, so that no match spans two of them
+_SEPARATOR = "\n"
+_NO_WORDS: frozenset[str] = frozenset()
+
+
+def _searchable_text(task: Task) -> str:
+    """Return the case-folded description and annotations of the task."""
+    parts = [task.description, *(annotation.description for annotation in task.annotations or ())]
+    return _SEPARATOR.join(parts).casefold()
+
+
+def _trigrams(text: str) -> set[str]:
+    return {text[start : start + _TRIGRAM_LENGTH] for start in range(len(text) - _TRIGRAM_LENGTH + 1)}
+
+
+class SearchIndex:
+    """An inverted index over the descriptions and annotations of tasks, for case-insensitive substring search.
+
+    Texts are split into words, each word lists the tasks containing it, and the words themselves are indexed by
+    trigram. A query without whitespace matches exactly the tasks of the words containing it, which the trigram index
+    finds without scanning the vocabulary; a query of several words is narrowed down that way and then checked against
+    the texts. Tasks are identified by a string key, the UUID as used for the rows of the report, which is much cheaper
+    to hash than a `UUID`. Adding, changing or removing a task only touches the postings of its own words.
+    """
+
+    def __init__(self, tasks: Iterable[tuple[str, Task]] = ()) -> None:
+        self._texts: dict[str, str] = {}
+        keys_by_word: defaultdict[str, set[str]] = defaultdict(set)
+        # the initial postings are added directly, `set_task` would compare every text with its (empty) previous one
+        for key, task in tasks:
+            text = self._texts[key] = _searchable_text(task)
+            for word in text.split():
+                keys_by_word[word].add(key)
+        self._keys_by_word: dict[str, set[str]] = dict(keys_by_word)
+        self._words_by_trigram: dict[str, set[str]] = {}
+        for word in self._keys_by_word:
+            self._add_word(word)
+
+    def __len__(self) -> int:
+        return len(self._texts)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._texts
+
+    def set_task(self, key: str, task: Task) -> None:
+        """Add the task, or update its text if it is already indexed."""
+        text = _searchable_text(task)
+        previous = self._texts.get(key)
+        if previous == text:
+            return
+        self._texts[key] = text
+        previous_words = set(previous.split()) if previous is not None else set()
+        words = set(text.split())
+        for word in previous_words - words:
+            self._remove_posting(word, key)
+        keys_by_word = self._keys_by_word
+        for word in words - previous_words:
+            keys = keys_by_word.get(word)
+            if keys is None:
+                keys_by_word[word] = {key}
+                self._add_word(word)
+            else:
+                keys.add(key)
+
+    def remove_task(self, key: str) -> None:
+        text = self._texts.pop(key, None)
+        if text is None:
+            return
+        for word in set(text.split()):
+            self._remove_posting(word, key)
+
+    def _add_word(self, word: str) -> None:
+        for trigram in _trigrams(word):
+            self._words_by_trigram.setdefault(trigram, set()).add(word)
+
+    def _remove_posting(self, word: str, key: str) -> None:
+        keys = self._keys_by_word[word]
+        keys.discard(key)
+        if keys:
+            return
+        del self._keys_by_word[word]
+        for trigram in _trigrams(word):
+            words = self._words_by_trigram[trigram]
+            words.discard(word)
+            if not words:
+                del self._words_by_trigram[trigram]
+
+    def _words_containing(self, fragment: str) -> Iterable[str]:
+        if len(fragment) < _TRIGRAM_LENGTH:
+            # too short for the trigram index, but the vocabulary is much smaller than the texts
+            return [word for word in self._keys_by_word if fragment in word]
+        # intersecting the smallest sets first keeps the intermediate sets small
+        word_sets = sorted((self._words_by_trigram.get(trigram, _NO_WORDS) for trigram in _trigrams(fragment)), key=len)
+        words = set(word_sets[0])
+        for other in word_sets[1:]:
+            if not words:
+                break
+            words &= other
+        if len(fragment) == _TRIGRAM_LENGTH:
+            return words
+        return [word for word in words if fragment in word]
+
+    def search(self, query: str) -> set[str]:
+        """Return the keys of the tasks whose description or an annotation contains the query, ignoring case."""
+        query = query.casefold()
+        fragments = query.split()
+        if not fragments:
+            return set()
+        # the longest word of the query is usually the most selective one, the short ones would match most tasks
+        longest = max(fragments, key=len)
+        matches = set().union(*(self._keys_by_word[word] for word in self._words_containing(longest)))
+        if fragments == [query]:
+            return matches
+        # the other words have to follow it (and whitespace has to match) as in the query
+        return {key for key in matches if query in self._texts[key]}
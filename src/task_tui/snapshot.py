@@ -0,0 +1,110 @@
+import json
+import logging
+import os
+import tempfile
+import zlib
+from dataclasses import dataclass
+from pathlib import Path
+
+from task_tui.config import Config
+from task_tui.data_models import Task
+from task_tui.decoders import PydanticDecoder, encode_tasks
+
+log = logging.getLogger(__name__)
+
+# bumped whenever the file format or the task model changes, older snapshots are then ignored
+SNAPSHOT_VERSION = 1
+# fastest zlib level, the JSON of tasks compresses well even so
+COMPRESSION_LEVEL = 1
+
+
+@dataclass(frozen=True)
+class Snapshot:
+    """What the TUI showed at the end of its last refresh, to paint the report before taskwarrior has answered."""
+
+    tasks: list[Task]
+    config: Config
+    headings: list[tuple[str, str]]
+
+
+def default_snapshot_path(report: str, data_source: str) -> Path:
+    """Return the snapshot file of a report in the XDG cache directory."""
+    cache_home = Path(os.environ.get("XDG_CACHE_HOME") or "~/.cache").expanduser()
+    return cache_home / "task-tui" / f"{report}.{data_source}.snapshot"
+
+
+def snapshot_key(config: Config) -> dict[str, int | None]:
+    """Return the modification times of the taskrc and the data directory with its files by path.
+
+    taskwarrior changes one of them whenever the configuration or a task changes, so a snapshot saved with a different
+    key may be out of date. Paths that don't exist have no time.
+    """
+    config_home = Path(os.environ.get("XDG_CONFIG_HOME") or "~/.config").expanduser()
+    taskrc_paths = [Path(os.environ["TASKRC"])] if os.environ.get("TASKRC") else [Path("~/.taskrc").expanduser(), config_home / "task" / "taskrc"]
+    data_dir = Path(os.environ.get("TASKDATA") or config.data_location).expanduser()
+    paths = [*taskrc_paths, data_dir]
+    try:
+        paths.extend(sorted(Path(entry.path) for entry in os.scandir(data_dir) if entry.is_file()))
+    except OSError:
+        pass
+    key: dict[str, int | None] = {}
+    for path in paths:
+        try:
+            key[str(path)] = path.stat().st_mtime_ns
+        except OSError:
+            key[str(path)] = None
+    return key
+
+
+def save_snapshot(path: Path, snapshot: Snapshot) -> None:
+    """Write the snapshot, replacing the previous one atomically so that a crash never leaves a truncated file.
+
+    Every writer uses a temporary file of its own, so TUIs saving the same report at once can't replace the snapshot
+    with each other's half-written files; the last one wins.
+
+    The file is a zlib compressed header line in JSON followed by the tasks as a JSON array, which pydantic-core
+    validates in a single call when the snapshot is loaded.
+    """
+    header = {
+        "version": SNAPSHOT_VERSION,
+        "key": snapshot_key(snapshot.config),
+        "settings": snapshot.config.settings,
+        "headings": snapshot.headings,
+    }
+    data = zlib.compress(json.dumps(header).encode() + b"\n" + encode_tasks(snapshot.tasks), COMPRESSION_LEVEL)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # in the same directory, as `os.replace` can't move a file to another file system atomically
+    descriptor, temporary_name = tempfile.mkstemp(dir=path.parent, prefix=f"{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(descriptor, "wb") as temporary_file:
+            temporary_file.write(data)
+            temporary_file.flush()
+            os.fsync(temporary_file.fileno())
+        os.replace(temporary_name, path)
+    except BaseException:
+        Path(temporary_name).unlink(missing_ok=True)
+        raise
+    log.debug("Saved snapshot of %d tasks to %s (%d bytes)", len(snapshot.tasks), path, len(data))
+
+
+def load_snapshot(path: Path) -> Snapshot | None:
+    """Return the snapshot saved at the path, or None if there is none or it is outdated or unreadable."""
+    try:
+        header_data, _, tasks_data = zlib.decompress(path.read_bytes()).partition(b"\n")
+        header = json.loads(header_data)
+        if header.get("version") != SNAPSHOT_VERSION:
+            log.debug("Ignoring snapshot %s of version %s", path, header.get("version"))
+            return None
+        config = Config.from_settings(header["settings"])
+        if header["key"] != snapshot_key(config):
+            log.debug("Ignoring snapshot %s, the taskrc or the data changed since it was saved", path)
+            return None
+        tasks = PydanticDecoder().decode_array(tasks_data)
+        headings = [(column, label) for column, label in header["headings"]]
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        log.warning("Ignoring unreadable snapshot %s: %s", path, e)
+        return None
+    log.debug("Loaded snapshot of %d tasks from %s", len(tasks), path)
+    return Snapshot(tasks, config, headings)
@@ -0,0 +1,75 @@
+import math
+from dataclasses import dataclass
+from typing import Sequence
+
+from task_tui.data_models import Task
+
+_DATE_COLUMNS = {"entry", "modified", "due", "start", "scheduled", "wait", "end", "until"}
+_NUMERIC_COLUMNS = {"id", "urgency"}
+
+
+@dataclass(frozen=True)
+class SortKey:
+    """One column of a report's sort order, e.g. `due+` or `project-/`."""
+
+    column: str
+    descending: bool = False
+    # `/` after the direction, taskwarrior separates the groups of tasks with the same value of the column
+    group_break: bool = False
+
+    def __str__(self) -> str:
+        return f"{self.column}{'-' if self.descending else '+'}{'/' if self.group_break else ''}"
+
+
+def parse_sort(spec: str) -> list[SortKey]:
+    """Parse the value of a `report.<name>.sort` setting, e.g. `project+/,urgency-`. A missing direction is ascending."""
+    keys: list[SortKey] = []
+    for item in spec.split(","):
+        item = item.strip()
+        group_break = item.endswith("/")
+        item = item.removesuffix("/")
+        descending = item.endswith("-")
+        column = item.rstrip("+-")
+        if column:
+            keys.append(SortKey(column, descending, group_break))
+    return keys
+
+
+def priority_ranks(values: Sequence[str]) -> dict[str | None, int]:
+    """Rank the values of `uda.priority.values`, which are listed from the highest to the lowest priority.
+
+    A task without priority ranks like the empty value, or below all values if there is none.
+    """
+    ranks: dict[str | None, int] = {value: len(values) - index for index, value in enumerate(values)}
+    ranks[None] = ranks.get("", 0)
+    return ranks
+
+
+def sort_value(task: Task, key: SortKey, ranks: dict[str | None, int]) -> float | str:
+    """Return the typed sort key of the task for one column of the sort order, see `sorts_in_reverse`.
+
+    Like taskwarrior, tasks without a date come last in both directions, so dates are negated instead of reversed.
+    Strings compare like taskwarrior's, i.e. case sensitive and with a missing value as the empty string.
+    """
+    column = key.column
+    if column in _DATE_COLUMNS:
+        value = getattr(task, column)
+        if value is None:
+            return math.inf
+        return -value.timestamp() if key.descending else value.timestamp()
+    if column in _NUMERIC_COLUMNS:
+        return getattr(task, column)
+    if column == "priority":
+        return ranks.get(task.priority, 0)
+    if column == "tags":
+        return ",".join(sorted(task.tags))
+    if column == "depends":
+        # taskwarrior compares the UUIDs, the IDs shown in the column change whenever a task is completed
+        return ",".join(sorted(map(str, task.depends)))
+    value = getattr(task, column, None)
+    return "" if value is None else str(value)
+
+
+def sorts_in_reverse(key: SortKey) -> bool:
+    """Whether the values of `sort_value` are sorted in reverse, which keeps the order of equal values like any sort."""
+    return key.descending and key.column not in _DATE_COLUMNS
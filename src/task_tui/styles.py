@@ -0,0 +1,119 @@
+import logging
+from functools import lru_cache
+from typing import Callable, NamedTuple
+
+from rich.style import Style
+
+from task_tui.data_models import Task, VirtualTag
+
+log = logging.getLogger(__name__)
+
+# distinct combinations of the attributes the rules look at, reports usually have a few dozen
+STYLE_CACHE_SIZE = 4096
+_VIRTUAL_TAGS = {tag.value: tag for tag in VirtualTag}
+
+
+class _StyleKey(NamedTuple):
+    """The attributes of a task that the color rules look at, all other attributes are left empty."""
+
+    virtual_tags: frozenset[VirtualTag]
+    project: str | None
+    tags: frozenset[str]
+    has_tags: bool
+    keywords: frozenset[str]
+    uda_values: tuple[object, ...]
+
+
+class ColorRules:
+    """taskwarrior's color rules (`color.*`), compiled in the order of `rule.precedence.color` to style task rows.
+
+    A precedence entry ending with a dot stands for all rules starting with it, e.g. `tag.` for `color.tag.next` and
+    `color.tag.none`, in alphabetical order like taskwarrior does. The rules are applied from the last precedence entry
+    to the first, so that the style of an earlier entry wins where both set an attribute. Rules that no precedence entry
+    names (e.g. `color.alternate`) don't style tasks.
+
+    Only a few attributes of a task decide its style: its virtual tags, project, tags, UDA values and the keywords in its
+    description and annotations, and of these only the ones a rule looks at. The styles are memoized by these
+    attributes, so styling a report merges the styles of its few distinct combinations instead of every task's.
+    """
+
+    def __init__(self, colors: dict[str, Style], precedence: str) -> None:
+        self._virtual_tags: set[VirtualTag] = set()
+        self._projects = False
+        self._tags: set[str] = set()
+        self._no_tags = False
+        self._keywords: set[str] = set()
+        self._udas: list[str] = []
+        # (predicate, style) in the order they are applied
+        self._rules: list[tuple[Callable[[_StyleKey], bool], Style]] = []
+        for entry in reversed([entry.strip() for entry in precedence.split(",") if entry.strip()]):
+            names = sorted(name for name in colors if name.startswith(entry)) if entry.endswith(".") else [entry]
+            for name in reversed(names):
+                predicate = self._compile(name) if name in colors else None
+                if predicate is not None:
+                    self._rules.append((predicate, colors[name]))
+        self._frozen_virtual_tags = frozenset(self._virtual_tags)
+        self._frozen_tags = frozenset(self._tags)
+        self._style_for_key = lru_cache(maxsize=STYLE_CACHE_SIZE)(self._merge_styles)
+        log.debug("Compiled %d color rules", len(self._rules))
+
+    def _compile(self, name: str) -> Callable[[_StyleKey], bool] | None:
+        """Return the predicate of the rule `color.<name>`, or None if it doesn't style tasks."""
+        kind, _, argument = name.partition(".")
+        if kind == "project" and argument:
+            self._projects = True
+            if argument == "none":
+                return lambda key: key.project is None
+            # taskwarrior matches projects leftmost, so that a rule also colors the subprojects
+            return lambda key: key.project is not None and key.project.startswith(argument)
+        if kind == "tag" and argument:
+            if argument == "none":
+                self._no_tags = True
+                return lambda key: not key.has_tags
+            self._tags.add(argument)
+            return lambda key: argument in key.tags
+        if kind == "keyword" and argument:
+            self._keywords.add(argument)
+            return lambda key: argument in key.keywords
+        if kind == "uda" and argument:
+            uda, _, value = argument.partition(".")
+            if uda not in self._udas:
+                self._udas.append(uda)
+            index = self._udas.index(uda)
+            if not value:
+                return lambda key: key.uda_values[index] not in (None, "")
+            if value == "none":
+                return lambda key: key.uda_values[index] in (None, "")
+            return lambda key: key.uda_values[index] == value
+        virtual_tag = _VIRTUAL_TAGS.get(name)
+        if virtual_tag is None:
+            return None
+        self._virtual_tags.add(virtual_tag)
+        return lambda key: virtual_tag in key.virtual_tags
+
+    def style_for(self, task: Task) -> Style:
+        return self._style_for_key(self._key(task))
+
+    def _key(self, task: Task) -> _StyleKey:
+        keywords: frozenset[str] = frozenset()
+        if self._keywords:
+            text = task.description
+            if task.annotations:
+                # config values are single lines, so a keyword can't match across the joined texts
+                text = "\n".join([text, *(annotation.description for annotation in task.annotations)])
+            keywords = frozenset(filter(text.__contains__, self._keywords))
+        return _StyleKey(
+            self._frozen_virtual_tags.intersection(task.virtual_tags),
+            task.project if self._projects else None,
+            self._frozen_tags.intersection(task.tags),
+            bool(task.tags) if self._no_tags else False,
+            keywords,
+            tuple(getattr(task, uda, None) for uda in self._udas),
+        )
+
+    def _merge_styles(self, key: _StyleKey) -> Style:
+        style = Style()
+        for predicate, rule_style in self._rules:
+            if predicate(key):
+                style += rule_style
+        return style
@@ -1,18 +1,119 @@
+import asyncio
 import logging
 import re
 import shlex
 import subprocess
+from datetime import datetime
+from typing import AsyncGenerator, Iterable
 
 from task_tui.config import Config
 from task_tui.data_models import ContextInfo, Task
+from task_tui.data_sources import TaskDataSource
+from task_tui.decoders import TaskDecoder, get_decoder
+from task_tui.utils import format_task_datetime
 
 log = logging.getLogger(__name__)
 
+# maximum length of a single exported task (one line of `task export`), tasks with many annotations can get long
+STREAM_LINE_LIMIT = 16 * 1024 * 1024
+
+
+class BaseTaskCli:
+    """Command construction and output parsing shared by the blocking and the asyncio task CLI."""
 
-class TaskCli:
     base_command: str = "task"
 
-    def __init__(self) -> None:
+    def __init__(self, decoder: TaskDecoder | None = None) -> None:
+        # read-only sources that are asked before falling back to `task export`
+        self.data_sources: list[TaskDataSource] = []
+        self.decoder = decoder or get_decoder()
+        # the config of the last `get_config`, report metadata is read from it instead of running `task show` again
+        self.config: Config | None = None
+
+    def _select_data_source(self, report: str | None, read_filter: str, modified_after: datetime | None) -> TaskDataSource | None:
+        for data_source in self.data_sources:
+            if data_source.supports(report, read_filter, modified_after):
+                return data_source
+        return None
+
+    def _parse_context_list(self, context_output: str) -> list[str]:
+        contexts: list[str] = []
+        for raw_line in context_output.splitlines():
+            line = raw_line.strip()
+            if not line:
+                continue
+            if line not in contexts:
+                contexts.append(line)
+        return contexts
+
+    def _export_arguments(self, report: str | None, read_filter: str, modified_after: datetime | None = None, json_array: bool = False) -> list[str]:
+        # complete exports are decoded as one JSON array, streamed exports line by line
+        command = [f"rc.json.array={int(json_array)}", "rc.defaultheight=0"]
+        if modified_after is None:
+            if read_filter:
+                command.extend(shlex.split(read_filter))
+        else:
+            # the context filter may contain `or`, so it has to be grouped before another filter term is added
+            if read_filter:
+                command.extend(["(", *shlex.split(read_filter), ")"])
+            command.append(f"modified.after:{format_task_datetime(modified_after)}")
+        command.append("export")
+        if report:
+            command.append(report)
+        return command
+
+    def _parse_export(self, export: str | bytes) -> list[Task]:
+        tasks = self.decoder.decode_array(export)
+        log.debug(f"Got {len(tasks)} tasks from task_cli.")
+        return tasks
+
+    def _parse_export_line(self, line: str | bytes) -> Task | None:
+        if not line.strip():
+            return None
+        return self.decoder.decode_line(line)
+
+    def _bulk_arguments(self, tasks: Iterable[Task], command: str, *arguments: str) -> list[str]:
+        # taskwarrior asks before changing `rc.bulk` or more tasks at once, even with confirmation off, and stdin is not a terminal
+        uuids = [str(task.uuid) for task in tasks]
+        return ["rc.confirmation=off", "rc.bulk=0", "rc.recurrence.confirmation=no", *uuids, command, *arguments]
+
+    def _report_headings(self, config: Config, report: str) -> list[tuple[str, str]]:
+        report_config = config.reports.get(report)
+        if report_config is None or not report_config.columns:
+            raise ValueError(f"Could not extract the columns of report {report}.")
+        return report_config.headings
+
+    def _parse_created_task_id(self, completed_process: subprocess.CompletedProcess) -> int:
+        confirmation = completed_process.stdout.strip()
+        # TASKDATA override: ./test_data/
+        # Created task 4.
+        task_id_pattern = r"Created task (\d+)"
+        match = re.search(task_id_pattern, confirmation)
+        if match is None:
+            log.error("Failed to get task id from new task")
+            raise ValueError("Failed to get task id from new task")
+
+        task_id = int(match.group(1))
+        log.debug("Added new task with id %d", task_id)
+        return task_id
+
+    def edit_task(self, task: Task) -> None:
+        """Open the task in the user's $EDITOR via `task <uuid> edit`.
+
+        Must be called while the TUI is suspended so the editor can take over the terminal.
+        """
+        log.info("Editing task %s", task.id)
+        command = [self.base_command, str(task.uuid), "edit"]
+        log.debug("Running `%s`", " ".join(command))
+        completed_process = subprocess.run(command)
+        if completed_process.returncode != 0:
+            error_msg = f"task edit exited with code {completed_process.returncode}"
+            raise ValueError(error_msg)
+
+
+class TaskCli(BaseTaskCli):
+    def __init__(self, decoder: TaskDecoder | None = None) -> None:
+        super().__init__(decoder)
         try:
             self._run_task("show")
         except FileNotFoundError:
@@ -35,16 +136,6 @@ class TaskCli:
             context_filter = self._get_config_value(f"rc.context.{context_name}")
         return context_filter
 
-    def _parse_context_list(self, context_output: str) -> list[str]:
-        contexts: list[str] = []
-        for raw_line in context_output.splitlines():
-            line = raw_line.strip()
-            if not line:
-                continue
-            if line not in contexts:
-                contexts.append(line)
-        return contexts
-
     def get_context(self) -> ContextInfo | None:
         context_name = self._get_config_value("rc.context")
         if context_name in {"", "none"}:
@@ -80,44 +171,27 @@ class TaskCli:
             self._run_task("context", context_name)
 
     def export_tasks(self, report: str | None = None) -> list[Task]:
-        command = ["rc.json.array=0", "rc.defaultheight=0"]
         context = self.get_context()
-        if context and context.read_filter:
-            command.extend(shlex.split(context.read_filter))
-        command.append("export")
-        if report:
-            command.append(report)
+        read_filter = context.read_filter if context else ""
+        data_source = self._select_data_source(report, read_filter, None)
+        if data_source is not None:
+            try:
+                return data_source.export(report, read_filter, None)
+            except Exception as e:
+                log.warning("Export from %s failed, falling back to `task export`: %s", data_source.name, e)
+        command = self._export_arguments(report, read_filter, json_array=True)
         completed_process = self._run_task(*command)
-        export = completed_process.stdout
-        tasks = [Task.model_validate_json(t) for t in export.strip().split("\n")]
-        log.debug(f"Got {len(tasks)} tasks from task_cli.")
-        return tasks
+        return self._parse_export(completed_process.stdout)
 
     def get_config(self) -> Config:
-        command = ["show"]
+        # without a width long values would be wrapped onto the next lines
+        command = ["show", "rc.defaultwidth=0"]
         config_output: str = self._run_task(*command).stdout.strip()
-        return Config(config_output)
+        self.config = Config(config_output)
+        return self.config
 
     def get_report_columns(self, report: str) -> list[tuple[str, str]]:
-        command = ["show", "rc.defaultwidth=0", f"report.{report}.columns"]
-        column_output: str = self._run_task(*command).stdout.strip()
-        for line in column_output.split("\n"):
-            if line.startswith(f"report.{report}.columns"):
-                columns = line.split(" ")[1].split(",")
-                break
-        else:
-            raise ValueError("Could not extract columns.")
-
-        command = ["show", "rc.defaultwidth=0", f"report.{report}.labels"]
-        label_output: str = self._run_task(*command).stdout.strip()
-        for line in label_output.split("\n"):
-            if line.startswith(f"report.{report}.labels"):
-                labels = line.split(" ")[1].split(",")
-                break
-        else:
-            raise ValueError("Could not extract labels.")
-
-        return [(column, label) for column, label in zip(columns, labels)]
+        return self._report_headings(self.config or self.get_config(), report)
 
     def set_task_done(self, task: Task) -> None:
         log.info("Setting task %s to done", task.id)
@@ -155,18 +229,7 @@ class TaskCli:
             log.error("Failed to create task: %s", completed_process)
             raise ValueError(completed_process.stderr.strip())
 
-        confirmation = completed_process.stdout.strip()
-        # TASKDATA override: ./test_data/
-        # Created task 4.
-        task_id_pattern = r"Created task (\d+)"
-        match = re.search(task_id_pattern, confirmation)
-        if match is None:
-            log.error("Failed to get task id from new task")
-            raise ValueError("Failed to get task id from new task")
-
-        task_id = int(match.group(1))
-        log.debug("Added new task with id %d", task_id)
-        return task_id
+        return self._parse_created_task_id(completed_process)
 
     def log_task(self, description: str) -> None:
         log.info("Logging task with description %s", description)
@@ -183,15 +246,226 @@ class TaskCli:
             log.error("Failed to delete task: %s", completed_process)
             raise ValueError(completed_process.stderr.strip())
 
-    def edit_task(self, task: Task) -> None:
-        """Open the task in the user's $EDITOR via `task <uuid> edit`.
 
-        Must be called while the TUI is suspended so the editor can take over the terminal.
-        """
-        log.info("Editing task %s", task.id)
-        command = [self.base_command, str(task.uuid), "edit"]
+class AsyncTaskCli(BaseTaskCli):
+    """Task CLI that runs `task` through asyncio subprocesses so the event loop is never blocked.
+
+    The API mirrors `TaskCli`, but every method that spawns `task` is a coroutine. Cancelling a coroutine while `task` is
+    still running kills the process, which allows callers to abandon a stale export.
+    """
+
+    async def _run_task(self, *args: str) -> subprocess.CompletedProcess:
+        command = [self.base_command, *args]
         log.debug("Running `%s`", " ".join(command))
-        completed_process = subprocess.run(command)
+        process = await asyncio.create_subprocess_exec(
+            *command,
+            stdin=asyncio.subprocess.DEVNULL,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+        )
+        try:
+            stdout, stderr = await process.communicate()
+        except asyncio.CancelledError:
+            if process.returncode is None:
+                log.debug("Killing cancelled `%s`", " ".join(command))
+                process.kill()
+                await process.wait()
+            raise
+        return subprocess.CompletedProcess(command, process.returncode or 0, stdout.decode(), stderr.decode())
+
+    async def _get_config_value(self, config_key: str) -> str:
+        completed_process = await self._run_task("_get", config_key)
+        return completed_process.stdout.strip()
+
+    async def _get_context_filter(self, context_name: str) -> str:
+        context_filter = await self._get_config_value(f"rc.context.{context_name}.read")
+        if context_filter == "":
+            context_filter = await self._get_config_value(f"rc.context.{context_name}")
+        return context_filter
+
+    async def get_context(self) -> ContextInfo | None:
+        context_name = await self._get_config_value("rc.context")
+        if context_name in {"", "none"}:
+            return None
+        context_filter = await self._get_context_filter(context_name)
+        return ContextInfo(name=context_name, read_filter=context_filter, is_active=True)
+
+    async def list_contexts(self) -> list[ContextInfo]:
+        active_context = await self._get_config_value("rc.context")
+        if active_context == "none":
+            active_context = ""
+        context_output = (await self._run_task("_context")).stdout
+        context_names = [name for name in self._parse_context_list(context_output) if name != "none"]
+        context_filters = await asyncio.gather(*(self._get_context_filter(name) for name in context_names))
+        contexts: list[ContextInfo] = []
+        contexts.append(ContextInfo(name="none", read_filter="", is_active=active_context == ""))
+        for context_name, context_filter in zip(context_names, context_filters):
+            contexts.append(
+                ContextInfo(
+                    name=context_name,
+                    read_filter=context_filter,
+                    is_active=context_name == active_context,
+                )
+            )
+        return contexts
+
+    async def set_context(self, context_name: str | None) -> None:
+        if context_name is None or context_name == "none":
+            await self._run_task("context", "none")
+        else:
+            await self._run_task("context", context_name)
+
+    async def export_tasks(
+        self,
+        report: str | None = None,
+        read_filter: str | None = None,
+        modified_after: datetime | None = None,
+    ) -> list[Task]:
+        """Export the tasks of the report.
+
+        Args:
+            report: Name of the report whose filter is applied.
+            read_filter: Filter of the active context. If it is not given, the active context is looked up first, so
+                callers that already know it can save those `task _get` calls.
+            modified_after: Only export tasks that were modified after this point in time.
+        """
+        if read_filter is None:
+            context = await self.get_context()
+            read_filter = context.read_filter if context else ""
+        data_source = self._select_data_source(report, read_filter, modified_after)
+        if data_source is not None:
+            try:
+                return await asyncio.to_thread(data_source.export, report, read_filter, modified_after)
+            except Exception as e:
+                log.warning("Export from %s failed, falling back to `task export`: %s", data_source.name, e)
+        command = self._export_arguments(report, read_filter, modified_after, json_array=True)
+        completed_process = await self._run_task(*command)
+        return self._parse_export(completed_process.stdout)
+
+    async def stream_tasks(self, report: str | None = None, read_filter: str | None = None) -> AsyncGenerator[Task, None]:
+        """Export the tasks of the report, yielding every task as soon as `task export` has written it.
+
+        The whole export is never held in memory as text. Closing the generator early (e.g. because the refresh it
+        belongs to was cancelled) kills `task`; use `contextlib.aclosing` to close it deterministically.
+        """
+        if read_filter is None:
+            context = await self.get_context()
+            read_filter = context.read_filter if context else ""
+        data_source = self._select_data_source(report, read_filter, None)
+        if data_source is not None:
+            try:
+                tasks = await asyncio.to_thread(data_source.export, report, read_filter, None)
+            except Exception as e:
+                log.warning("Export from %s failed, falling back to `task export`: %s", data_source.name, e)
+            else:
+                for task in tasks:
+                    yield task
+                return
+        command = [self.base_command, *self._export_arguments(report, read_filter)]
+        log.debug("Streaming `%s`", " ".join(command))
+        process = await asyncio.create_subprocess_exec(
+            *command,
+            stdin=asyncio.subprocess.DEVNULL,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL,
+            limit=STREAM_LINE_LIMIT,
+        )
+        assert process.stdout is not None
+        try:
+            async for line in process.stdout:
+                task = self._parse_export_line(line)
+                if task is not None:
+                    yield task
+            await process.wait()
+        finally:
+            if process.returncode is None:
+                log.debug("Killing abandoned `%s`", " ".join(command))
+                process.kill()
+                await process.wait()
+
+    async def get_config(self) -> Config:
+        # without a width long values would be wrapped onto the next lines
+        config_output: str = (await self._run_task("show", "rc.defaultwidth=0")).stdout.strip()
+        self.config = Config(config_output)
+        return self.config
+
+    async def get_report_columns(self, report: str) -> list[tuple[str, str]]:
+        return self._report_headings(self.config or await self.get_config(), report)
+
+    async def set_task_done(self, task: Task) -> None:
+        log.info("Setting task %s to done", task.id)
+        await self._run_task(str(task.uuid), "done")
+
+    async def start_task(self, task: Task) -> None:
+        log.info("Starting task %s", task.id)
+        await self._run_task(str(task.uuid), "start")
+
+    async def stop_task(self, task: Task) -> None:
+        log.info("Stopping task %s", task.id)
+        await self._run_task(str(task.uuid), "stop")
+
+    async def modify_task(self, task: Task, modification: str) -> None:
+        log.info("Modifying task %s", task.id)
+        modification_args = modification.split(" ")
+        completed_process = await self._run_task(str(task.uuid), "modify", *modification_args)
         if completed_process.returncode != 0:
-            error_msg = f"task edit exited with code {completed_process.returncode}"
-            raise ValueError(error_msg)
+            log.error("Failed to modify task: %s", completed_process.stderr)
+            raise ValueError(completed_process.stderr.strip())
+
+    async def annotate_task(self, task: Task, annotation: str) -> None:
+        log.info("Annotating task %s", task.id)
+        completed_process = await self._run_task(str(task.uuid), "annotate", annotation)
+        if completed_process.returncode != 0:
+            log.error("Failed to annotate task %s: %s", task.id, completed_process)
+            raise ValueError(completed_process.stderr.strip())
+
+    async def add_task(self, description: str) -> int:
+        log.info("Adding task with description %s", description)
+        # split so that description isn't passed as one complete string (which would not allow to add prio/proj/etc.)
+        description_arguments: list[str] = description.split(" ")
+        completed_process = await self._run_task("add", *description_arguments)
+        if completed_process.returncode != 0:
+            log.error("Failed to create task: %s", completed_process)
+            raise ValueError(completed_process.stderr.strip())
+
+        return self._parse_created_task_id(completed_process)
+
+    async def log_task(self, description: str) -> None:
+        log.info("Logging task with description %s", description)
+        description_arguments: list[str] = description.split(" ")
+        completed_process = await self._run_task("log", *description_arguments)
+        if completed_process.returncode != 0:
+            log.error("Failed to log task: %s", completed_process)
+            raise ValueError(completed_process.stderr.strip())
+
+    async def delete_task(self, task: Task) -> None:
+        log.info("Deleting task %s", task.id)
+        completed_process = await self._run_task("rc.confirmation=off", "rc.recurrence.confirmation=no", str(task.id), "delete")
+        if completed_process.returncode != 0:
+            log.error("Failed to delete task: %s", completed_process)
+            raise ValueError(completed_process.stderr.strip())
+
+    async def _run_bulk(self, tasks: list[Task], command: str, *arguments: str) -> None:
+        """Run one `task <uuid...> <command>` for all tasks, raising `ValueError` if taskwarrior reports a failure."""
+        if not tasks:
+            return
+        log.info("Running %s on %d tasks", command, len(tasks))
+        completed_process = await self._run_task(*self._bulk_arguments(tasks, command, *arguments))
+        if completed_process.returncode != 0:
+            log.error("Failed to %s tasks: %s", command, completed_process)
+            raise ValueError(completed_process.stderr.strip())
+
+    async def set_tasks_done(self, tasks: list[Task]) -> None:
+        await self._run_bulk(tasks, "done")
+
+    async def start_tasks(self, tasks: list[Task]) -> None:
+        await self._run_bulk(tasks, "start")
+
+    async def stop_tasks(self, tasks: list[Task]) -> None:
+        await self._run_bulk(tasks, "stop")
+
+    async def modify_tasks(self, tasks: list[Task], modification: str) -> None:
+        await self._run_bulk(tasks, "modify", *modification.split(" "))
+
+    async def delete_tasks(self, tasks: list[Task]) -> None:
+        await self._run_bulk(tasks, "delete")
@@ -0,0 +1,178 @@
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable, Iterable, Sequence
+from uuid import UUID
+
+from task_tui.config import Config
+from task_tui.data_models import Status, Task, VirtualTag
+
+# coefficients this close to zero are skipped, like taskwarrior does
+_EPSILON = 0.000001
+_SECONDS_PER_DAY = 86400.0
+# with `urgency.inherit`, a blocking task gets this much more than the most urgent task it blocks, so it sorts above
+_INHERIT_BONUS = 0.01
+_CLOSED = (Status.COMPLETED, Status.DELETED)
+
+Factor = Callable[[Task], float]
+
+
+@dataclass(frozen=True)
+class UrgencyMismatch:
+    """A task whose exported urgency differs from the locally computed one, see `TaskStore.urgency_mismatches`."""
+
+    task: Task
+    exported: float
+    computed: float
+
+
+def _count_factor(count: int) -> float:
+    if count >= 3:
+        return 1.0
+    return (0.0, 0.8, 0.9)[count]
+
+
+class UrgencyModel:
+    """taskwarrior's urgency: the sum of each property's factor (mostly 0 or 1) times its configured coefficient.
+
+    Urgencies are computed column by column, i.e. one pass over the tasks per property, and properties whose
+    coefficient is zero are never looked at. The factors follow taskwarrior's `Task::urgency_c`, including the ramps of
+    the due date (from 14 days before to 7 days after it) and the age (up to `urgency.age.max` days).
+    """
+
+    def __init__(self, config: Config) -> None:
+        self.age_max = config.urgency_age_max
+        self.inherit = config.urgency_inherit
+        self._properties: list[tuple[str, float]] = []
+        # user and UDA coefficients apply to the tasks matching a predicate
+        self._matches: list[tuple[Callable[[Task], bool], float]] = []
+        for name, coefficient in config.urgency_coefficients.items():
+            if abs(coefficient) <= _EPSILON:
+                continue
+            key = name.removeprefix("urgency.").removesuffix(".coefficient")
+            if key.startswith("user.project."):
+                self._matches.append((self._project_predicate(key.removeprefix("user.project.")), coefficient))
+            elif key.startswith("user.tag."):
+                tag = key.removeprefix("user.tag.")
+                self._matches.append((lambda task, tag=tag: tag in task.tags, coefficient))
+            elif key.startswith("user.keyword."):
+                keyword = key.removeprefix("user.keyword.")
+                self._matches.append((lambda task, keyword=keyword: keyword in task.description, coefficient))
+            elif key.startswith("uda."):
+                self._matches.append((self._uda_predicate(key.removeprefix("uda.")), coefficient))
+            elif "." not in key:
+                self._properties.append((key, coefficient))
+
+    @staticmethod
+    def _project_predicate(project: str) -> Callable[[Task], bool]:
+        # like taskwarrior, a coefficient of a project applies to its subprojects as well
+        prefix = project + "."
+        return lambda task: task.project is not None and (task.project == project or task.project.startswith(prefix))
+
+    @staticmethod
+    def _uda_predicate(uda: str) -> Callable[[Task], bool]:
+        # `urgency.uda.<name>.coefficient` applies to tasks with any value, `urgency.uda.<name>.<value>.coefficient` to one value
+        name, _, value = uda.partition(".")
+        if not value:
+            return lambda task: getattr(task, name, None) is not None
+        return lambda task: (attribute := getattr(task, name, None)) is not None and str(attribute) == value
+
+    def _factor(self, name: str, now: datetime) -> Factor | None:
+        timestamp = now.timestamp()
+        factors: dict[str, Factor] = {
+            "project": lambda task: 1.0 if task.project else 0.0,
+            "active": lambda task: 1.0 if task.start is not None else 0.0,
+            "scheduled": lambda task: 1.0 if task.scheduled is not None and task.scheduled.timestamp() < timestamp else 0.0,
+            "waiting": lambda task: 1.0 if self._is_waiting(task, timestamp) else 0.0,
+            "blocked": lambda task: 1.0 if VirtualTag.BLOCKED in task.virtual_tags else 0.0,
+            "blocking": lambda task: 1.0 if VirtualTag.BLOCKING in task.virtual_tags else 0.0,
+            "annotations": lambda task: _count_factor(len(task.annotations or ())),
+            "tags": lambda task: _count_factor(len(task.tags)),
+            "due": lambda task: 0.0 if task.due is None else self._due_factor(task.due, timestamp),
+            "age": lambda task: self._age_factor(task.entry, timestamp),
+        }
+        return factors.get(name)
+
+    @staticmethod
+    def _is_waiting(task: Task, timestamp: float) -> bool:
+        if task.status == Status.WAITING:
+            return True
+        return task.wait is not None and task.status not in _CLOSED and task.wait.timestamp() > timestamp
+
+    @staticmethod
+    def _due_factor(due: datetime, timestamp: float) -> float:
+        days_overdue = (timestamp - due.timestamp()) / _SECONDS_PER_DAY
+        if days_overdue >= 7.0:
+            return 1.0
+        if days_overdue >= -14.0:
+            # 21 days are mapped to 0.2 - 1.0
+            return (days_overdue + 14.0) * 0.8 / 21.0 + 0.2
+        return 0.2
+
+    def _age_factor(self, entry: datetime, timestamp: float) -> float:
+        # taskwarrior counts whole days
+        age = int((timestamp - entry.timestamp()) / _SECONDS_PER_DAY)
+        if self.age_max == 0 or age > self.age_max:
+            return 1.0
+        return age / self.age_max
+
+    def base_urgencies(self, tasks: Sequence[Task], now: datetime) -> list[float]:
+        """Return the urgency of each task, leaving out `urgency.inherit`."""
+        urgencies = [0.0] * len(tasks)
+        for name, coefficient in self._properties:
+            factor = self._factor(name, now)
+            if factor is None:
+                continue
+            for index, value in enumerate(map(factor, tasks)):
+                if value:
+                    urgencies[index] += value * coefficient
+        for predicate, coefficient in self._matches:
+            for index, matches in enumerate(map(predicate, tasks)):
+                if matches:
+                    urgencies[index] += coefficient
+        return urgencies
+
+    def compute(self, tasks: Sequence[Task], now: datetime, blocked_tasks: Callable[[Task], Iterable[Task]] | None = None) -> list[float]:
+        """Return the urgency of each task.
+
+        With `urgency.inherit`, a blocking task is more urgent than every task it (transitively) blocks; `blocked_tasks`
+        returns the open tasks directly depending on a task, which don't have to be part of `tasks`.
+        """
+        urgencies = self.base_urgencies(tasks, now)
+        if not self.inherit or blocked_tasks is None:
+            return urgencies
+        base = {task.uuid: urgency for task, urgency in zip(tasks, urgencies)}
+        inherited: dict[UUID, float] = {}
+        for task in tasks:
+            self._inherit(task, now, blocked_tasks, base, inherited)
+        return [inherited[task.uuid] for task in tasks]
+
+    def _inherit(
+        self,
+        root: Task,
+        now: datetime,
+        blocked_tasks: Callable[[Task], Iterable[Task]],
+        base: dict[UUID, float],
+        inherited: dict[UUID, float],
+    ) -> None:
+        """Compute the inherited urgency of the task and the tasks it blocks, depth first with an explicit stack."""
+        stack: list[tuple[Task, bool]] = [(root, False)]
+        on_path: set[UUID] = set()
+        while stack:
+            task, expanded = stack.pop()
+            if task.uuid in inherited:
+                continue
+            blocked = list(blocked_tasks(task)) if VirtualTag.BLOCKING in task.virtual_tags else []
+            if not expanded:
+                on_path.add(task.uuid)
+                stack.append((task, True))
+                # a dependency cycle is cut where it closes, the task's base urgency is used there
+                stack.extend((blocked_task, False) for blocked_task in blocked if blocked_task.uuid not in on_path)
+                continue
+            on_path.discard(task.uuid)
+            if task.uuid not in base:
+                base[task.uuid] = self.base_urgencies([task], now)[0]
+            urgency = base[task.uuid]
+            if blocked:
+                urgency = max(urgency, *(inherited.get(blocked_task.uuid, base.get(blocked_task.uuid, 0.0)) for blocked_task in blocked))
+                urgency += _INHERIT_BONUS
+            inherited[task.uuid] = urgency
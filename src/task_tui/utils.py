@@ -1,30 +1,24 @@
+import gc
 import logging
+import math
+from bisect import bisect_right
+from contextlib import contextmanager
 from datetime import UTC, date, datetime
+from typing import AsyncIterable, AsyncIterator, Generator, TypeVar
 
 from rich.style import Style
 
 from task_tui.config import Config
-from task_tui.data_models import Task, VirtualTag
+from task_tui.data_models import Task
 
 log = logging.getLogger(__name__)
 
+T = TypeVar("T")
 
-def get_style_for_task(task: Task, config: Config) -> Style:
-    precedence_style_map: dict[str, Style] = {}
-
-    for tag in VirtualTag:
-        if tag in task.virtual_tags and tag.value in config.color:
-            precedence_style_map[tag.value] = config.color[tag.value]
-    # TODO handle uda. project. and tag. color configurations
-
-    ret = Style()
-    style_order = [s.strip(".") for s in config.color_precedence.split(",")[::-1]]
-    for style_name in style_order:
-        if style_name in precedence_style_map:
-            ret += precedence_style_map[style_name]
 
-    log.debug("Final style for task %s: %s", task.id, ret)
-    return ret
+def get_style_for_task(task: Task, config: Config) -> Style:
+    """Return the style of a task's row from the color rules of the config, see `ColorRules`."""
+    return config.color_rules.style_for(task)
 
 
 def get_current_datetime() -> datetime:
@@ -35,6 +29,16 @@ def get_current_date() -> date:
     return date.today()
 
 
+def format_task_datetime(value: datetime) -> str:
+    """Format a datetime the way taskwarrior writes dates in its exports (`YYYYMMDDTHHMMSSZ`).
+
+    Naive datetimes are assumed to be in UTC.
+    """
+    if value.tzinfo is not None:
+        value = value.astimezone(UTC)
+    return value.strftime("%Y%m%dT%H%M%SZ")
+
+
 def format_vague_duration(seconds: float) -> str:
     sign = "-" if seconds < 0 else ""
     seconds = abs(seconds)
@@ -60,6 +64,42 @@ def format_vague_duration(seconds: float) -> str:
     return f"{sign}{value}" if value else value
 
 
+# The units used by `format_vague_duration`: their upper bounds and, by unit, the lower bound, step and offset in seconds.
+# Within a unit the text only changes where the duration crosses `offset + k * step`, years are rounded instead of
+# truncated.
+_VAGUE_UNIT_UPPER_BOUNDS = [1.0, 60.0, 3600.0, 86400.0, 86400.0 * 14, 86400.0 * 90, 86400.0 * 365]
+_VAGUE_UNITS = [
+    (0.0, 1.0, 0.0),
+    (1.0, 1.0, 0.0),
+    (60.0, 60.0, 0.0),
+    (3600.0, 3600.0, 0.0),
+    (86400.0, 86400.0, 0.0),
+    (86400.0 * 14, 86400.0 * 7, 0.0),
+    (86400.0 * 90, 86400.0 * 30, 0.0),
+    (86400.0 * 365, 86400.0 * 36.5, 86400.0 * 18.25),
+]
+# a countdown only changes its text once it dropped below the boundary, not when it reaches it
+_BOUNDARY_MARGIN = 0.001
+
+
+def vague_duration_changes_in(seconds: float) -> float:
+    """Return after how many seconds `format_vague_duration` shows a different text for a relative date.
+
+    `seconds` is the duration passed to `format_vague_duration`, i.e. the target minus the current time, which decreases
+    as time passes.
+    """
+    magnitude = abs(seconds)
+    unit = bisect_right(_VAGUE_UNIT_UPPER_BOUNDS, magnitude)
+    lower, step, offset = _VAGUE_UNITS[unit]
+    if seconds > 0:
+        if magnitude < 1:
+            # an empty text until the target is a second in the past
+            return magnitude + 1
+        return magnitude - max(lower, offset + (magnitude - offset) // step * step) + _BOUNDARY_MARGIN
+    upper = _VAGUE_UNIT_UPPER_BOUNDS[unit] if unit < len(_VAGUE_UNIT_UPPER_BOUNDS) else math.inf
+    return min(upper, offset + ((magnitude - offset) // step + 1) * step) - magnitude
+
+
 def format_vague_datetime(target: datetime | None, reference: datetime | None = None) -> str:
     if target is None:
         return ""
@@ -67,3 +107,32 @@ def format_vague_datetime(target: datetime | None, reference: datetime | None =
     ref = reference or get_current_datetime()
     delta_seconds = (target - ref).total_seconds()
     return format_vague_duration(delta_seconds)
+
+
+async def batched_async(iterable: AsyncIterable[T], size: int) -> AsyncIterator[list[T]]:
+    """Group the items of an async iterable into lists of at most `size` items."""
+    batch: list[T] = []
+    async for item in iterable:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+@contextmanager
+def gc_paused() -> Generator[None, None, None]:
+    """Pause the cyclic garbage collector while a block allocates many objects that all stay alive.
+
+    Decoding an export creates several objects per task, and every generation 0 collection triggered in between
+    traverses the tasks decoded so far, which makes large exports several times slower. Reference counting keeps
+    working, and the collector is resumed (if it was enabled) when the block exits.
+    """
+    was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if was_enabled:
+            gc.enable()
@@ -1,24 +1,33 @@
 import logging
 from collections import defaultdict
 from dataclasses import dataclass
-from typing import Iterable
+from itertools import filterfalse, zip_longest
+from typing import Iterable, Iterator, Mapping, Protocol, Self, Sequence
 
+from rich.cells import cell_len
 from rich.style import Style
 from rich.text import Text
+from textual._two_way_dict import TwoWayDict
 from textual.app import ComposeResult
 from textual.binding import Binding
+from textual.cache import LRUCache
 from textual.containers import Grid
 from textual.coordinate import Coordinate
 from textual.events import Key
+from textual.geometry import Region, Spacing
 from textual.message import Message
 from textual.screen import ModalScreen
+from textual.strip import Strip
 from textual.widgets import Button, DataTable, Footer, Input, Label
-from textual.widgets.data_table import CursorType, RowKey
+from textual.widgets.data_table import CellDoesNotExist, ColumnKey, CursorType, Row, RowKey
 
 from task_tui.data_models import ContextInfo, Status, Task
 
 log = logging.getLogger(__name__)
 
+# added to the style of the rows matching the incremental search
+SEARCH_MATCH_STYLE = Style(reverse=True)
+
 
 class MouseOnlyButton(Button):
     # Prevent keyboard focus and key activation; still clickable with mouse
@@ -56,7 +65,7 @@ class ConfirmDialog(ModalScreen):
 
     def action_cancel(self) -> None:
         log.debug('Cancelled prompt "%s"', self.prompt)
-        self.app.pop_screen()
+        self.dismiss(False)
 
 
 class BubblingEnterInput(Input):
@@ -90,7 +99,63 @@ class TextInput(ModalScreen):
         self.dismiss(input_text)
 
     def action_cancel(self) -> None:
-        self.app.pop_screen()
+        self.dismiss(None)
+
+
+class SearchBar(Input):
+    """Input of the incremental search, shown below the task report while a search is entered."""
+
+    BINDINGS = [
+        Binding("escape", "cancel", "Cancel search"),
+    ]
+
+    class Cancelled(Message):
+        pass
+
+    def action_cancel(self) -> None:
+        self.post_message(self.Cancelled())
+
+
+class RowSource(Protocol):
+    """The rows of a virtual `TaskReport`, which are read by index when they are shown instead of being added to the table.
+
+    The rows must not change until the source is shown again, except for changes announced with `TaskReport.update_cell`.
+    """
+
+    def __len__(self) -> int: ...
+
+    def key_at(self, index: int) -> str: ...
+
+    def index_of(self, key: str) -> int | None: ...
+
+    def row_at(self, index: int) -> tuple[Sequence[object], Style]:
+        """Return the cells and the style of the row at `index`."""
+        ...
+
+    def column(self, index: int) -> Sequence[object]:
+        """Return all cells of the column at `index`, in the order of the rows."""
+        ...
+
+
+def _content_width(cells: Sequence[object]) -> int:
+    """Return the width of the widest cell as `DataTable` formats it, without rendering the cells.
+
+    Markup isn't parsed, so a string with markup is measured a bit wider than it is shown.
+    """
+    strings = [cell for cell in cells if isinstance(cell, str)]
+    # the cells of a column are measured as a whole, wide characters are rare and only looked for in non-ASCII strings
+    width = max(map(len, filter(str.isascii, strings)), default=0)
+    width = max(width, max(map(cell_len, filterfalse(str.isascii, strings)), default=0))
+    if len(strings) + cells.count(None) == len(cells):
+        return width
+    numbers = [cell for cell in cells if isinstance(cell, (int, float))]
+    # formatting every number is slow, and none is wider than the lowest or the highest one
+    for number in (min(numbers), max(numbers)) if numbers else ():
+        width = max(width, len(f"{number:.2f}" if isinstance(number, float) else str(number)))
+    for cell in cells:
+        if cell is not None and not isinstance(cell, (str, int, float)):
+            width = max(width, cell.cell_len if isinstance(cell, Text) else cell_len(str(cell)))
+    return width
 
 
 class RowMarkerTable(DataTable):
@@ -118,10 +183,19 @@ class RowMarkerTable(DataTable):
         row_index = self._row_locations.get(row_key)
         return row_index
 
+    def row_marker_symbol(self, row_key: RowKey, is_cursor: bool) -> str:
+        """Return the label of a row, subclasses can mark rows that don't have the cursor."""
+        return "▶" if is_cursor else ""
+
+    def remove_row(self, row_key: RowKey | str) -> None:
+        if row_key == self._marker_row_key:
+            self._marker_row_key = None
+        super().remove_row(row_key)
+
     def clear_selection_marker(self) -> None:
         if self._marker_row_key is None:
             return
-        row_index = self._set_row_marker(self._marker_row_key, "")
+        row_index = self._set_row_marker(self._marker_row_key, self.row_marker_symbol(self._marker_row_key, False))
         self._marker_row_key = None
         if row_index is not None and self.is_valid_row_index(row_index):
             self._update_count += 1
@@ -130,7 +204,7 @@ class RowMarkerTable(DataTable):
     def _apply_marker_update(self, target_row_index: int | None) -> None:
         rows_to_refresh: list[int] = []
         if self._marker_row_key is not None:
-            previous_index = self._set_row_marker(self._marker_row_key, "")
+            previous_index = self._set_row_marker(self._marker_row_key, self.row_marker_symbol(self._marker_row_key, False))
             self._marker_row_key = None
             if previous_index is not None and self.is_valid_row_index(previous_index):
                 rows_to_refresh.append(previous_index)
@@ -138,7 +212,7 @@ class RowMarkerTable(DataTable):
         if target_row_index is not None and target_row_index >= 0 and target_row_index < self.row_count:
             row_key = self._row_locations.get_key(target_row_index)
             if row_key is not None:
-                current_index = self._set_row_marker(row_key, "▶")
+                current_index = self._set_row_marker(row_key, self.row_marker_symbol(row_key, True))
                 self._marker_row_key = row_key
                 if current_index is not None and self.is_valid_row_index(current_index):
                     rows_to_refresh.append(current_index)
@@ -185,12 +259,32 @@ class TaskReport(RowMarkerTable):
         Binding("s", "toggle_start_stop", "Start/stop"),
         Binding("l", "log_task", "Log task"),
         Binding("e", "edit_task", "Edit task"),
+        Binding("f", "filter_tasks", "Filter"),
+        Binding("slash", "search_tasks", "Search"),
+        Binding("n", "next_match", "Next match", show=False),
+        Binding("N", "previous_match", "Previous match", show=False),
+        Binding("space", "toggle_selection", "Select"),
+        Binding("u", "clear_selection", "Clear selection"),
     ]
+    # rows of a `RowSource` kept formatted and styled, the others are read from the source again when they are shown
+    ROW_CACHE_SIZE = 1024
+    # rows above and below the visible ones that are read ahead, so that scrolling a few rows finds them ready
+    OVERSCAN = 50
+    # `update_rows` clears the table and adds every row instead of removing more rows than this one by one
+    REBUILD_REMOVALS = 100
 
     def __init__(self) -> None:
         super().__init__()
-        self._row_style_overrides: dict[int, Style] = {}
+        # keyed by row instead of row index, so that removing a row doesn't shift the styles of the rows below it
+        self._row_style_overrides: dict[RowKey, Style] = {}
         self.zebra_stripes = True
+        # keys (task UUIDs) of the rows selected for a bulk action, kept across refreshes as long as the row exists
+        self.selected_row_keys: set[str] = set()
+        # keys (task UUIDs) of the rows matching the incremental search, highlighted until the search is cancelled
+        self.search_matches: set[str] = set()
+        # the source of the rows while they are read on demand instead of being added to the table, see `show_row_source`
+        self.row_source: RowSource | None = None
+        self._source_rows: LRUCache[int, tuple[Sequence[object], Style]] = LRUCache(self.ROW_CACHE_SIZE)
 
     def on_mount(self) -> None:
         log.debug("TaskReport mounted")
@@ -225,17 +319,368 @@ class TaskReport(RowMarkerTable):
     def action_edit_task(self) -> None:
         self.app.action_edit_task()
 
-    def set_row_style(self, index: int, style: Style) -> None:
-        self._row_style_overrides[index] = style
-        self.refresh_row(index)
+    def action_filter_tasks(self) -> None:
+        self.app.action_filter_tasks()
+
+    def action_search_tasks(self) -> None:
+        self.app.action_search_tasks()
+
+    def action_next_match(self) -> None:
+        self.move_to_search_match(self.cursor_row + 1, 1)
+
+    def action_previous_match(self) -> None:
+        self.move_to_search_match(self.cursor_row - 1, -1)
+
+    def row_marker_symbol(self, row_key: RowKey, is_cursor: bool) -> str:
+        if is_cursor:
+            return "▶"
+        return "●" if row_key.value in self.selected_row_keys else ""
+
+    def action_toggle_selection(self) -> None:
+        if self.row_count == 0:
+            return
+        row_key = self._row_locations.get_key(self.cursor_row)
+        if row_key is None or row_key.value is None:
+            return
+        self.selected_row_keys ^= {row_key.value}
+        # the cursor marker hides the selection marker, move on so that it is visible
+        if self.cursor_row < self.row_count - 1:
+            self.action_cursor_down()
+
+    def action_clear_selection(self) -> None:
+        self.selected_row_keys.clear()
+        # the labels of a source's rows are made when they are shown
+        if self.row_source is None:
+            for row_key in self.rows:
+                self._set_row_marker(row_key, self.row_marker_symbol(row_key, row_key == self._marker_row_key))
+        self._update_count += 1
+        self.refresh()
+
+    def retain_selection(self) -> None:
+        """Drop selected keys whose rows are gone, e.g. because the tasks left the report."""
+        if self.row_source is not None:
+            self.selected_row_keys = {key for key in self.selected_row_keys if self.row_source.index_of(key) is not None}
+            return
+        self.selected_row_keys.intersection_update(row_key.value for row_key in self.rows)
+
+    def update_rows(self, rows: Sequence[tuple[str | None, Sequence[object], Style]]) -> list[RowKey]:
+        """Show the given rows (key, cells and style) in the given order, changing only what differs from the table.
+
+        Rows are matched by key: rows whose key is gone are removed, new keys are added, and the cells and styles of the
+        remaining rows are only updated where they changed. Unlike rebuilding the table, this keeps the cursor on its row
+        and the scroll position. A row without key is always added, it gets a generated key. Returns the row keys.
+        A table showing a `RowSource` goes back to rows of its own.
+        """
+        cursor_key = self._cursor_row_key()
+        self._drop_row_source()
+        # looked up by the key's value, hashing a `RowKey` is much slower than hashing a string
+        existing = {row_key.value: row_key for row_key in self.rows}
+        keep = {key for key, _, _ in rows}
+        removed = [row_key for key, row_key in existing.items() if key not in keep]
+        with self.app.batch_update():
+            if len(removed) > self.REBUILD_REMOVALS:
+                # every removal renumbers the rows below it, so clearing and adding all rows is cheaper
+                self.clear()
+                self.clear_row_styles()
+                existing = {}
+            else:
+                for row_key in removed:
+                    self.remove_row(row_key)
+            row_keys: list[RowKey] = []
+            restyled = False
+            for key, cells, style in rows:
+                row_key = existing.get(key) if key is not None else None
+                if row_key is None:
+                    row_key = self.add_row(*cells, key=key, label=Text(self.row_marker_symbol(RowKey(key), False) or " "))
+                else:
+                    previous_cells = self.get_row(row_key)
+                    # the cells are returned in column order, so an unchanged row is a single comparison
+                    if previous_cells != list(cells):
+                        for column, previous, cell in zip(self.ordered_columns, previous_cells, cells):
+                            if previous != cell:
+                                self.update_cell(row_key, column.key, cell, update_width=True)
+                if self._row_style_overrides.get(row_key) != style:
+                    self._row_style_overrides[row_key] = style
+                    restyled = True
+                row_keys.append(row_key)
+            # new rows are added at the bottom, and the kept ones may have to move
+            if any(self.get_row_index(row_key) != index for index, row_key in enumerate(row_keys)):
+                self.set_row_order(row_keys)
+            elif restyled:
+                self._update_count += 1
+                self.refresh()
+            if cursor_key is not None and cursor_key in self.rows:
+                self.move_cursor(row=self.get_row_index(cursor_key), scroll=False)
+            self.sync_cursor_marker()
+        return row_keys
+
+    def set_row_order(self, row_keys: Iterable[RowKey]) -> None:
+        """Move the rows into the given order without rebuilding them, the way `DataTable.sort` does."""
+        self._row_locations = TwoWayDict({row_key: index for index, row_key in enumerate(row_keys)})
+        self._update_count += 1
+        self.refresh()
+
+    def show_row_source(self, source: RowSource) -> None:
+        """Show the rows of `source` instead of the table's own, reading each row only when it is shown.
+
+        Apart from measuring the columns this takes the same time for any number of rows, nothing is added to the table.
+        The rows read are kept in a bounded cache, which is dropped when a source is shown again, e.g. after its rows
+        changed. Like with `update_rows`, the cursor stays on its row and the table keeps its scroll position.
+        """
+        cursor_key = self._cursor_row_key()
+        was_empty = self.row_count == 0
+        self.row_source = source
+        # read-only stand-ins for the containers of the table's own rows, which `DataTable` reads them from
+        self.rows = _SourceRows(self)  # ty: ignore[invalid-assignment]
+        self._data = _SourceCells(self)  # ty: ignore[invalid-assignment]
+        self._row_locations = _SourceRowLocations(source)  # ty: ignore[invalid-assignment]
+        self._source_rows.clear()
+        self._row_style_overrides.clear()
+        self._new_rows.clear()
+        self._updated_cells.clear()
+        # the labels are made when the rows are shown, and are only markers
+        self._labelled_row_exists = True
+        self._label_column.content_width = 1
+        for index, column in enumerate(self.ordered_columns):
+            column.content_width = max(column.label.cell_len, _content_width(source.column(index)))
+        self._require_update_dimensions = True
+        self._update_count += 1
+        self.cursor_coordinate = self.cursor_coordinate
+        if was_empty and self.row_count and self.columns and self.show_cursor:
+            self._highlight_cursor()
+        self.check_idle()
+        self.refresh()
+        cursor_index = None if cursor_key is None else self._row_locations.get(cursor_key)
+        if cursor_index is not None and cursor_index != self.cursor_row:
+            self.move_cursor(row=cursor_index, scroll=False)
+        self.sync_cursor_marker()
+
+    def _cursor_row_key(self) -> RowKey | None:
+        if self.row_source is not None:
+            # the rows of the source may have changed already, the marker is still on the row that had the cursor
+            return self._marker_row_key
+        return None if self.row_count == 0 else self._row_locations.get_key(self.cursor_row)
+
+    def _drop_row_source(self) -> None:
+        """Go back to the table's own rows, which are empty."""
+        if self.row_source is None:
+            return
+        self.row_source = None
+        self.rows = {}
+        self._data = {}
+        self._row_locations = TwoWayDict({})
+        self._source_rows.clear()
+        self._row_style_overrides.clear()
+        self._marker_row_key = None
+        self._update_count += 1
+
+    def _source_row(self, row_index: int) -> tuple[Sequence[object], Style]:
+        assert self.row_source is not None
+        row = self._source_rows.get(row_index)
+        if row is None:
+            row = self.row_source.row_at(row_index)
+            self._source_rows.set(row_index, row)
+        return row
+
+    def update_cell(self, row_key: RowKey | str, column_key: ColumnKey | str, value: object, *, update_width: bool = False) -> None:
+        if self.row_source is None:
+            super().update_cell(row_key, column_key, value, update_width=update_width)
+            return
+        # the source has the new value already, the row only has to be read again
+        row_index = self._row_locations.get(RowKey(row_key) if isinstance(row_key, str) else row_key)
+        column = self.columns.get(ColumnKey(column_key) if isinstance(column_key, str) else column_key)
+        if row_index is None or column is None:
+            raise CellDoesNotExist(f"No cell exists for row_key={row_key!r}, column_key={column_key!r}.")
+        self._source_rows.discard(row_index)
+        if update_width and _content_width([value]) > column.content_width:
+            column.content_width = _content_width([value])
+            self._require_update_dimensions = True
+            self.check_idle()
+        self._update_count += 1
+        self.refresh_row(row_index)
+
+    def clear(self, columns: bool = False) -> Self:
+        self._drop_row_source()
+        return super().clear(columns)
+
+    def render_lines(self, crop: Region) -> list[Strip]:
+        if self.row_source is not None:
+            # the visible rows are read while rendering them, the ones around them are read ahead
+            first_row = int(self.scroll_y)
+            for row_index in range(max(first_row - self.OVERSCAN, 0), min(first_row + self.size.height + self.OVERSCAN, self.row_count)):
+                self._source_row(row_index)
+        return super().render_lines(crop)
+
+    # Every row of the report is one line high, so the position of a row follows from its index. `DataTable` adds up the
+    # heights of the rows above it instead, after every change (even moving the cursor), which is slow for long reports.
+
+    @property
+    def _total_row_height(self) -> int:
+        return self.row_count
+
+    def _get_offsets(self, y: int) -> tuple[RowKey, int]:
+        if self.show_header:
+            if y < self.header_height:
+                return self._header_row_key, y
+            y -= self.header_height
+        row_key = self._row_locations.get_key(y) if y >= 0 else None
+        if row_key is None:
+            raise LookupError(f"Y coord {y!r} is greater than total height")
+        return row_key, 0
+
+    def _get_row_region(self, row_index: int) -> Region:
+        if not self.is_valid_row_index(row_index):
+            return Region(0, 0, 0, 0)
+        row_width = sum(column.get_render_width(self) for column in self.columns.values()) + self._row_label_column_width
+        y = row_index + (self.header_height if self.show_header else 0)
+        return Region(0, y, max(self.size.width, row_width), 1)
+
+    def _get_cell_region(self, coordinate: Coordinate) -> Region:
+        if not self.is_valid_coordinate(coordinate):
+            return Region(0, 0, 0, 0)
+        row_index, column_index = coordinate
+        x = sum(column.get_render_width(self) for column in self.ordered_columns[:column_index]) + self._row_label_column_width
+        width = self.ordered_columns[column_index].get_render_width(self)
+        y = row_index + (self.header_height if self.show_header else 0)
+        return Region(x, y, width, 1)
+
+    def _get_fixed_offset(self) -> Spacing:
+        top = (self.header_height if self.show_header else 0) + min(self.fixed_rows, self.row_count)
+        left = sum(column.get_render_width(self) for column in self.ordered_columns[: self.fixed_columns]) + self._row_label_column_width
+        return Spacing(top, 0, 0, left)
+
+    def action_page_down(self) -> None:
+        if not (self.show_cursor and self.cursor_type in ("cell", "row")):
+            super().action_page_down()
+            return
+        self._set_hover_cursor(False)
+        height = self.scrollable_content_region.height - (self.header_height if self.show_header else 0)
+        self.scroll_relative(y=height, animate=False, force=True)
+        self.move_cursor(row=min(self.cursor_row + height, self.row_count - 1), scroll=False)
+
+    def action_page_up(self) -> None:
+        if not (self.show_cursor and self.cursor_type in ("cell", "row")):
+            super().action_page_up()
+            return
+        self._set_hover_cursor(False)
+        height = self.scrollable_content_region.height - (self.header_height if self.show_header else 0)
+        self.scroll_relative(y=-height, animate=False)
+        self.move_cursor(row=max(self.cursor_row - height, 0), scroll=False)
+
+    def set_search_matches(self, row_keys: set[str]) -> None:
+        self.search_matches = row_keys
+        self._update_count += 1
+        self.refresh()
+
+    def move_to_search_match(self, start_row: int, step: int) -> bool:
+        """Move the cursor to the first matching row from `start_row` on, downwards (step 1) or upwards (step -1).
+
+        Like a search in vim or less, the search wraps around at the end of the table. Returns whether a match was found.
+        """
+        if not self.search_matches or self.row_count == 0:
+            return False
+        for offset in range(self.row_count):
+            row_index = (start_row + offset * step) % self.row_count
+            row_key = self._row_locations.get_key(row_index)
+            if row_key is not None and row_key.value in self.search_matches:
+                self.move_cursor(row=row_index, scroll=True)
+                return True
+        return False
+
+    def set_row_style(self, row_key: RowKey, style: Style) -> None:
+        self._row_style_overrides[row_key] = style
+        self._update_count += 1
+        self.refresh_row(self.get_row_index(row_key))
 
     def clear_row_styles(self) -> None:
         self._row_style_overrides.clear()
 
+    def remove_row(self, row_key: RowKey | str) -> None:
+        self._row_style_overrides.pop(RowKey(row_key) if isinstance(row_key, str) else row_key, None)
+        self.selected_row_keys.discard(row_key.value if isinstance(row_key, RowKey) else row_key)
+        super().remove_row(row_key)
+
     def _get_row_style(self, row_index: int, base_style: Style) -> Style:
-        if row_index in self._row_style_overrides:
-            return self._row_style_overrides[row_index]
-        return super()._get_row_style(row_index, base_style)
+        row_key = self._row_locations.get_key(row_index)
+        if row_key is not None and row_key in self._row_style_overrides:
+            style = self._row_style_overrides[row_key]
+        elif row_key is not None and self.row_source is not None:
+            _, style = self._source_row(row_index)
+        else:
+            style = super()._get_row_style(row_index, base_style)
+        if row_key is not None and row_key.value in self.search_matches:
+            style += SEARCH_MATCH_STYLE
+        return style
+
+
+class _SourceRowLocations:
+    """Stands in for the `TwoWayDict` of row keys and indexes of a table showing a `RowSource`."""
+
+    def __init__(self, source: RowSource) -> None:
+        self._source = source
+
+    def get(self, row_key: RowKey | str) -> int | None:
+        key = row_key.value if isinstance(row_key, RowKey) else row_key
+        return None if key is None else self._source.index_of(key)
+
+    def get_key(self, row_index: int) -> RowKey | None:
+        if 0 <= row_index < len(self._source):
+            return RowKey(self._source.key_at(row_index))
+        return None
+
+    def __contains__(self, row_key: object) -> bool:
+        return isinstance(row_key, (RowKey, str)) and self.get(row_key) is not None
+
+    def __len__(self) -> int:
+        return len(self._source)
+
+    def __iter__(self) -> Iterator[RowKey]:
+        return (RowKey(self._source.key_at(row_index)) for row_index in range(len(self._source)))
+
+
+class _SourceRows(Mapping[RowKey, Row]):
+    """Stands in for the rows of a table showing a `RowSource`, made when they are looked up."""
+
+    def __init__(self, table: TaskReport) -> None:
+        self._table = table
+
+    def __getitem__(self, row_key: RowKey) -> Row:
+        if row_key not in self._table._row_locations:
+            raise KeyError(row_key)
+        label = self._table.row_marker_symbol(row_key, row_key == self._table._marker_row_key)
+        return Row(row_key, 1, Text(label or " "))
+
+    def __contains__(self, row_key: object) -> bool:
+        return isinstance(row_key, RowKey) and row_key in self._table._row_locations
+
+    def __len__(self) -> int:
+        return len(self._table._row_locations)
+
+    def __iter__(self) -> Iterator[RowKey]:
+        return iter(self._table._row_locations)
+
+
+class _SourceCells(Mapping[RowKey, dict[ColumnKey, object]]):
+    """Stands in for the cells of a table showing a `RowSource`, read from the source when they are looked up."""
+
+    def __init__(self, table: TaskReport) -> None:
+        self._table = table
+
+    def __getitem__(self, row_key: RowKey) -> dict[ColumnKey, object]:
+        row_index = self._table._row_locations.get(row_key)
+        if row_index is None:
+            raise KeyError(row_key)
+        cells, _ = self._table._source_row(row_index)
+        return dict(zip_longest((column.key for column in self._table.ordered_columns), cells))
+
+    def __contains__(self, row_key: object) -> bool:
+        return isinstance(row_key, RowKey) and row_key in self._table._row_locations
+
+    def __len__(self) -> int:
+        return len(self._table._row_locations)
+
+    def __iter__(self) -> Iterator[RowKey]:
+        return iter(self._table._row_locations)
 
 
 @dataclass
@@ -252,13 +697,22 @@ class ProjectSummary(DataTable):
         self.cursor_type = "row"
         self.show_row_labels = False
         self.zebra_stripes = True
+        self.reset_aggregates()
 
     def on_mount(self) -> None:
         self.clear(columns=True)
         self.add_columns("Project", "Remaining", "Completed", "Urgency Sum")
 
     def refresh_from_tasks(self, tasks: Iterable[Task]) -> None:
-        aggregates: dict[str, ProjectAggregate] = defaultdict(ProjectAggregate)
+        self.reset_aggregates()
+        self.add_tasks(tasks)
+
+    def reset_aggregates(self) -> None:
+        self._aggregates: dict[str, ProjectAggregate] = defaultdict(ProjectAggregate)
+
+    def add_tasks(self, tasks: Iterable[Task]) -> None:
+        """Add tasks to the aggregates and redraw, which allows feeding the summary batch by batch from a streamed export."""
+        aggregates = self._aggregates
         for task in tasks:
             project_name = task.project or "(none)"
             aggregate = aggregates[project_name]
@@ -0,0 +1,79 @@
+import asyncio
+import types
+from datetime import datetime
+from uuid import UUID
+
+import pytest
+from conftest import AsyncIterWrapper, AsyncWrapper
+
+from task_tui.config import Config
+from task_tui.data_models import Status, Task
+from task_tui.widgets import ConfirmDialog, TaskReport
+
+
+def make_task(task_id: int) -> Task:
+    timestamp = datetime(2024, 1, 1, 12, 0, 0)
+    return Task(
+        id=task_id,
+        description=f"task {task_id}",
+        entry=timestamp.isoformat(),
+        modified=timestamp.isoformat(),
+        status=Status.PENDING,
+        uuid=UUID(int=task_id),
+        urgency=0.0,
+    )
+
+
+def test_selected_tasks_are_done_with_one_call_and_one_refresh(
+    app_module_mock: types.ModuleType, monkeypatch: pytest.MonkeyPatch, as_async: AsyncWrapper, as_async_iter: AsyncIterWrapper
+) -> None:
+    tasks = [make_task(1), make_task(2), make_task(3)]
+    exports: list[str] = []
+    done_calls: list[list[int]] = []
+    prompts: list[str] = []
+
+    def stream_tasks(report: str, read_filter: str | None = None) -> list[Task]:
+        exports.append(report)
+        return tasks
+
+    cli = app_module_mock.task_cli
+    monkeypatch.setattr(cli, "get_config", as_async(lambda: Config("")), raising=False)
+    monkeypatch.setattr(cli, "get_context", as_async(lambda: None), raising=False)
+    monkeypatch.setattr(cli, "stream_tasks", as_async_iter(stream_tasks), raising=False)
+    # the done tasks left the working set, so the incremental sync falls back to a full export
+    monkeypatch.setattr(
+        cli,
+        "export_tasks",
+        as_async(lambda report, read_filter=None, modified_after=None: [t.model_copy(update={"status": Status.COMPLETED}) for t in tasks[::2]]),
+        raising=False,
+    )
+    monkeypatch.setattr(cli, "get_report_columns", as_async(lambda report: [("id", "ID"), ("description", "Description")]), raising=False)
+    monkeypatch.setattr(cli, "set_tasks_done", as_async(lambda tasks: done_calls.append([task.id for task in tasks])), raising=False)
+
+    app = app_module_mock.TaskTuiApp("next")
+
+    async def run_app() -> set[str]:
+        async with app.run_test() as pilot:
+            await pilot.pause()
+            await app.workers.wait_for_complete()
+            table = app.query_one(TaskReport)
+            table.focus()
+            # select the first and the third task, skipping the second one
+            await pilot.press("space", "j", "space")
+            selection = set(table.selected_row_keys)
+            await pilot.press("d")
+            await pilot.pause()
+            assert isinstance(app.screen, ConfirmDialog)
+            prompts.append(app.screen.prompt)
+            await pilot.press("y")
+            await pilot.pause()
+            await app.workers.wait_for_complete()
+            assert not table.selected_row_keys
+            return selection
+
+    selection = asyncio.run(run_app())
+
+    assert selection == {str(UUID(int=1)), str(UUID(int=3))}
+    assert prompts == ["Are you sure you want set 2 tasks to done?"]
+    assert done_calls == [[1, 3]]
+    assert len(exports) == 2
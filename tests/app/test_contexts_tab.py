@@ -5,6 +5,7 @@ from datetime import datetime
 from uuid import UUID
 
 import pytest
+from conftest import AsyncIterWrapper, AsyncWrapper
 from textual.widgets import TabbedContent
 
 import task_tui.task_cli as task_cli_mod
@@ -39,12 +40,12 @@ def make_task(task_id: int) -> Task:
     )
 
 
-def test_contexts_tab_updates_and_selects(monkeypatch: pytest.MonkeyPatch) -> None:
+def test_contexts_tab_updates_and_selects(monkeypatch: pytest.MonkeyPatch, as_async: AsyncWrapper, as_async_iter: AsyncIterWrapper) -> None:
     class DummyTaskCli:
         def __init__(self) -> None:
             pass
 
-    monkeypatch.setattr(task_cli_mod, "TaskCli", DummyTaskCli)
+    monkeypatch.setattr(task_cli_mod, "AsyncTaskCli", DummyTaskCli)
     if "task_tui.app" in sys.modules:
         del sys.modules["task_tui.app"]
     app_module = importlib.import_module("task_tui.app")
@@ -55,16 +56,17 @@ def test_contexts_tab_updates_and_selects(monkeypatch: pytest.MonkeyPatch) -> No
     ]
     set_context_calls: list[str] = []
 
-    monkeypatch.setattr(app_module.task_cli, "get_config", lambda: Config(""), raising=False)
-    monkeypatch.setattr(app_module.task_cli, "export_tasks", lambda report: [make_task(1)], raising=False)
+    monkeypatch.setattr(app_module.task_cli, "get_config", as_async(lambda: Config("")), raising=False)
+    monkeypatch.setattr(app_module.task_cli, "get_context", as_async(lambda: None), raising=False)
+    monkeypatch.setattr(app_module.task_cli, "stream_tasks", as_async_iter(lambda report, read_filter=None: [make_task(1)]), raising=False)
     monkeypatch.setattr(
         app_module.task_cli,
         "get_report_columns",
-        lambda report: [("id", "ID"), ("description", "Description")],
+        as_async(lambda report: [("id", "ID"), ("description", "Description")]),
         raising=False,
     )
-    monkeypatch.setattr(app_module.task_cli, "list_contexts", lambda: contexts, raising=False)
-    monkeypatch.setattr(app_module.task_cli, "set_context", lambda name: set_context_calls.append(name), raising=False)
+    monkeypatch.setattr(app_module.task_cli, "list_contexts", as_async(lambda: contexts), raising=False)
+    monkeypatch.setattr(app_module.task_cli, "set_context", as_async(lambda name: set_context_calls.append(name)), raising=False)
 
     app = app_module.TaskTuiApp("next")
 
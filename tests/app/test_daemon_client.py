@@ -0,0 +1,132 @@
+import asyncio
+import types
+from datetime import datetime
+from pathlib import Path
+from uuid import UUID
+
+import pytest
+from conftest import AsyncIterWrapper, AsyncWrapper
+
+from task_tui.config import Config
+from task_tui.daemon import DaemonReport
+from task_tui.data_models import ContextInfo, Status, Task
+from task_tui.exceptions import DaemonError
+from task_tui.widgets import TaskReport, TextInput
+
+HEADINGS = [("id", "ID"), ("description", "Description")]
+
+
+def make_task(task_id: int, description: str, project: str | None = None) -> Task:
+    timestamp = datetime(2024, 1, 1, 12, 0, 0)
+    return Task(
+        id=task_id,
+        description=description,
+        entry=timestamp,
+        modified=timestamp,
+        status=Status.PENDING,
+        uuid=UUID(int=task_id),
+        urgency=float(task_id),
+        project=project,
+    )
+
+
+@pytest.mark.parametrize("daemon_running", [True, False])
+def test_tasks_are_taken_from_the_daemon_if_it_runs(
+    app_module_mock: types.ModuleType,
+    monkeypatch: pytest.MonkeyPatch,
+    as_async: AsyncWrapper,
+    as_async_iter: AsyncIterWrapper,
+    daemon_running: bool,
+) -> None:
+    fetched_reports: list[str] = []
+
+    async def fetch_report(socket_path: Path, report: str, data_source: str = "task") -> DaemonReport:
+        fetched_reports.append(report)
+        if not daemon_running:
+            raise DaemonError(f"No daemon is listening on {socket_path}")
+        return DaemonReport(Config("report.next.sort urgency-"), None, HEADINGS, [make_task(1, "from the daemon"), make_task(2, "from the daemon")])
+
+    cli = app_module_mock.task_cli
+    monkeypatch.setattr(app_module_mock, "fetch_report", fetch_report)
+    monkeypatch.setattr(cli, "get_config", as_async(lambda: Config("report.next.sort urgency-")), raising=False)
+    monkeypatch.setattr(cli, "get_context", as_async(lambda: None), raising=False)
+    monkeypatch.setattr(cli, "stream_tasks", as_async_iter(lambda report, read_filter=None: [make_task(1, "from task")]), raising=False)
+    monkeypatch.setattr(cli, "get_report_columns", as_async(lambda report: HEADINGS), raising=False)
+    monkeypatch.setattr(cli, "export_tasks", as_async(lambda report, read_filter=None, modified_after=None: []), raising=False)
+
+    app = app_module_mock.TaskTuiApp("next", daemon_socket=Path("task-tui.sock"))
+
+    async def run_app() -> None:
+        async with app.run_test(size=(80, 24)) as pilot:
+            await pilot.pause()
+            await app.workers.wait_for_complete()
+            await pilot.pause()
+            table = app.query_one(TaskReport)
+
+            if daemon_running:
+                assert [table.get_row_at(row) for row in range(table.row_count)] == [[2, "from the daemon"], [1, "from the daemon"]]
+                assert app.daemon_socket is not None
+            else:
+                # the app runs standalone from then on
+                assert [table.get_row_at(row) for row in range(table.row_count)] == [[1, "from task"]]
+                assert app.daemon_socket is None
+
+            app.post_message(app_module_mock.TasksChanged())
+            await pilot.pause(0.2)
+            await app.workers.wait_for_complete()
+            assert len(fetched_reports) == (2 if daemon_running else 1)
+
+    asyncio.run(run_app())
+
+
+def test_the_report_of_the_daemon_is_filtered_in_process(
+    app_module_mock: types.ModuleType, monkeypatch: pytest.MonkeyPatch, as_async: AsyncWrapper, as_async_iter: AsyncIterWrapper
+) -> None:
+    context = ContextInfo(name="work", read_filter="project:Work", is_active=True)
+    tasks = [make_task(1, "report", "Work"), make_task(2, "report", "Home"), make_task(3, "docs", "Work").model_copy(update={"tags": {"docs"}})]
+    fetched_reports: list[str] = []
+
+    async def fetch_report(socket_path: Path, report: str, data_source: str = "task") -> DaemonReport:
+        fetched_reports.append(report)
+        # a new config every time, like the daemon answers
+        return DaemonReport(Config("report.next.sort urgency-\ncontext work"), context, HEADINGS, tasks)
+
+    def stream_tasks(report: str, read_filter: str | None = None) -> list[Task]:
+        raise AssertionError("The tasks are taken from the daemon")
+
+    cli = app_module_mock.task_cli
+    monkeypatch.setattr(app_module_mock, "fetch_report", fetch_report)
+    monkeypatch.setattr(cli, "stream_tasks", as_async_iter(stream_tasks), raising=False)
+
+    app = app_module_mock.TaskTuiApp("next", daemon_socket=Path("task-tui.sock"))
+
+    async def run_app() -> None:
+        async with app.run_test(size=(80, 24)) as pilot:
+            await pilot.pause()
+            await app.workers.wait_for_complete()
+            await pilot.pause()
+            assert [task.id for task in app.tasks] == [3, 1]
+            assert len(app._report_tasks) == 3
+            assert app.sync_state.modified_after() is not None
+            config = app.config
+
+            app.query_one(TaskReport).focus()
+            await pilot.press("f")
+            await pilot.pause()
+            assert isinstance(app.screen, TextInput)
+            await pilot.press(*"+docs", "enter")
+            await pilot.pause()
+            await app.workers.wait_for_complete()
+            # filtered without asking the daemon again
+            assert [task.id for task in app.tasks] == [3]
+            assert len(fetched_reports) == 1
+
+            app.post_message(app_module_mock.TasksChanged())
+            await pilot.pause(0.2)
+            await app.workers.wait_for_complete()
+            assert len(fetched_reports) == 2
+            assert [task.id for task in app.tasks] == [3]
+            # the config didn't change, so it isn't applied again
+            assert app.config is config
+
+    asyncio.run(run_app())
@@ -0,0 +1,117 @@
+import asyncio
+import types
+from datetime import datetime
+from uuid import UUID
+
+import pytest
+from conftest import AsyncIterWrapper, AsyncWrapper
+
+from task_tui.config import Config
+from task_tui.data_models import ContextInfo, Status, Task, VirtualTag
+from task_tui.widgets import ContextSelected, TaskReport, TextInput
+
+
+def make_task(task_id: int, project: str, depends: set[UUID] | None = None) -> Task:
+    timestamp = datetime(2024, 1, 1, 12, 0, 0)
+    return Task(
+        id=task_id,
+        description=f"task {task_id}",
+        entry=timestamp.isoformat(),
+        modified=timestamp.isoformat(),
+        status=Status.PENDING,
+        uuid=UUID(int=task_id),
+        urgency=0.0,
+        project=project,
+        depends=depends or set(),
+    )
+
+
+def test_filters_are_applied_without_export_unless_taskwarrior_is_needed(
+    app_module_mock: types.ModuleType, monkeypatch: pytest.MonkeyPatch, as_async: AsyncWrapper, as_async_iter: AsyncIterWrapper
+) -> None:
+    tasks = [make_task(1, "Work"), make_task(2, "Home"), make_task(3, "Work.Meetings")]
+    exports: list[str | None] = []
+    contexts = {"work": ContextInfo(name="work", read_filter="project:Work"), "docs": ContextInfo(name="docs", read_filter="description.has:docs")}
+    set_context_calls: list[str] = []
+
+    def stream_tasks(report: str, read_filter: str | None = None) -> list[Task]:
+        exports.append(read_filter)
+        return tasks
+
+    cli = app_module_mock.task_cli
+    monkeypatch.setattr(cli, "get_config", as_async(lambda: Config("")), raising=False)
+    monkeypatch.setattr(cli, "get_context", as_async(lambda: contexts[set_context_calls[-1]] if set_context_calls else None), raising=False)
+    monkeypatch.setattr(cli, "stream_tasks", as_async_iter(stream_tasks), raising=False)
+    monkeypatch.setattr(cli, "get_report_columns", as_async(lambda report: [("id", "ID"), ("description", "Description")]), raising=False)
+    monkeypatch.setattr(cli, "set_context", as_async(lambda name: set_context_calls.append(name)), raising=False)
+    monkeypatch.setattr(cli, "list_contexts", as_async(lambda: []), raising=False)
+
+    app = app_module_mock.TaskTuiApp("next")
+
+    async def run_app() -> list[list[int]]:
+        shown: list[list[int]] = []
+        async with app.run_test() as pilot:
+            await pilot.pause()
+            await app.workers.wait_for_complete()
+            app.post_message(ContextSelected(contexts["work"]))
+            await pilot.pause()
+            await app.workers.wait_for_complete()
+            shown.append([task.id for task in app.tasks])
+
+            app.query_one(TaskReport).focus()
+            await pilot.press("f")
+            await pilot.pause()
+            assert isinstance(app.screen, TextInput)
+            await pilot.press(*"project.not:Work.Meetings", "enter")
+            await pilot.pause()
+            await app.workers.wait_for_complete()
+            shown.append([task.id for task in app.tasks])
+
+            app.post_message(ContextSelected(contexts["docs"]))
+            await pilot.pause()
+            await app.workers.wait_for_complete()
+            await pilot.pause()
+            await app.workers.wait_for_complete()
+        return shown
+
+    shown = asyncio.run(run_app())
+
+    assert shown == [[1, 3], [1]]
+    assert set_context_calls == ["work", "docs"]
+    # only the context that taskwarrior has to evaluate is exported again, with the entered filter
+    assert exports == ["", "( description.has:docs ) ( project.not:Work.Meetings )"]
+
+
+def test_tasks_stay_blocked_by_dependencies_that_are_filtered_out(
+    app_module_mock: types.ModuleType, monkeypatch: pytest.MonkeyPatch, as_async: AsyncWrapper, as_async_iter: AsyncIterWrapper
+) -> None:
+    # 1 is shown in the context, the task it depends on is not
+    tasks = [make_task(1, "Work", depends={UUID(int=2)}), make_task(2, "Home")]
+    cli = app_module_mock.task_cli
+    monkeypatch.setattr(cli, "get_config", as_async(lambda: Config("")), raising=False)
+    monkeypatch.setattr(cli, "get_context", as_async(lambda: ContextInfo(name="work", read_filter="project:Work")), raising=False)
+    monkeypatch.setattr(cli, "stream_tasks", as_async_iter(lambda report, read_filter=None: tasks), raising=False)
+    monkeypatch.setattr(cli, "export_tasks", as_async(lambda report, read_filter=None, modified_after=None: []), raising=False)
+    monkeypatch.setattr(cli, "get_report_columns", as_async(lambda report: [("id", "ID"), ("description", "Description")]), raising=False)
+    monkeypatch.setattr(cli, "start_tasks", as_async(lambda tasks: None), raising=False)
+
+    app = app_module_mock.TaskTuiApp("next")
+
+    async def run_app() -> tuple[list[int], Task, Task]:
+        async with app.run_test() as pilot:
+            await pilot.pause()
+            await app.workers.wait_for_complete()
+            shown = [task.id for task in app.tasks]
+            assert VirtualTag.BLOCKED in app.tasks[0].virtual_tags
+            app.query_one(TaskReport).focus()
+            await pilot.press("s")
+            await pilot.pause()
+            await app.workers.wait_for_complete()
+            return shown, app.tasks[0], app._report_tasks._get_task_by_id(2)
+
+    shown, started, blocking = asyncio.run(run_app())
+
+    assert shown == [1]
+    assert started.start is not None
+    assert VirtualTag.BLOCKED in started.virtual_tags
+    assert VirtualTag.BLOCKING in blocking.virtual_tags
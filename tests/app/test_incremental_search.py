@@ -0,0 +1,112 @@
+import asyncio
+import types
+from datetime import datetime
+from uuid import UUID
+
+import pytest
+from conftest import AsyncIterWrapper, AsyncWrapper
+
+from task_tui.config import Config
+from task_tui.data_models import Annotation, Status, Task
+from task_tui.widgets import SearchBar, TaskReport
+
+
+def make_task(task_id: int, description: str, annotations: list[str] | None = None) -> Task:
+    timestamp = datetime(2024, 1, 1, 12, 0, 0)
+    return Task(
+        id=task_id,
+        description=description,
+        entry=timestamp,
+        modified=timestamp,
+        status=Status.PENDING,
+        uuid=UUID(int=task_id),
+        urgency=0.0,
+        annotations=None if annotations is None else [Annotation(description=text) for text in annotations],
+    )
+
+
+TASKS = [
+    make_task(1, "Quarterly report"),
+    make_task(2, "Call the plumber"),
+    make_task(3, "Pay rent", ["report sent"]),
+    make_task(4, "Buy milk"),
+    make_task(5, "Review report draft"),
+]
+
+
+def keys(*task_ids: int) -> set[str]:
+    return {str(UUID(int=task_id)) for task_id in task_ids}
+
+
+def test_search_index_follows_changes_of_the_store(app_module_mock: types.ModuleType) -> None:
+    store = app_module_mock.TaskStore(TASKS, Config(""))
+    assert store.search("report") == keys(1, 3, 5)
+
+    store.update_task(TASKS[1].model_copy(update={"description": "Call the plumber about the report"}))
+    store.remove([UUID(int=1)])
+    store.extend([make_task(6, "Report taxes")])
+    store.merge([make_task(4, "Buy milk for the report party")], [UUID(int=5)], Config(""))
+
+    assert store.search("report") == keys(2, 3, 4, 6)
+
+
+def test_incremental_search_highlights_and_jumps_between_matches(
+    app_module_mock: types.ModuleType, monkeypatch: pytest.MonkeyPatch, as_async: AsyncWrapper, as_async_iter: AsyncIterWrapper
+) -> None:
+    cli = app_module_mock.task_cli
+    monkeypatch.setattr(cli, "get_config", as_async(lambda: Config("")), raising=False)
+    monkeypatch.setattr(cli, "get_context", as_async(lambda: None), raising=False)
+    monkeypatch.setattr(cli, "stream_tasks", as_async_iter(lambda report, read_filter=None: TASKS), raising=False)
+    monkeypatch.setattr(cli, "get_report_columns", as_async(lambda report: [("id", "ID"), ("description", "Description")]), raising=False)
+
+    app = app_module_mock.TaskTuiApp("next")
+
+    async def run_app() -> list[tuple[int, set[str]]]:
+        states: list[tuple[int, set[str]]] = []
+        async with app.run_test() as pilot:
+            await pilot.pause()
+            await app.workers.wait_for_complete()
+            table = app.query_one(TaskReport)
+            search_bar = app.query_one(SearchBar)
+            table.focus()
+            table.move_cursor(row=1)
+            await pilot.press("slash")
+            await pilot.pause()
+            assert search_bar.display and search_bar.has_focus
+
+            # the cursor moves to the first match below the row the search started from, while typing
+            for key in "rep":
+                await pilot.press(key)
+                await pilot.pause()
+                states.append((table.cursor_row, set(table.search_matches)))
+            await pilot.press("enter")
+            await pilot.pause()
+            assert not search_bar.display and table.has_focus
+
+            for key in ["n", "n", "N"]:
+                await pilot.press(key)
+                await pilot.pause()
+                states.append((table.cursor_row, set(table.search_matches)))
+
+            await pilot.press("slash", *"quarter")
+            await pilot.pause()
+            states.append((table.cursor_row, set(table.search_matches)))
+            # cancelling the search clears the matches and moves the cursor back
+            await pilot.press("escape")
+            await pilot.pause()
+            states.append((table.cursor_row, set(table.search_matches)))
+            assert not search_bar.display and table.has_focus
+        return states
+
+    states = asyncio.run(run_app())
+
+    assert states == [
+        (1, keys(1, 2, 3, 5)),
+        (2, keys(1, 3, 5)),
+        (2, keys(1, 3, 5)),
+        (4, keys(1, 3, 5)),
+        (0, keys(1, 3, 5)),
+        (4, keys(1, 3, 5)),
+        (0, keys(1)),
+        (4, set()),
+    ]
@@ -0,0 +1,124 @@
+import asyncio
+import types
+from datetime import datetime
+from uuid import UUID
+
+import pytest
+from conftest import AsyncIterWrapper, AsyncWrapper
+
+from task_tui.config import Config
+from task_tui.data_models import Status, Task, VirtualTag
+
+
+def make_task(
+    task_id: int,
+    *,
+    description: str = "task",
+    status: Status = Status.PENDING,
+    modified: datetime = datetime(2024, 1, 1, 12, 0, 0),
+    depends: set[UUID] | None = None,
+) -> Task:
+    return Task(
+        id=task_id,
+        description=description,
+        entry=datetime(2024, 1, 1, 0, 0, 0).isoformat(),
+        modified=modified.isoformat(),
+        status=status,
+        uuid=UUID(int=task_id),
+        urgency=0.0,
+        depends=depends or set(),
+    )
+
+
+def test_merge_replaces_appends_and_removes(app_module_mock: types.ModuleType) -> None:
+    first, second, third = make_task(1), make_task(2), make_task(3)
+    store = app_module_mock.TaskStore([first, second, third], Config(""))
+    changed_second = make_task(2, description="changed", depends={first.uuid})
+    new_task = make_task(4)
+
+    store.merge([changed_second, new_task], [third.uuid], Config(""))
+
+    assert [task.description for task in store] == ["task", "changed", "task"]
+    assert [task.id for task in store] == [1, 2, 4]
+    assert store.get_index_by_id(4) == 2
+    assert store._get_index_by_uuid(third.uuid) is None
+    assert VirtualTag.BLOCKING in store[0].virtual_tags
+    assert VirtualTag.BLOCKED in store[1].virtual_tags
+
+
+def test_mutation_triggers_incremental_export(
+    app_module_mock: types.ModuleType, monkeypatch: pytest.MonkeyPatch, as_async: AsyncWrapper, as_async_iter: AsyncIterWrapper
+) -> None:
+    exports: list[tuple[str | None, datetime | None]] = []
+    full_export = [make_task(1), make_task(2)]
+    changed = make_task(2, description="changed", modified=datetime(2024, 1, 2))
+    left_report = make_task(1, status=Status.WAITING, modified=datetime(2024, 1, 2))
+
+    def export_tasks(report: str | None, read_filter: str | None = None, modified_after: datetime | None = None) -> list[Task]:
+        exports.append((report, modified_after))
+        if modified_after is None:
+            return full_export
+        if report is None:
+            return [changed, left_report]
+        return [changed]
+
+    cli = app_module_mock.task_cli
+    monkeypatch.setattr(cli, "get_config", as_async(lambda: Config("")), raising=False)
+    monkeypatch.setattr(cli, "get_context", as_async(lambda: None), raising=False)
+    monkeypatch.setattr(cli, "export_tasks", as_async(export_tasks), raising=False)
+    monkeypatch.setattr(cli, "stream_tasks", as_async_iter(export_tasks), raising=False)
+    monkeypatch.setattr(cli, "get_report_columns", as_async(lambda report: [("id", "ID"), ("description", "Description")]), raising=False)
+
+    app = app_module_mock.TaskTuiApp("next")
+
+    async def run_app() -> list[str]:
+        async with app.run_test() as pilot:
+            await pilot.pause()
+            await app.workers.wait_for_complete()
+            app.post_message(app_module_mock.TasksChanged())
+            await pilot.pause()
+            await app.workers.wait_for_complete()
+            return [task.description for task in app.tasks]
+
+    descriptions = asyncio.run(run_app())
+
+    assert exports[0] == ("next", None)
+    assert sorted(exports[1:], key=lambda e: e[0] or "") == [
+        (None, datetime(2024, 1, 1, 11, 59, 59)),
+        ("next", datetime(2024, 1, 1, 11, 59, 59)),
+    ]
+    assert descriptions == ["changed"]
+    assert app.sync_state.incremental_syncs == 1
+
+
+def test_burst_of_changes_triggers_one_refresh(
+    app_module_mock: types.ModuleType, monkeypatch: pytest.MonkeyPatch, as_async: AsyncWrapper, as_async_iter: AsyncIterWrapper
+) -> None:
+    exports: list[str | None] = []
+
+    def stream_tasks(report: str | None, read_filter: str | None = None) -> list[Task]:
+        exports.append(report)
+        return [make_task(1)]
+
+    cli = app_module_mock.task_cli
+    monkeypatch.setattr(cli, "get_config", as_async(lambda: Config("")), raising=False)
+    monkeypatch.setattr(cli, "get_context", as_async(lambda: None), raising=False)
+    monkeypatch.setattr(cli, "stream_tasks", as_async_iter(stream_tasks), raising=False)
+    monkeypatch.setattr(cli, "get_report_columns", as_async(lambda report: [("id", "ID"), ("description", "Description")]), raising=False)
+
+    app = app_module_mock.TaskTuiApp("next")
+
+    async def run_app() -> None:
+        async with app.run_test() as pilot:
+            await pilot.pause()
+            await app.workers.wait_for_complete()
+            for _ in range(3):
+                app.post_message(app_module_mock.TasksChanged(full=True))
+            await pilot.pause()
+            await app.workers.wait_for_complete()
+
+    asyncio.run(run_app())
+
+    assert exports == ["next", "next"]
+    assert app.refresh_scheduler.requested == 4
+    assert app.refresh_scheduler.executed == 2
@@ -0,0 +1,142 @@
+import asyncio
+import types
+from datetime import UTC, datetime
+from uuid import UUID
+
+import pytest
+from conftest import AsyncIterWrapper, AsyncWrapper
+
+from task_tui.config import Config
+from task_tui.data_models import Status, Task, VirtualTag
+from task_tui.widgets import TaskReport
+
+
+def make_task(task_id: int, *, started: bool = False, depends: set[UUID] | None = None) -> Task:
+    timestamp = datetime(2024, 1, 1, 12, 0, 0, tzinfo=UTC)
+    return Task(
+        id=task_id,
+        description=f"task {task_id}",
+        entry=timestamp.isoformat(),
+        modified=timestamp.isoformat(),
+        start=timestamp.isoformat() if started else None,
+        status=Status.PENDING,
+        uuid=UUID(int=task_id),
+        urgency=0.0,
+        depends=depends or set(),
+    )
+
+
+def test_virtual_tags_around_removed_task_match_full_recompute(app_module_mock: types.ModuleType) -> None:
+    # 3 depends on 2, which depends on 1, and 4 depends on 1 as well
+    first, second = make_task(1), make_task(2, depends={UUID(int=1)})
+    third, fourth = make_task(3, depends={UUID(int=2)}), make_task(4, depends={UUID(int=1)})
+    store = app_module_mock.TaskStore([first, second, third, fourth], Config(""))
+    assert VirtualTag.BLOCKED in third.virtual_tags and VirtualTag.BLOCKING in second.virtual_tags
+
+    removed = store.remove([second.uuid])
+    affected = store.refresh_virtual_tags_around(removed, Config(""))
+
+    assert removed == [second]
+    assert {task.id for task in affected} == {1, 3}
+    assert VirtualTag.BLOCKED not in third.virtual_tags
+    # 1 still blocks 4
+    assert VirtualTag.BLOCKING in first.virtual_tags
+    incremental = {task.id: set(task.virtual_tags) for task in store}
+    store.refresh_virtual_tags(Config(""))
+    assert incremental == {task.id: set(task.virtual_tags) for task in store}
+
+
+@pytest.fixture()
+def app_with_tasks(
+    app_module_mock: types.ModuleType, monkeypatch: pytest.MonkeyPatch, as_async: AsyncWrapper, as_async_iter: AsyncIterWrapper
+) -> types.SimpleNamespace:
+    tasks = [make_task(1), make_task(2, started=True)]
+    cli = app_module_mock.task_cli
+    monkeypatch.setattr(cli, "get_config", as_async(lambda: Config("")), raising=False)
+    monkeypatch.setattr(cli, "get_context", as_async(lambda: None), raising=False)
+    monkeypatch.setattr(cli, "stream_tasks", as_async_iter(lambda report, read_filter=None: tasks), raising=False)
+    monkeypatch.setattr(cli, "export_tasks", as_async(lambda report, read_filter=None, modified_after=None: []), raising=False)
+    monkeypatch.setattr(
+        cli, "get_report_columns", as_async(lambda report: [("id", "ID"), ("start", "Started"), ("description", "Description")]), raising=False
+    )
+    return types.SimpleNamespace(app=app_module_mock.TaskTuiApp("next"), cli=cli)
+
+
+def test_start_is_shown_before_taskwarrior_confirms(app_with_tasks: types.SimpleNamespace, monkeypatch: pytest.MonkeyPatch) -> None:
+    app = app_with_tasks.app
+    release = asyncio.Event()
+    observed: list[tuple[bool, bool]] = []
+
+    async def start_tasks(tasks: list[Task]) -> None:
+        # taskwarrior is still running, the row has to show the change already
+        task = app.tasks[0]
+        observed.append((task.start is not None, VirtualTag.ACTIVE in task.virtual_tags))
+        await release.wait()
+
+    monkeypatch.setattr(app_with_tasks.cli, "start_tasks", start_tasks, raising=False)
+
+    async def run_app() -> None:
+        async with app.run_test() as pilot:
+            await pilot.pause()
+            await app.workers.wait_for_complete()
+            app.query_one(TaskReport).focus()
+            await pilot.press("s")
+            await pilot.pause()
+            release.set()
+            await app.workers.wait_for_complete()
+
+    asyncio.run(run_app())
+
+    assert observed == [(True, True)]
+
+
+def test_failed_done_is_rolled_back(app_with_tasks: types.SimpleNamespace, monkeypatch: pytest.MonkeyPatch) -> None:
+    app = app_with_tasks.app
+    rows_during_done: list[int] = []
+
+    async def set_tasks_done(tasks: list[Task]) -> None:
+        rows_during_done.append(app.query_one(TaskReport).row_count)
+        raise ValueError("Task is locked")
+
+    async def stop_tasks(tasks: list[Task]) -> None:
+        raise ValueError("Task is locked")
+
+    monkeypatch.setattr(app_with_tasks.cli, "set_tasks_done", set_tasks_done, raising=False)
+    monkeypatch.setattr(app_with_tasks.cli, "stop_tasks", stop_tasks, raising=False)
+
+    async def run_app() -> tuple[int, datetime | None, list[str]]:
+        async with app.run_test() as pilot:
+            await pilot.pause()
+            await app.workers.wait_for_complete()
+            table = app.query_one(TaskReport)
+            table.focus()
+            await pilot.press("d", "y")
+            await pilot.pause()
+            await app.workers.wait_for_complete()
+            await pilot.press("j", "s")
+            await pilot.pause()
+            await app.workers.wait_for_complete()
+            messages = [notification.message for notification in app._notifications]
+            return table.row_count, app.tasks._get_task_by_id(2).start, messages
+
+    row_count, start, messages = asyncio.run(run_app())
+
+    assert rows_during_done == [1]
+    assert row_count == 2
+    assert start is not None
+    assert any("Failed to set tasks to done" in message for message in messages)
+    assert any("Failed to start/stop tasks" in message for message in messages)
+
+
+def test_virtual_tags_around_changed_dependencies_match_full_recompute(app_module_mock: types.ModuleType) -> None:
+    first, second, third = make_task(1), make_task(2), make_task(3, depends={UUID(int=1)})
+    store = app_module_mock.TaskStore([first, second, third], Config(""))
+    assert VirtualTag.BLOCKING in first.virtual_tags
+
+    store.update_task(make_task(3, depends={UUID(int=2)}))
+    affected = store.refresh_virtual_tags_around([store[2]], Config(""))
+
+    assert {task.id for task in affected} == {1, 2, 3}
+    assert VirtualTag.BLOCKING not in first.virtual_tags
+    assert VirtualTag.BLOCKING in store[1].virtual_tags
+    assert VirtualTag.BLOCKED in store[2].virtual_tags
@@ -5,6 +5,7 @@ from datetime import datetime
 from uuid import UUID
 
 import pytest
+from conftest import AsyncIterWrapper, AsyncWrapper
 from textual.widgets import TabbedContent
 
 import task_tui.task_cli as task_cli_mod
@@ -47,12 +48,12 @@ def make_task(
     )
 
 
-def test_projects_tab_updates_with_tasks(monkeypatch: pytest.MonkeyPatch) -> None:
+def test_projects_tab_updates_with_tasks(monkeypatch: pytest.MonkeyPatch, as_async: AsyncWrapper, as_async_iter: AsyncIterWrapper) -> None:
     class DummyTaskCli:
         def __init__(self) -> None:
             pass
 
-    monkeypatch.setattr(task_cli_mod, "TaskCli", DummyTaskCli)
+    monkeypatch.setattr(task_cli_mod, "AsyncTaskCli", DummyTaskCli)
     if "task_tui.app" in sys.modules:
         del sys.modules["task_tui.app"]
     app_module = importlib.import_module("task_tui.app")
@@ -88,12 +89,13 @@ def test_projects_tab_updates_with_tasks(monkeypatch: pytest.MonkeyPatch) -> Non
         ),
     ]
 
-    monkeypatch.setattr(app_module.task_cli, "get_config", lambda: Config(""), raising=False)
-    monkeypatch.setattr(app_module.task_cli, "export_tasks", lambda report: tasks, raising=False)
+    monkeypatch.setattr(app_module.task_cli, "get_config", as_async(lambda: Config("")), raising=False)
+    monkeypatch.setattr(app_module.task_cli, "get_context", as_async(lambda: None), raising=False)
+    monkeypatch.setattr(app_module.task_cli, "stream_tasks", as_async_iter(lambda report, read_filter=None: tasks), raising=False)
     monkeypatch.setattr(
         app_module.task_cli,
         "get_report_columns",
-        lambda report: [("id", "ID"), ("description", "Description")],
+        as_async(lambda report: [("id", "ID"), ("description", "Description")]),
         raising=False,
     )
 
@@ -118,20 +120,23 @@ def test_projects_tab_updates_with_tasks(monkeypatch: pytest.MonkeyPatch) -> Non
     ]
 
 
-def test_tab_navigation_shortcuts(monkeypatch: pytest.MonkeyPatch) -> None:
+def test_tab_navigation_shortcuts(monkeypatch: pytest.MonkeyPatch, as_async: AsyncWrapper, as_async_iter: AsyncIterWrapper) -> None:
     class DummyTaskCli:
         def __init__(self) -> None:
             pass
 
-    monkeypatch.setattr(task_cli_mod, "TaskCli", DummyTaskCli)
+    monkeypatch.setattr(task_cli_mod, "AsyncTaskCli", DummyTaskCli)
     if "task_tui.app" in sys.modules:
         del sys.modules["task_tui.app"]
     app_module = importlib.import_module("task_tui.app")
 
-    monkeypatch.setattr(app_module.task_cli, "get_config", lambda: Config(""), raising=False)
-    monkeypatch.setattr(app_module.task_cli, "export_tasks", lambda report: [], raising=False)
-    monkeypatch.setattr(app_module.task_cli, "get_report_columns", lambda report: [("id", "ID"), ("description", "Description")], raising=False)
-    monkeypatch.setattr(app_module.task_cli, "list_contexts", lambda: [], raising=False)
+    monkeypatch.setattr(app_module.task_cli, "get_config", as_async(lambda: Config("")), raising=False)
+    monkeypatch.setattr(app_module.task_cli, "get_context", as_async(lambda: None), raising=False)
+    monkeypatch.setattr(app_module.task_cli, "stream_tasks", as_async_iter(lambda report, read_filter=None: []), raising=False)
+    monkeypatch.setattr(
+        app_module.task_cli, "get_report_columns", as_async(lambda report: [("id", "ID"), ("description", "Description")]), raising=False
+    )
+    monkeypatch.setattr(app_module.task_cli, "list_contexts", as_async(lambda: []), raising=False)
 
     app = app_module.TaskTuiApp("next")
 
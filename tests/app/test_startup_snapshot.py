@@ -0,0 +1,81 @@
+import asyncio
+import types
+from datetime import datetime
+from pathlib import Path
+from typing import AsyncIterator
+from uuid import UUID
+
+import pytest
+from conftest import AsyncWrapper
+
+from task_tui.config import Config
+from task_tui.data_models import Status, Task
+from task_tui.snapshot import Snapshot, load_snapshot, save_snapshot
+from task_tui.widgets import TaskReport
+
+
+def make_task(task_id: int, description: str) -> Task:
+    timestamp = datetime(2024, 1, 1, 12, 0, 0)
+    return Task(
+        id=task_id,
+        description=description,
+        entry=timestamp,
+        modified=timestamp,
+        status=Status.PENDING,
+        uuid=UUID(int=task_id),
+        urgency=float(task_id),
+    )
+
+
+HEADINGS = [("id", "ID"), ("description", "Description")]
+
+
+def test_report_is_painted_from_the_snapshot_until_the_export_is_done(
+    app_module_mock: types.ModuleType, monkeypatch: pytest.MonkeyPatch, as_async: AsyncWrapper, tmp_path: Path
+) -> None:
+    monkeypatch.setenv("TASKRC", str(tmp_path / "taskrc"))
+    monkeypatch.setenv("TASKDATA", str(tmp_path / "data"))
+    snapshot_path = tmp_path / "next.task.snapshot"
+    save_snapshot(snapshot_path, Snapshot([make_task(1, "saved"), make_task(2, "saved")], Config("report.next.sort urgency-"), HEADINGS))
+    export_started = asyncio.Event()
+    export_allowed = asyncio.Event()
+
+    async def stream_tasks(report: str, read_filter: str | None = None) -> AsyncIterator[Task]:
+        export_started.set()
+        await export_allowed.wait()
+        for task in [make_task(2, "current"), make_task(3, "current")]:
+            yield task
+
+    cli = app_module_mock.task_cli
+    monkeypatch.setattr(cli, "get_config", as_async(lambda: Config("report.next.sort urgency-")), raising=False)
+    monkeypatch.setattr(cli, "get_context", as_async(lambda: None), raising=False)
+    monkeypatch.setattr(cli, "stream_tasks", stream_tasks, raising=False)
+    monkeypatch.setattr(cli, "get_report_columns", as_async(lambda report: HEADINGS), raising=False)
+
+    app = app_module_mock.TaskTuiApp("next", snapshot_path=snapshot_path)
+
+    async def run_app() -> None:
+        async with app.run_test(size=(80, 24)) as pilot:
+            await export_started.wait()
+            await pilot.pause(0.3)
+            table = app.query_one(TaskReport)
+
+            # the snapshot is shown, dimmed instead of hidden behind the loading indicator
+            assert [table.get_row_at(row) for row in range(table.row_count)] == [[2, "saved"], [1, "saved"]]
+            assert table.has_class("-stale")
+            assert not table.loading
+
+            export_allowed.set()
+            await app.workers.wait_for_complete()
+            await pilot.pause()
+
+            assert [table.get_row_at(row) for row in range(table.row_count)] == [[3, "current"], [2, "current"]]
+            assert not table.has_class("-stale")
+
+    asyncio.run(run_app())
+
+    # the report is saved for the next launch
+    snapshot = load_snapshot(snapshot_path)
+    assert snapshot is not None
+    assert [task.description for task in snapshot.tasks] == ["current", "current"]
+    assert snapshot.headings == HEADINGS
@@ -0,0 +1,88 @@
+import asyncio
+import types
+from datetime import datetime
+from uuid import UUID
+
+import pytest
+from conftest import AsyncIterWrapper, AsyncWrapper
+
+from task_tui.config import Config
+from task_tui.data_models import Status, Task
+from task_tui.widgets import TaskReport
+
+
+def make_task(task_id: int, description: str | None = None) -> Task:
+    timestamp = datetime(2024, 1, 1, 12, 0, 0)
+    return Task(
+        id=task_id,
+        description=description or f"task {task_id}",
+        entry=timestamp,
+        modified=timestamp,
+        status=Status.PENDING,
+        uuid=UUID(int=task_id),
+        urgency=float(task_id),
+    )
+
+
+TASKS = [make_task(task_id) for task_id in range(1, 61)]
+
+
+def test_table_update_only_touches_changed_rows(
+    app_module_mock: types.ModuleType, monkeypatch: pytest.MonkeyPatch, as_async: AsyncWrapper, as_async_iter: AsyncIterWrapper
+) -> None:
+    cli = app_module_mock.task_cli
+    monkeypatch.setattr(cli, "get_config", as_async(lambda: Config("report.next.sort urgency-")), raising=False)
+    monkeypatch.setattr(cli, "get_context", as_async(lambda: None), raising=False)
+    monkeypatch.setattr(cli, "stream_tasks", as_async_iter(lambda report, read_filter=None: TASKS), raising=False)
+    monkeypatch.setattr(cli, "get_report_columns", as_async(lambda report: [("id", "ID"), ("description", "Description")]), raising=False)
+
+    app = app_module_mock.TaskTuiApp("next")
+
+    async def run_app() -> None:
+        async with app.run_test(size=(80, 24)) as pilot:
+            await pilot.pause()
+            await app.workers.wait_for_complete()
+            table = app.query_one(TaskReport)
+            table.focus()
+            table.move_cursor(row=40, scroll=True)
+            await pilot.pause()
+            cursor_key = table.coordinate_to_cell_key(table.cursor_coordinate).row_key
+            scroll_y = table.scroll_y
+            assert scroll_y > 0
+            rows = dict(table.rows)
+            columns = dict(table.columns)
+
+            # task 60 (the first row) changes, task 59 is removed and a more urgent task 61 is added
+            app.tasks.update_task(TASKS[59].model_copy(update={"description": "changed"}))
+            app.tasks.remove([UUID(int=59)])
+            app.tasks.extend([make_task(61)])
+            app._update_table()
+            await pilot.pause()
+
+            assert table.columns == columns
+            assert [row.key.value for row in table.ordered_rows[:3]] == [str(UUID(int=61)), str(UUID(int=60)), str(UUID(int=58))]
+            assert table.get_row_at(1) == [60, "changed"]
+            assert len(table.rows) == len(TASKS)
+            # the rows of the other tasks are kept as they are
+            assert all(table.rows[row_key] is row for row_key, row in rows.items() if row_key.value != str(UUID(int=59)))
+            # the cursor stays on its task, one row further down, and the table doesn't scroll back to the top
+            assert table.coordinate_to_cell_key(table.cursor_coordinate).row_key == cursor_key
+            assert table.cursor_row == 40
+            assert table.scroll_y == scroll_y
+            assert table.rows[cursor_key].label.plain == "▶"
+
+            # when many tasks are gone, the table is cleared and filled again instead of removing them one by one
+            monkeypatch.setattr(TaskReport, "REBUILD_REMOVALS", 10)
+            app.tasks.remove([UUID(int=task_id) for task_id in range(1, 16)])
+            app._update_table()
+            await pilot.pause()
+
+            assert len(table.rows) == len(TASKS) - 15
+            assert table.get_row_at(1) == [60, "changed"]
+            assert table.coordinate_to_cell_key(table.cursor_coordinate).row_key == cursor_key
+            assert table.rows[cursor_key].label.plain == "▶"
+            # the table scrolls to the cursor's row
+            visible_rows = table.scrollable_content_region.height - table.header_height
+            assert table.scroll_y <= table.cursor_row < table.scroll_y + visible_rows
+
+    asyncio.run(run_app())
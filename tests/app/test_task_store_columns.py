@@ -0,0 +1,66 @@
+import types
+from datetime import UTC, datetime, timedelta
+from uuid import UUID
+
+import pytest
+
+from task_tui.config import Config
+from task_tui.data_models import Status, Task
+
+NOW = datetime(2024, 1, 10, 12, 0, 0, tzinfo=UTC)
+
+
+def make_task(task_id: int, *, project: str | None = None, depends: set[UUID] | None = None, due: datetime | None = None) -> Task:
+    return Task(
+        id=task_id,
+        description=f"task {task_id}",
+        entry=NOW,
+        modified=NOW,
+        due=due,
+        status=Status.PENDING,
+        uuid=UUID(int=task_id),
+        urgency=0.0,
+        project=project,
+        depends=depends or set(),
+    )
+
+
+def test_changed_task_updates_cached_cells_and_counters(app_module_mock: types.ModuleType) -> None:
+    store = app_module_mock.TaskStore([make_task(1), make_task(2)], Config(""))
+    cached = store.project
+    assert store.column_is_empty("project")
+
+    store.update_task(make_task(2, project="home"))
+
+    assert store.project is cached
+    assert cached == [None, "home"]
+    assert not store.column_is_empty("project")
+    store.update_task(make_task(2))
+    assert store.column_is_empty("project")
+
+
+def test_extend_appends_cells_and_resolves_new_dependencies(app_module_mock: types.ModuleType) -> None:
+    store = app_module_mock.TaskStore([make_task(1, depends={UUID(int=2)})], Config(""))
+    assert store.depends == [""]
+    assert store.project == [None]
+
+    store.extend([make_task(2, project="home")])
+
+    assert store.project == [None, "home"]
+    assert store.depends == ["2", ""]
+    assert not store.column_is_empty("depends")
+
+
+def test_only_relative_dates_whose_text_changed_are_updated(app_module_mock: types.ModuleType, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(app_module_mock, "get_current_datetime", lambda: NOW)
+    tasks = [make_task(1, due=NOW + timedelta(days=2, hours=1)), make_task(2, due=NOW + timedelta(days=5, hours=12)), make_task(3)]
+    store = app_module_mock.TaskStore(tasks, Config(""))
+    assert store.due == ["2d", "5d", ""]
+    assert store.update_live_ages(NOW + timedelta(minutes=59)) == []
+
+    updated = store.update_live_ages(NOW + timedelta(hours=1, seconds=1))
+
+    assert updated == [(tasks[0], "due")]
+    assert store.due == ["1d", "5d", ""]
+    # the second task is the next to change, it becomes due in "4d"
+    assert store.live_ages.next_deadline() == pytest.approx((NOW + timedelta(hours=12)).timestamp(), abs=0.01)
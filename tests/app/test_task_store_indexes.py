@@ -0,0 +1,77 @@
+import types
+from datetime import datetime
+from uuid import UUID, uuid4
+
+import pytest
+
+from task_tui.config import Config
+from task_tui.data_models import Status, Task
+from task_tui.exceptions import TaskStoreError
+
+
+def make_task(*, id_: int, uuid: UUID | None = None, depends: set[UUID] | None = None, description: str = "task") -> Task:
+    now = datetime(2024, 1, 1, 0, 0, 0)
+    return Task(
+        id=id_,
+        description=description,
+        entry=now.isoformat(),
+        modified=now.isoformat(),
+        status=Status.PENDING,
+        uuid=uuid or uuid4(),
+        urgency=0.0,
+        annotations=[],
+        tags=set(),
+        depends=depends or set(),
+        virtual_tags=set(),
+    )
+
+
+def test_lookups_use_indexes(app_module_mock: types.ModuleType) -> None:
+    tasks = [make_task(id_=i) for i in range(1, 4)]
+    store = app_module_mock.TaskStore(tasks, Config(""))
+
+    assert store._get_task_by_uuid(tasks[1].uuid) is tasks[1]
+    assert store._get_index_by_uuid(tasks[2].uuid) == 2
+    assert store._get_task_by_id(1) is tasks[0]
+    assert store.get_index_by_id(3) == 2
+    assert store._get_task_by_uuid(uuid4()) is None
+    assert store._get_index_by_uuid(uuid4()) is None
+    with pytest.raises(TaskStoreError, match="No task with this ID"):
+        store._get_task_by_id(42)
+
+
+def test_duplicates_raise_on_lookup(app_module_mock: types.ModuleType) -> None:
+    shared_uuid = uuid4()
+    tasks = [make_task(id_=1, uuid=shared_uuid), make_task(id_=1, uuid=shared_uuid)]
+    store = app_module_mock.TaskStore(tasks, Config(""))
+
+    with pytest.raises(TaskStoreError, match="same UUID"):
+        store._get_task_by_uuid(shared_uuid)
+    with pytest.raises(TaskStoreError, match="same UUID"):
+        store._get_index_by_uuid(shared_uuid)
+    with pytest.raises(TaskStoreError, match="same ID"):
+        store._get_task_by_id(1)
+
+
+def test_depends_column_resolves_ids(app_module_mock: types.ModuleType) -> None:
+    dependency = make_task(id_=7)
+    task = make_task(id_=8, depends={dependency.uuid, uuid4()})
+    store = app_module_mock.TaskStore([dependency, task], Config(""))
+
+    assert store.depends == ["", "7"]
+
+
+def test_update_task_keeps_indexes_current(app_module_mock: types.ModuleType) -> None:
+    tasks = [make_task(id_=1), make_task(id_=2)]
+    store = app_module_mock.TaskStore(tasks, Config(""))
+    renumbered = tasks[1].model_copy(update={"id": 5, "description": "changed"})
+
+    store.update_task(renumbered)
+
+    assert store[1] is renumbered
+    assert store._get_task_by_uuid(renumbered.uuid) is renumbered
+    assert store.get_index_by_id(5) == 1
+    with pytest.raises(TaskStoreError, match="No task with this ID"):
+        store._get_task_by_id(2)
+    with pytest.raises(TaskStoreError, match="No task with this UUID"):
+        store.update_task(make_task(id_=9))
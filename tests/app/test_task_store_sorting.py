@@ -0,0 +1,132 @@
+import asyncio
+import types
+from datetime import UTC, datetime, timedelta
+from typing import Iterable
+from uuid import UUID
+
+import pytest
+from conftest import AsyncIterWrapper, AsyncWrapper
+
+from task_tui.config import Config
+from task_tui.data_models import Status, Task
+from task_tui.sorting import SortKey, parse_sort
+from task_tui.widgets import TaskReport
+
+NOW = datetime(2024, 1, 10, 12, 0, 0, tzinfo=UTC)
+
+
+def make_task(task_id: int, *, project: str | None = None, due: datetime | None = None, priority: str | None = None) -> Task:
+    return Task(
+        id=task_id,
+        description=f"task {task_id}",
+        entry=NOW,
+        modified=NOW,
+        due=due,
+        status=Status.PENDING,
+        uuid=UUID(int=task_id),
+        urgency=float(task_id),
+        project=project,
+        priority=priority,
+    )
+
+
+TASKS = [
+    make_task(1, project="work", due=NOW + timedelta(days=2)),
+    make_task(2, project="home", priority="L"),
+    make_task(3, project="work", priority="H", due=NOW + timedelta(days=1)),
+    make_task(4, priority="M", due=NOW + timedelta(days=3)),
+    make_task(5, project="home", due=NOW + timedelta(days=1)),
+]
+
+
+def ids(tasks: Iterable[Task]) -> list[int]:
+    return [task.id for task in tasks]
+
+
+def test_sort_by_several_keys_and_directions(app_module_mock: types.ModuleType) -> None:
+    store = app_module_mock.TaskStore(TASKS, Config(""))
+
+    assert store.sort(parse_sort("project+,urgency-"))
+    assert ids(store) == [4, 5, 2, 3, 1]
+    store.sort(parse_sort("priority-"))
+    # equal priorities keep their previous order
+    assert ids(store) == [3, 4, 2, 5, 1]
+
+
+def test_tasks_without_date_come_last_in_both_directions(app_module_mock: types.ModuleType) -> None:
+    store = app_module_mock.TaskStore(TASKS, Config(""))
+
+    store.sort([SortKey("due")])
+    assert ids(store) == [3, 5, 1, 4, 2]
+    store.sort([SortKey("due", descending=True)])
+    assert ids(store) == [4, 1, 3, 5, 2]
+
+
+def test_sort_reorders_cached_columns_and_lookups(app_module_mock: types.ModuleType) -> None:
+    store = app_module_mock.TaskStore(TASKS, Config(""))
+    projects = store.project
+
+    store.sort([SortKey("id", descending=True)])
+
+    assert projects == ["home", None, "work", "home", "work"]
+    assert store.get_index_by_id(5) == 0
+    assert not store.sort([SortKey("id", descending=True)])
+
+
+def test_changed_task_is_sorted_by_its_new_value(app_module_mock: types.ModuleType) -> None:
+    store = app_module_mock.TaskStore(TASKS, Config(""))
+    sort_keys = [SortKey("urgency")]
+    store.sort(sort_keys)
+
+    store.update_task(TASKS[0].model_copy(update={"urgency": 10.0}))
+
+    assert store.sort(sort_keys)
+    assert ids(store) == [2, 3, 4, 5, 1]
+
+
+def test_group_ends_follow_break_markers(app_module_mock: types.ModuleType) -> None:
+    store = app_module_mock.TaskStore(TASKS, Config(""))
+    sort_keys = parse_sort("project+/,id+")
+    store.sort(sort_keys)
+
+    assert ids(store) == [4, 2, 5, 1, 3]
+    assert store.group_ends(sort_keys) == [0, 2]
+    assert store.group_ends(parse_sort("project+,id+")) == []
+
+
+def test_selecting_a_header_reorders_rows_without_rebuilding_the_table(
+    app_module_mock: types.ModuleType, monkeypatch: pytest.MonkeyPatch, as_async: AsyncWrapper, as_async_iter: AsyncIterWrapper
+) -> None:
+    cli = app_module_mock.task_cli
+    monkeypatch.setattr(cli, "get_config", as_async(lambda: Config("report.next.sort             project+/,id+")), raising=False)
+    monkeypatch.setattr(cli, "get_context", as_async(lambda: None), raising=False)
+    monkeypatch.setattr(cli, "stream_tasks", as_async_iter(lambda report, read_filter=None: TASKS), raising=False)
+    monkeypatch.setattr(cli, "get_report_columns", as_async(lambda report: [("id", "ID"), ("urgency", "Urg")]), raising=False)
+
+    app = app_module_mock.TaskTuiApp("next")
+
+    async def run_app() -> list[list[str | None]]:
+        orders: list[list[str | None]] = []
+        async with app.run_test() as pilot:
+            await pilot.pause()
+            await app.workers.wait_for_complete()
+            table = app.query_one(TaskReport)
+            orders.append([row.key.value for row in table.ordered_rows])
+            table.move_cursor(row=4)
+            rows = dict(table.rows)
+            for _ in range(2):
+                column_key = table.ordered_columns[1].key
+                app.post_message(TaskReport.HeaderSelected(table, column_key, 1, table.columns[column_key].label))
+                await pilot.pause()
+                orders.append([row.key.value for row in table.ordered_rows])
+            assert table.rows == rows
+            # the cursor stays on the task it was on
+            assert table.coordinate_to_cell_key(table.cursor_coordinate).row_key.value == str(UUID(int=3))
+        return orders
+
+    orders = asyncio.run(run_app())
+
+    def uuids(*task_ids: int) -> list[str | None]:
+        return [str(UUID(int=task_id)) for task_id in task_ids]
+
+    assert orders == [uuids(4, 2, 5, 1, 3), uuids(1, 2, 3, 4, 5), uuids(5, 4, 3, 2, 1)]
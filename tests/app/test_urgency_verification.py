@@ -0,0 +1,93 @@
+import json
+import shutil
+import subprocess
+import types
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+from uuid import UUID
+
+import pytest
+
+from task_tui.config import Config
+from task_tui.data_models import Status, Task
+from task_tui.task_cli import TaskCli
+
+NOW = datetime(2024, 1, 10, 12, 0, 0, tzinfo=UTC)
+
+
+def make_task(task_id: int, urgency: float, **fields: object) -> Task:
+    return Task.model_validate(
+        {
+            "id": task_id,
+            "description": f"task {task_id}",
+            "entry": NOW,
+            "modified": NOW,
+            "status": Status.PENDING,
+            "uuid": UUID(int=task_id),
+            "urgency": urgency,
+        }
+        | fields
+    )
+
+
+# exported tasks with the urgency taskwarrior reports for them at NOW
+EXPORTED = [
+    make_task(1, 0.0),
+    make_task(2, 17.2, project="work", tags={"next"}, entry=NOW - timedelta(days=73)),
+    make_task(3, 14.8, due=NOW, priority="H"),
+    # blocked by the next task, which is blocking
+    make_task(4, -5.0, depends={UUID(int=5)}),
+    make_task(5, 14.4, start=NOW, due=NOW + timedelta(days=100)),
+]
+
+
+def test_exported_urgency_is_reproduced(app_module_mock: types.ModuleType, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(app_module_mock, "get_current_datetime", lambda: NOW)
+    wrong = make_task(6, 3.0)
+    store = app_module_mock.TaskStore([*EXPORTED, wrong], Config(""))
+
+    mismatches = store.urgency_mismatches(0.01)
+
+    assert [(mismatch.task, mismatch.exported, mismatch.computed) for mismatch in mismatches] == [(wrong, 3.0, 0.0)]
+
+
+def test_local_change_updates_urgency_of_the_task_and_its_dependencies(app_module_mock: types.ModuleType, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(app_module_mock, "get_current_datetime", lambda: NOW)
+    store = app_module_mock.TaskStore(EXPORTED, Config(""))
+    assert store.urgency == [0.0, 17.2, 14.8, -5.0, 14.4]
+
+    # the blocked task is completed, its dependency is no longer blocking
+    done = EXPORTED[3].model_copy(update={"status": Status.COMPLETED})
+    store.update_task(done)
+    changed = store.refresh_urgency(store.refresh_virtual_tags_around([done], Config("")))
+
+    assert {task.id for task in changed} == {4, 5}
+    assert store.urgency == pytest.approx([0.0, 17.2, 14.8, 0.0, 6.4])
+
+
+@pytest.mark.skipif(shutil.which("task") is None, reason="taskwarrior is not installed")
+def test_urgency_matches_taskwarrior(app_module_mock: types.ModuleType, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("TASKDATA", str(tmp_path))
+    monkeypatch.setenv("TASKRC", str(tmp_path / "taskrc"))
+    (tmp_path / "taskrc").write_text("urgency.inherit=1\nurgency.user.project.work.coefficient=2.5\n")
+    now = datetime.now(UTC)
+    fixture: list[dict[str, object]] = [
+        {"description": "plain", "entry": now - timedelta(days=40)},
+        {"description": "next", "project": "work.meetings", "tags": ["next", "home"], "entry": now - timedelta(days=400)},
+        {"description": "due", "due": now + timedelta(days=3), "priority": "M", "annotations": [{"entry": now, "description": "note"}]},
+        {"description": "overdue", "due": now - timedelta(days=2), "start": now, "scheduled": now - timedelta(hours=1)},
+        {"description": "waiting", "status": "waiting", "wait": now + timedelta(days=2)},
+    ]
+    for index, task in enumerate(fixture):
+        task.update(uuid=str(UUID(int=index + 1)), status=task.get("status", "pending"), entry=task.get("entry", now), modified=now)
+    # the plain task blocks the next one
+    fixture[1]["depends"] = [str(UUID(int=1))]
+    import_file = tmp_path / "import.json"
+    import_file.write_text(json.dumps(fixture, default=lambda value: value.strftime("%Y%m%dT%H%M%SZ")))
+    subprocess.run(["task", "rc.confirmation=off", "import", str(import_file)], capture_output=True, check=True)
+
+    task_cli = TaskCli()
+    store = app_module_mock.TaskStore(task_cli.export_tasks("all"), task_cli.get_config())
+
+    assert len(store) == len(fixture)
+    assert store.urgency_mismatches(0.01) == []
@@ -0,0 +1,169 @@
+import asyncio
+import types
+from datetime import datetime
+from uuid import UUID
+
+import pytest
+from conftest import AsyncIterWrapper, AsyncWrapper
+from textual.app import App
+from textual.coordinate import Coordinate
+from textual.widgets import DataTable
+
+from task_tui.config import Config
+from task_tui.data_models import Status, Task
+from task_tui.widgets import TaskReport
+
+
+def make_task(task_id: int) -> Task:
+    timestamp = datetime(2024, 1, 1, 12, 0, 0)
+    return Task(
+        id=task_id,
+        description=f"task {task_id}",
+        entry=timestamp,
+        modified=timestamp,
+        status=Status.PENDING,
+        uuid=UUID(int=task_id),
+        urgency=float(task_id),
+    )
+
+
+TASKS = [make_task(task_id) for task_id in range(1, 501)]
+
+
+def test_huge_report_only_reads_the_shown_rows(
+    app_module_mock: types.ModuleType, monkeypatch: pytest.MonkeyPatch, as_async: AsyncWrapper, as_async_iter: AsyncIterWrapper
+) -> None:
+    cli = app_module_mock.task_cli
+    monkeypatch.setattr(app_module_mock, "VIRTUAL_REPORT_SIZE", 100)
+    monkeypatch.setattr(cli, "get_config", as_async(lambda: Config("report.next.sort urgency-")), raising=False)
+    monkeypatch.setattr(cli, "get_context", as_async(lambda: None), raising=False)
+    monkeypatch.setattr(cli, "stream_tasks", as_async_iter(lambda report, read_filter=None: TASKS), raising=False)
+    monkeypatch.setattr(cli, "get_report_columns", as_async(lambda report: [("id", "ID"), ("description", "Description")]), raising=False)
+
+    app = app_module_mock.TaskTuiApp("next")
+
+    async def run_app() -> None:
+        async with app.run_test(size=(80, 24)) as pilot:
+            await pilot.pause()
+            await app.workers.wait_for_complete()
+            await pilot.pause()
+            table = app.query_one(TaskReport)
+            table.focus()
+
+            assert table.row_source is not None
+            assert table.row_count == len(TASKS)
+            assert table.get_row_at(0) == [500, "task 500"]
+            # the shown rows and the ones around them are read, not the whole report
+            assert 0 < len(table._source_rows) < table.size.height + 2 * table.OVERSCAN
+            assert table.rows[table.coordinate_to_cell_key(table.cursor_coordinate).row_key].label.plain == "▶"
+
+            await pilot.press("ctrl+d")
+            await pilot.pause()
+            page = table.cursor_row
+            assert page > 0
+            assert table.scroll_y > 0
+            await pilot.press("ctrl+d", "ctrl+u")
+            assert table.cursor_row == page
+
+            # a change is shown without updating the table, the other rows are kept
+            app._update_tasks_locally([TASKS[499 - page].model_copy(update={"description": "changed"})])
+            await pilot.pause()
+            assert table.get_row_at(page) == [500 - page, "changed"]
+
+            cursor_key = table.coordinate_to_cell_key(table.cursor_coordinate).row_key
+            app._remove_tasks_locally([TASKS[499]])
+            await pilot.pause()
+            assert table.row_count == len(TASKS) - 1
+            assert table.get_row_at(0) == [499, "task 499"]
+            # the cursor stays on its task
+            assert table.coordinate_to_cell_key(table.cursor_coordinate).row_key == cursor_key
+            assert table.get_row_at(table.cursor_row)[1] == "changed"
+
+            # a shorter report is added to the table
+            app.tasks.remove(task.uuid for task in TASKS[:450])
+            app._update_table()
+            await pilot.pause()
+            assert table.row_source is None
+            assert table.row_count == 49
+            assert table.get_row_at(table.cursor_row)[1] == "changed"
+
+    asyncio.run(run_app())
+
+
+@pytest.fixture()
+def report_app(app_module_mock: types.ModuleType, monkeypatch: pytest.MonkeyPatch, as_async: AsyncWrapper, as_async_iter: AsyncIterWrapper) -> App:
+    cli = app_module_mock.task_cli
+    monkeypatch.setattr(cli, "get_config", as_async(lambda: Config("report.next.sort urgency-")), raising=False)
+    monkeypatch.setattr(cli, "get_context", as_async(lambda: None), raising=False)
+    monkeypatch.setattr(cli, "stream_tasks", as_async_iter(lambda report, read_filter=None: TASKS), raising=False)
+    monkeypatch.setattr(cli, "get_report_columns", as_async(lambda report: [("id", "ID"), ("description", "Description")]), raising=False)
+    return app_module_mock.TaskTuiApp("next")
+
+
+# TaskReport computes the geometry of its one line high rows from their index instead of adding up the rows above them,
+# which has to agree with `DataTable`; the methods of `DataTable` work on the rows of a source as well, just slowly
+@pytest.mark.parametrize("virtual_report_size", [1, len(TASKS) + 1])
+def test_row_geometry_matches_data_table(
+    app_module_mock: types.ModuleType, report_app: App, monkeypatch: pytest.MonkeyPatch, virtual_report_size: int
+) -> None:
+    monkeypatch.setattr(app_module_mock, "VIRTUAL_REPORT_SIZE", virtual_report_size)
+
+    async def run_app() -> None:
+        async with report_app.run_test(size=(80, 24)) as pilot:
+            await pilot.pause()
+            await report_app.workers.wait_for_complete()
+            table = report_app.query_one(TaskReport)
+            table.fixed_rows = 2
+            table.fixed_columns = 1
+            await pilot.pause()
+
+            assert (table.row_source is not None) == (virtual_report_size == 1)
+            assert table._total_row_height == DataTable._total_row_height.fget(table)
+            assert table._get_fixed_offset() == DataTable._get_fixed_offset(table)
+            for row_index in (0, 1, 250, len(TASKS) - 1, len(TASKS)):
+                assert table._get_row_region(row_index) == DataTable._get_row_region(table, row_index)
+                for column_index in range(len(table.columns) + 1):
+                    coordinate = Coordinate(row_index, column_index)
+                    assert table._get_cell_region(coordinate) == DataTable._get_cell_region(table, coordinate)
+            for y in (0, table.header_height, table.header_height + 250, table.header_height + len(TASKS) - 1):
+                assert table._get_offsets(y) == DataTable._get_offsets(table, y)
+            with pytest.raises(LookupError):
+                table._get_offsets(table.header_height + len(TASKS) + 1)
+
+    asyncio.run(run_app())
+
+
+def test_virtual_report_scrolls_and_is_clicked_like_a_table(
+    app_module_mock: types.ModuleType, report_app: App, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(app_module_mock, "VIRTUAL_REPORT_SIZE", 100)
+
+    async def run_app() -> None:
+        async with report_app.run_test(size=(80, 24)) as pilot:
+            await pilot.pause()
+            await report_app.workers.wait_for_complete()
+            await pilot.pause()
+            table = report_app.query_one(TaskReport)
+            table.focus()
+            assert table.row_source is not None
+
+            # moving the cursor far down scrolls its row into view, and the rows shown there are read and rendered
+            table.move_cursor(row=300, scroll=True, animate=False)
+            await pilot.pause()
+            first_row = round(table.scroll_y)
+            visible_rows = table.scrollable_content_region.height - table.header_height
+            assert first_row <= 300 < first_row + visible_rows
+            assert f"task {500 - first_row}" in table.render_line(table.header_height).text
+
+            # a click selects the row under the pointer
+            await pilot.click(TaskReport, offset=(10, table.header_height + 3))
+            await pilot.pause()
+            assert table.cursor_row == first_row + 3
+            assert table.get_row_at(table.cursor_row)[0] == 500 - first_row - 3
+
+            # a click on a header sorts by its column, ascending IDs
+            await pilot.click(TaskReport, offset=(table._row_label_column_width + 1, 0))
+            await pilot.pause()
+            assert table.get_row_at(0) == [1, "task 1"]
+
+    asyncio.run(run_app())
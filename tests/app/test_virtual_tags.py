@@ -13,6 +13,8 @@ from task_tui.data_models import Status, Task, VirtualTag
 class TaskStoreProto(Protocol):
     def __getitem__(self, i: int) -> Task: ...
     def __len__(self) -> int: ...
+    def next_due_boundary(self, config: Config) -> date | None: ...
+    def refresh_due_virtual_tags(self, config: Config) -> list[Task]: ...
 
 
 TaskStoreFactory = Callable[[list[Task], Config], TaskStoreProto]
@@ -184,3 +186,40 @@ class TestDependencyTagging:
 
         assert VirtualTag.BLOCKING not in dep_vt
         assert VirtualTag.BLOCKED not in main_vt
+
+
+class TestDueBoundaries:
+    def test_next_boundary_is_the_first_due_state_change(self, monkeypatch: pytest.MonkeyPatch, task_store_cls: TaskStoreFactory) -> None:
+        today = date(2024, 1, 10)
+        import task_tui.app as app_mod
+
+        monkeypatch.setattr(app_mod, "get_current_date", lambda: today)
+        store = task_store_cls([make_task(due=datetime(2024, 1, 15)), make_task(due=datetime(2024, 1, 25))], make_config(due_days=3))
+
+        # the first task enters the due window on the 12th
+        assert store.next_due_boundary(make_config(due_days=3)) == date(2024, 1, 12)
+        assert task_store_cls([make_task()], make_config()).next_due_boundary(make_config()) is None
+
+    def test_only_tasks_with_a_changed_due_state_are_updated(self, monkeypatch: pytest.MonkeyPatch, task_store_cls: TaskStoreFactory) -> None:
+        today = date(2024, 1, 10)
+        import task_tui.app as app_mod
+
+        monkeypatch.setattr(app_mod, "get_current_date", lambda: today)
+        config = make_config(due_days=3)
+        tasks = [
+            make_task(id_=1, due=datetime(2024, 1, 11)),
+            make_task(id_=2, due=datetime(2024, 1, 15)),
+            make_task(id_=3, due=datetime(2024, 1, 30)),
+        ]
+        store = task_store_cls(tasks, config)
+        assert store.refresh_due_virtual_tags(config) == []
+
+        # the TUI was left open for two nights
+        today = date(2024, 1, 12)
+        updated = store.refresh_due_virtual_tags(config)
+
+        assert {task.id for task in updated} == {1, 2}
+        assert VirtualTag.OVERDUE in tasks[0].virtual_tags
+        assert VirtualTag.DUE in tasks[1].virtual_tags
+        assert VirtualTag.DUE not in tasks[2].virtual_tags
+        assert store.next_due_boundary(config) == date(2024, 1, 15)
@@ -1,6 +1,7 @@
 import importlib
 import sys
 import types
+from typing import Any, AsyncIterator, Awaitable, Callable, Iterable, ParamSpec, TypeVar
 
 import pytest
 
@@ -14,7 +15,41 @@ def app_module_mock(monkeypatch: pytest.MonkeyPatch) -> types.ModuleType:
             pass
 
     monkeypatch.setattr(task_cli_mod, "TaskCli", DummyTaskCli)
+    monkeypatch.setattr(task_cli_mod, "AsyncTaskCli", DummyTaskCli)
     if "task_tui.app" in sys.modules:
         del sys.modules["task_tui.app"]
 
     return importlib.import_module("task_tui.app")
+
+
+P = ParamSpec("P")
+R = TypeVar("R")
+AsyncWrapper = Callable[[Callable[..., Any]], Callable[..., Awaitable[Any]]]
+AsyncIterWrapper = Callable[[Callable[..., Iterable[Any]]], Callable[..., AsyncIterator[Any]]]
+
+
+def as_coroutine_function(function: Callable[P, R]) -> Callable[P, Awaitable[R]]:
+    async def wrapper(*args: P.args, **kwargs: P.kwargs) -> R:
+        return function(*args, **kwargs)
+
+    return wrapper
+
+
+@pytest.fixture()
+def as_async() -> AsyncWrapper:
+    """Turn a synchronous fake into a coroutine function, matching the `AsyncTaskCli` API."""
+    return as_coroutine_function
+
+
+def as_async_generator_function(function: Callable[P, Iterable[R]]) -> Callable[P, AsyncIterator[R]]:
+    async def wrapper(*args: P.args, **kwargs: P.kwargs) -> AsyncIterator[R]:
+        for item in function(*args, **kwargs):
+            yield item
+
+    return wrapper
+
+
+@pytest.fixture()
+def as_async_iter() -> AsyncIterWrapper:
+    """Turn a synchronous fake returning a list into an async generator function, like `AsyncTaskCli.stream_tasks`."""
+    return as_async_generator_function
@@ -5,7 +5,8 @@ import pytest
 from rich.color import Color
 from rich.style import Style
 
-from task_tui.config import Config
+from task_tui.config import Config, ReportConfig, UdaConfig
+from task_tui.data_models import ContextInfo
 
 
 class TestParseColorConfig:
@@ -192,3 +193,90 @@ class TestParseColor:
     def test_invalid_color_raises_error(self) -> None:
         with pytest.raises(ValueError, match=r"Unknown color invalid"):
             Config._parse_color("invalid")
+
+
+class TestParseReportSorts:
+    def test_sort_settings_are_found_by_report(self) -> None:
+        config = Config(
+            "\n".join(
+                [
+                    "report.next.columns          id,description",
+                    "report.next.sort             urgency-",
+                    "report.by.project.sort       project+/,due+",
+                    "uda.priority.values          H,M,L,",
+                ]
+            )
+        )
+
+        assert config.report_sorts == {"next": "urgency-", "by.project": "project+/,due+"}
+        assert config.priority_values == ["H", "M", "L", ""]
+
+
+class TestSettingsIndex:
+    SHOW_OUTPUT = "\n".join(
+        [
+            "Config Variable              Value",
+            "---------------------------- ------------------------------------",
+            "context",
+            "context.work.read            project:Work",
+            "context.work.write           project:Work",
+            "context.home                 project:Home",
+            "due                          3",
+            "report.next.columns          id,description,urgency",
+            "report.next.labels           ID,Long Description,Urg",
+            "report.next.filter           status:pending -WAITING",
+            "report.next.sort             urgency-",
+            "uda.estimate.type            duration",
+            "uda.estimate.label           Est",
+            "uda.priority.values          H,M,L,",
+            "urgency.inherit              yes",
+            "urgency.age.max              invalid",
+            "",
+            "Some of your .taskrc variables differ from the default values.",
+        ]
+    )
+
+    def test_settings_after_a_setting_without_value_are_found(self) -> None:
+        config = Config(self.SHOW_OUTPUT)
+
+        assert config.settings["context"] == ""
+        assert config.due == 3
+        assert config.get_str("report.next.filter") == "status:pending -WAITING"
+
+    def test_typed_accessors(self) -> None:
+        config = Config(self.SHOW_OUTPUT)
+
+        assert config.get_bool("urgency.inherit", False) is True
+        assert config.get_float("due", 0.0) == 3.0
+        assert config.get_list("uda.priority.values", []) == ["H", "M", "L", ""]
+        # invalid and missing settings fall back to the default
+        assert config.urgency_age_max == 365
+        assert config.get_int("missing", 5) == 5
+
+    def test_reports(self) -> None:
+        config = Config(self.SHOW_OUTPUT)
+
+        assert config.reports["next"] == ReportConfig(
+            "next",
+            columns=("id", "description", "urgency"),
+            labels=("ID", "Long Description", "Urg"),
+            sort="urgency-",
+            filter="status:pending -WAITING",
+        )
+        assert config.reports["next"].headings == [("id", "ID"), ("description", "Long Description"), ("urgency", "Urg")]
+
+    def test_contexts(self) -> None:
+        config = Config(self.SHOW_OUTPUT + "\ncontext home")
+
+        assert config.contexts == {
+            "home": ContextInfo(name="home", read_filter="project:Home", is_active=True),
+            "work": ContextInfo(name="work", read_filter="project:Work", is_active=False),
+        }
+
+    def test_udas(self) -> None:
+        config = Config(self.SHOW_OUTPUT)
+
+        assert config.udas == {
+            "estimate": UdaConfig("estimate", type="duration", label="Est"),
+            "priority": UdaConfig("priority", values=("H", "M", "L", "")),
+        }
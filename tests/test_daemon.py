@@ -0,0 +1,144 @@
+import asyncio
+import os
+import socket
+import tempfile
+from datetime import datetime
+from pathlib import Path
+from uuid import UUID
+
+import pytest
+
+from task_tui.config import Config
+from task_tui.daemon import TaskDaemon, check_socket, default_socket_path, fetch_report
+from task_tui.data_models import ContextInfo, Status, Task
+from task_tui.exceptions import DaemonError
+from task_tui.task_cli import AsyncTaskCli
+
+CONFIG = "report.next.columns id,description\nreport.next.labels ID,Description\ncontext work\ncontext.work.read project:Work"
+
+
+def make_task(task_id: int) -> Task:
+    timestamp = datetime(2024, 1, 1, 12, 0, 0)
+    return Task(
+        id=task_id,
+        description=f"task {task_id}",
+        entry=timestamp,
+        modified=timestamp,
+        status=Status.PENDING,
+        uuid=UUID(int=task_id),
+        urgency=float(task_id),
+        project="Work",
+    )
+
+
+class FakeTaskCli(AsyncTaskCli):
+    """Answers like taskwarrior would, without running it, and remembers the exports."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.exports: list[tuple[str | None, str | None]] = []
+
+    async def get_config(self) -> Config:
+        self.config = Config(CONFIG)
+        return self.config
+
+    async def get_context(self) -> ContextInfo | None:
+        return ContextInfo(name="work", read_filter="project:Work", is_active=True)
+
+    async def export_tasks(self, report: str | None = None, read_filter: str | None = None, modified_after: datetime | None = None) -> list[Task]:
+        self.exports.append((report, read_filter))
+        # long enough for the requests of several TUIs to arrive meanwhile
+        await asyncio.sleep(0.05)
+        return [make_task(1), make_task(2)]
+
+
+@pytest.fixture()
+def data_dir(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    data_dir = tmp_path / "data"
+    data_dir.mkdir()
+    (data_dir / "taskchampion.sqlite3").write_bytes(b"")
+    monkeypatch.setenv("TASKRC", str(tmp_path / "taskrc"))
+    monkeypatch.setenv("TASKDATA", str(data_dir))
+    return data_dir
+
+
+def test_clients_share_the_exports_of_the_daemon(data_dir: Path, tmp_path: Path) -> None:
+    cli = FakeTaskCli()
+    socket_path = tmp_path / "task-tui.sock"
+
+    async def run() -> None:
+        server = asyncio.create_task(TaskDaemon(cli).serve(socket_path))
+        while not socket_path.exists():
+            await asyncio.sleep(0.01)
+
+        reports = await asyncio.gather(*(fetch_report(socket_path, "next") for _ in range(3)))
+
+        # the TUIs apply the filter of the context themselves
+        assert cli.exports == [("next", "")]
+        for report in reports:
+            assert report.tasks == [make_task(1), make_task(2)]
+            assert report.headings == [("id", "ID"), ("description", "Description")]
+            assert report.context == ContextInfo(name="work", read_filter="project:Work", is_active=True)
+            assert report.config.settings["context"] == "work"
+            assert report.read_filter == ""
+
+        # taskwarrior wrote to the data directory, so the report is exported again
+        os.utime(data_dir / "taskchampion.sqlite3", ns=(0, 1))
+        await fetch_report(socket_path, "next")
+        assert len(cli.exports) == 2
+
+        with pytest.raises(DaemonError, match="columns of report missing"):
+            await fetch_report(socket_path, "missing")
+        with pytest.raises(DaemonError, match="reads tasks from task"):
+            await fetch_report(socket_path, "next", data_source="taskchampion")
+
+        server.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await server
+        assert not socket_path.exists()
+
+    asyncio.run(run())
+
+
+def test_fetching_without_a_daemon_fails(tmp_path: Path) -> None:
+    with pytest.raises(DaemonError, match="No daemon"):
+        asyncio.run(fetch_report(tmp_path / "task-tui.sock", "next"))
+
+
+def test_the_daemon_is_only_trusted_on_a_private_socket(data_dir: Path, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.delenv("XDG_RUNTIME_DIR", raising=False)
+    monkeypatch.setattr(tempfile, "tempdir", str(tmp_path))
+    socket_path = default_socket_path()
+    assert socket_path == tmp_path / f"task-tui-{os.getuid()}" / "task-tui.sock"
+
+    async def run() -> None:
+        server = asyncio.create_task(TaskDaemon(FakeTaskCli()).serve(socket_path))
+        while not socket_path.exists():
+            await asyncio.sleep(0.01)
+        # the directory in the temporary directory is created for the user alone
+        assert socket_path.parent.stat().st_mode & 0o777 == 0o700
+        assert socket_path.stat().st_mode & 0o777 == 0o600
+        check_socket(socket_path)
+        server.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await server
+
+    asyncio.run(run())
+
+    # someone else could connect to a socket others may access, or have left it behind
+    shared_path = tmp_path / "shared.sock"
+    with socket.socket(socket.AF_UNIX) as shared_socket:
+        shared_socket.bind(str(shared_path))
+        shared_path.chmod(0o666)
+        with pytest.raises(DaemonError, match="only the user may access"):
+            asyncio.run(fetch_report(shared_path, "next"))
+        with pytest.raises(DaemonError, match="only the user may access"):
+            asyncio.run(TaskDaemon(FakeTaskCli()).serve(shared_path))
+        assert shared_path.exists()
+
+    # others may replace the socket in a directory they can write to
+    shared_dir = tmp_path / "shared"
+    shared_dir.mkdir()
+    shared_dir.chmod(0o777)
+    with pytest.raises(DaemonError, match="Others may replace"):
+        asyncio.run(TaskDaemon(FakeTaskCli()).serve(shared_dir / "task-tui.sock"))
@@ -0,0 +1,185 @@
+import asyncio
+import json
+import sqlite3
+from contextlib import aclosing
+from datetime import UTC, datetime
+from pathlib import Path
+from types import SimpleNamespace
+from uuid import UUID
+
+import pytest
+
+from task_tui.config import Config
+from task_tui.data_models import Annotation, Status, Task
+from task_tui.data_sources import REPLICA_FILE_NAME, TaskChampionSource
+from task_tui.task_cli import AsyncTaskCli
+
+ENTRY = int(datetime(2024, 1, 1, tzinfo=UTC).timestamp())
+MODIFIED = int(datetime(2024, 1, 2, tzinfo=UTC).timestamp())
+FIRST_UUID = "00000000-0000-0000-0000-000000000001"
+SECOND_UUID = "00000000-0000-0000-0000-000000000002"
+
+
+def write_replica(path: Path, tasks: dict[str, dict[str, str]], working_set: list[str]) -> None:
+    connection = sqlite3.connect(path)
+    connection.execute("CREATE TABLE tasks (uuid STRING PRIMARY KEY, data STRING)")
+    connection.execute("CREATE TABLE working_set (id INTEGER PRIMARY KEY, uuid STRING)")
+    connection.executemany("INSERT INTO tasks VALUES (?, ?)", [(uuid, json.dumps(data)) for uuid, data in tasks.items()])
+    connection.executemany("INSERT INTO working_set VALUES (?, ?)", list(enumerate(working_set, start=1)))
+    connection.commit()
+    connection.close()
+
+
+@pytest.fixture()
+def replica_dir(tmp_path: Path) -> Path:
+    write_replica(
+        tmp_path / REPLICA_FILE_NAME,
+        {
+            FIRST_UUID: {
+                "description": "Write docs",
+                "status": "pending",
+                "entry": str(ENTRY),
+                "modified": str(MODIFIED),
+                "project": "alpha",
+                "priority": "H",
+                "tag_home": "",
+                "tag_next": "",
+                f"dep_{SECOND_UUID}": "",
+                f"annotation_{MODIFIED}": "second note",
+                f"annotation_{ENTRY}": "first note",
+                "estimate": "2h",
+            },
+            SECOND_UUID: {
+                "description": "Ship release",
+                "status": "completed",
+                "entry": str(ENTRY),
+                "modified": str(ENTRY),
+                "end": str(ENTRY),
+            },
+        },
+        working_set=[FIRST_UUID],
+    )
+    return tmp_path
+
+
+def test_replica_is_decoded_into_tasks(replica_dir: Path) -> None:
+    source = TaskChampionSource(replica_dir / REPLICA_FILE_NAME)
+
+    tasks = {str(task.uuid): task for task in source.export("all", "", None)}
+
+    first = tasks[FIRST_UUID]
+    assert first.id == 1
+    assert first.description == "Write docs"
+    assert first.status == Status.PENDING
+    assert first.entry == datetime(2024, 1, 1, tzinfo=UTC)
+    assert first.project == "alpha"
+    assert first.priority == "H"
+    assert first.tags == {"home", "next"}
+    assert first.depends == {UUID(SECOND_UUID)}
+    assert first.annotations == [
+        Annotation(entry=datetime(2024, 1, 1, tzinfo=UTC), description="first note"),
+        Annotation(entry=datetime(2024, 1, 2, tzinfo=UTC), description="second note"),
+    ]
+    assert first.model_extra == {"estimate": "2h"}
+    second = tasks[SECOND_UUID]
+    assert second.id == 0
+    assert second.status == Status.COMPLETED
+
+
+def test_future_wait_is_reported_as_waiting(tmp_path: Path) -> None:
+    write_replica(
+        tmp_path / REPLICA_FILE_NAME,
+        {FIRST_UUID: {"description": "later", "status": "pending", "entry": str(ENTRY), "modified": str(ENTRY), "wait": "4102444800"}},
+        working_set=[FIRST_UUID],
+    )
+
+    [task] = TaskChampionSource(tmp_path / REPLICA_FILE_NAME).export(None, "", None)
+
+    assert task.status == Status.WAITING
+
+
+def test_modified_after_filters_tasks(replica_dir: Path) -> None:
+    source = TaskChampionSource(replica_dir / REPLICA_FILE_NAME)
+
+    tasks = source.export(None, "", datetime(2024, 1, 1, 12, tzinfo=UTC))
+
+    assert [str(task.uuid) for task in tasks] == [FIRST_UUID]
+
+
+def test_only_unfiltered_exports_are_supported(replica_dir: Path) -> None:
+    source = TaskChampionSource(replica_dir / REPLICA_FILE_NAME)
+
+    assert source.supports("all", "", None)
+    assert source.supports(None, "", None)
+    assert not source.supports("next", "", None)
+    assert not source.supports("all", "project:Work", None)
+
+
+def test_from_config_finds_replica(replica_dir: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.delenv("TASKDATA", raising=False)
+
+    source = TaskChampionSource.from_config(Config(f"data.location {replica_dir}"))
+
+    assert source is not None
+    assert source.replica_path == replica_dir / REPLICA_FILE_NAME
+    assert TaskChampionSource.from_config(Config(f"data.location {replica_dir / 'missing'}")) is None
+
+
+def test_task_cli_prefers_data_source_and_falls_back(replica_dir: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    calls: list[tuple[str, ...]] = []
+
+    async def fake_run(self: AsyncTaskCli, *args: str) -> SimpleNamespace:
+        calls.append(args)
+        return SimpleNamespace(stdout="", returncode=0)
+
+    monkeypatch.setattr(AsyncTaskCli, "_run_task", fake_run, raising=False)
+    cli = AsyncTaskCli()
+    cli.data_sources = [TaskChampionSource(replica_dir / REPLICA_FILE_NAME)]
+
+    all_tasks = asyncio.run(cli.export_tasks("all", read_filter=""))
+    assert len(all_tasks) == 2
+    assert calls == []
+
+    asyncio.run(cli.export_tasks("next", read_filter=""))
+    assert calls == [("rc.json.array=1", "rc.defaultheight=0", "export", "next")]
+
+    calls.clear()
+    cli.data_sources = [TaskChampionSource(replica_dir / "missing.sqlite3")]
+    asyncio.run(cli.export_tasks("all", read_filter=""))
+    assert calls == [("rc.json.array=1", "rc.defaultheight=0", "export", "all")]
+
+
+class FailingSource:
+    name = "failing"
+
+    def supports(self, report: str | None, read_filter: str, modified_after: datetime | None) -> bool:
+        return True
+
+    def export(self, report: str | None, read_filter: str, modified_after: datetime | None) -> list[Task]:
+        raise sqlite3.OperationalError("database is locked")
+
+
+def test_streamed_exports_fall_back_when_the_data_source_fails(tmp_path: Path) -> None:
+    fake_task = tmp_path / "task"
+    task_json = json.dumps(
+        {
+            "id": 7,
+            "description": "from the CLI",
+            "entry": "2024-01-01T00:00:00",
+            "modified": "2024-01-01T00:00:00",
+            "status": "pending",
+            "uuid": FIRST_UUID,
+            "urgency": 0.0,
+        }
+    )
+    fake_task.write_text(f"#!/bin/sh\necho '{task_json}'\n")
+    fake_task.chmod(0o755)
+    async_cli = AsyncTaskCli()
+    async_cli.base_command = str(fake_task)
+    async_cli.data_sources = [FailingSource()]
+
+    async def stream() -> list[Task]:
+        async with aclosing(async_cli.stream_tasks("next", read_filter="")) as tasks:
+            return [task async for task in tasks]
+
+    assert [task.description for task in asyncio.run(stream())] == ["from the CLI"]
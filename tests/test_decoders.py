@@ -0,0 +1,53 @@
+import gc
+from datetime import UTC, datetime
+from uuid import UUID
+
+import pytest
+
+from task_tui.data_models import Status
+from task_tui.decoders import available_decoders, get_decoder
+
+TASK_LINES = [
+    '{"id":1,"description":"first","entry":"20240101T120000Z","modified":"20240102T000000Z","due":"20240105T080000Z",'
+    '"status":"pending","uuid":"00000000-0000-0000-0000-000000000001","urgency":2.5,"tags":["next"],'
+    '"annotations":[{"entry":"20240101T130000Z","description":"note"}],"estimate":"2h"}',
+    '{"id":0,"description":"second","entry":"20240101T120000Z","modified":"20240101T120000Z","end":"20240101T120000Z",'
+    '"status":"completed","uuid":"00000000-0000-0000-0000-000000000002","urgency":0,'
+    '"depends":["00000000-0000-0000-0000-000000000001"]}',
+]
+# `task export` with `rc.json.array=1` writes one task per line between the brackets
+TASK_ARRAY = "[\n" + ",\n".join(TASK_LINES) + "\n]\n"
+
+
+@pytest.mark.parametrize("name", available_decoders())
+def test_decoders_parse_array_and_lines_alike(name: str) -> None:
+    decoder = get_decoder(name)
+
+    from_array = decoder.decode_array(TASK_ARRAY)
+    from_lines = [decoder.decode_line(line) for line in TASK_LINES]
+
+    assert from_array == from_lines
+    first, second = from_array
+    assert first.entry == datetime(2024, 1, 1, 12, tzinfo=UTC)
+    assert first.due == datetime(2024, 1, 5, 8, tzinfo=UTC)
+    assert first.annotations is not None and first.annotations[0].entry == datetime(2024, 1, 1, 13, tzinfo=UTC)
+    assert first.tags == {"next"}
+    assert first.model_extra == {"estimate": "2h"}
+    assert second.status == Status.COMPLETED
+    assert second.depends == {UUID(int=1)}
+
+
+@pytest.mark.parametrize("name", available_decoders())
+def test_decoders_accept_bytes_and_empty_exports(name: str) -> None:
+    decoder = get_decoder(name)
+
+    assert len(decoder.decode_array(TASK_ARRAY.encode())) == 2
+    assert decoder.decode_array("") == []
+    assert decoder.decode_array("[\n]\n") == []
+    assert gc.isenabled()
+
+
+def test_get_decoder_rejects_unknown_decoder() -> None:
+    assert get_decoder().name == "pydantic"
+    with pytest.raises(ValueError, match="Unknown or unavailable decoder"):
+        get_decoder("simdjson")
@@ -0,0 +1,75 @@
+from datetime import datetime
+from uuid import UUID
+
+from task_tui.data_models import Status, Task
+from task_tui.dependencies import DependencyGraph
+
+
+def make_task(number: int, *depends: int, status: Status = Status.PENDING) -> Task:
+    timestamp = datetime(2024, 1, 1, 12, 0, 0)
+    return Task(
+        id=number,
+        description=f"task {number}",
+        entry=timestamp,
+        modified=timestamp,
+        status=status,
+        uuid=UUID(int=number),
+        urgency=0.0,
+        depends={UUID(int=dependency) for dependency in depends},
+    )
+
+
+def uuids(*numbers: int) -> set[UUID]:
+    return {UUID(int=number) for number in numbers}
+
+
+def test_blocked_and_blocking_only_count_open_tasks() -> None:
+    # 2 depends on 1, 3 depends on the completed task 4 and 5 depends on a task outside of the graph
+    graph = DependencyGraph([make_task(1), make_task(2, 1), make_task(3, 4), make_task(4, status=Status.COMPLETED), make_task(5, 6)])
+
+    assert graph.blocked() == uuids(2)
+    assert graph.blocking() == uuids(1)
+    assert graph.is_blocked(UUID(int=2)) and not graph.is_blocked(UUID(int=3))
+    assert graph.missing_dependencies() == {UUID(int=5): uuids(6)}
+
+
+def test_changing_one_task_updates_both_directions() -> None:
+    graph = DependencyGraph([make_task(1), make_task(2), make_task(3, 1)])
+
+    graph.set_task(make_task(3, 2))
+
+    assert graph.dependents(UUID(int=1)) == frozenset()
+    assert graph.dependents(UUID(int=2)) == uuids(3)
+    assert graph.blocking() == uuids(2)
+    assert graph.neighbourhood([UUID(int=3)]) == uuids(2, 3)
+
+    graph.remove_task(UUID(int=2))
+
+    assert graph.blocked() == set()
+    assert graph.missing_dependencies() == {UUID(int=3): uuids(2)}
+
+
+def test_transitive_queries() -> None:
+    # 4 -> 3 -> 2 -> 1 and 5 -> 2
+    graph = DependencyGraph([make_task(1), make_task(2, 1), make_task(3, 2), make_task(4, 3), make_task(5, 2)])
+
+    assert graph.unblocks(UUID(int=1)) == uuids(2, 3, 4, 5)
+    assert graph.unblocks(UUID(int=3)) == uuids(4)
+    assert graph.transitive_dependencies(UUID(int=4)) == uuids(1, 2, 3)
+
+
+def test_cycles_are_found() -> None:
+    graph = DependencyGraph([make_task(1, 3), make_task(2, 1), make_task(3, 2), make_task(4, 1), make_task(5, 5)])
+
+    cycles = sorted((set(cycle) for cycle in graph.find_cycles()), key=len)
+
+    assert cycles == [uuids(5), uuids(1, 2, 3)]
+    # the traversal terminates on cycles as well
+    assert graph.unblocks(UUID(int=1)) == uuids(2, 3, 4)
+
+
+def test_long_chains_dont_hit_the_recursion_limit() -> None:
+    graph = DependencyGraph([make_task(1), *(make_task(number, number - 1) for number in range(2, 5000))])
+
+    assert graph.find_cycles() == []
+    assert len(graph.unblocks(UUID(int=1))) == 4998
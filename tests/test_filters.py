@@ -0,0 +1,92 @@
+from datetime import datetime, timedelta
+from uuid import UUID
+
+import pytest
+
+from task_tui.data_models import Status, Task, VirtualTag
+from task_tui.exceptions import UnsupportedFilterError
+from task_tui.filters import FilterIndex, parse_filter, resolve_named_date
+
+# a Wednesday
+NOW = datetime(2024, 1, 10, 12, 0, 0).astimezone()
+
+
+def make_task(
+    task_id: int,
+    *,
+    project: str | None = None,
+    tags: set[str] | None = None,
+    status: Status = Status.PENDING,
+    due: datetime | None = None,
+    virtual_tags: set[VirtualTag] | None = None,
+) -> Task:
+    return Task(
+        id=task_id,
+        description=f"task {task_id}",
+        entry=NOW - timedelta(days=30),
+        modified=NOW,
+        due=due,
+        status=status,
+        uuid=UUID(int=task_id),
+        urgency=0.0,
+        project=project,
+        tags=tags or set(),
+        virtual_tags=virtual_tags or set(),
+    )
+
+
+TASKS = [
+    make_task(1, project="Home", tags={"next"}, due=NOW - timedelta(days=1), virtual_tags={VirtualTag.OVERDUE}),
+    make_task(2, project="Home.Garden", due=NOW + timedelta(hours=2), virtual_tags={VirtualTag.BLOCKED}),
+    make_task(3, project="Homework", tags={"next", "school"}, due=NOW + timedelta(days=6)),
+    make_task(4, project="Work", status=Status.WAITING, virtual_tags={VirtualTag.WAITING}),
+    make_task(5, status=Status.COMPLETED, due=NOW + timedelta(days=40)),
+]
+
+
+@pytest.mark.parametrize(
+    "text,expected",
+    [
+        ("", {1, 2, 3, 4, 5}),
+        ("project:Home", {1, 2}),
+        ("pro:Home.Garden", {2}),
+        ("project:", {5}),
+        ("project.not:Home", {3, 4, 5}),
+        ("+next", {1, 3}),
+        ("-next -WAITING", {2, 5}),
+        ("+next or project:Work", {1, 3, 4}),
+        ("status:pending +UNBLOCKED", {1, 3}),
+        ("not ( +next or status:completed )", {2, 4}),
+        ("(+OVERDUE or +BLOCKED) and project:Home", {1, 2}),
+        ("due.before:tomorrow", {1, 2}),
+        ("due.after:today and due.by:eow", {2}),
+        ("due.after:eow", {3, 5}),
+        ("due:today", {2}),
+        ("due.none: limit:page", {4}),
+        ("due.after:eom", {5}),
+        ("due.before:2024-01-11", {1, 2}),
+    ],
+)
+def test_indexed_selection_matches_per_task_evaluation(text: str, expected: set[int]) -> None:
+    task_filter = parse_filter(text, NOW)
+
+    selected = task_filter.select(FilterIndex(TASKS))
+
+    assert selected == {UUID(int=task_id) for task_id in expected}
+    assert {task.uuid for task in TASKS if task_filter.matches(task)} == selected
+
+
+@pytest.mark.parametrize(
+    "text",
+    ["description", "due.before:today+2d", "+READY", "urgency.over:5", "project:Home xor +next", "(project:Home", "status:done", "pr:Home"],
+)
+def test_unsupported_filters_are_rejected(text: str) -> None:
+    with pytest.raises(UnsupportedFilterError):
+        parse_filter(text, NOW)
+
+
+def test_named_dates() -> None:
+    assert resolve_named_date("sow", NOW, "monday") == datetime(2024, 1, 15).astimezone()
+    assert resolve_named_date("socw", NOW) == datetime(2024, 1, 7).astimezone()
+    assert resolve_named_date("eom", NOW) == datetime(2024, 1, 31, 23, 59, 59).astimezone()
+    assert resolve_named_date("soy", NOW) == datetime(2025, 1, 1).astimezone()
@@ -0,0 +1,26 @@
+from datetime import UTC, datetime, timedelta
+from uuid import UUID
+
+from task_tui.live_ages import LiveAgeSchedule
+
+NOW = datetime(2024, 1, 10, 12, 0, 0, tzinfo=UTC)
+
+
+def test_cells_come_due_in_order_and_rescheduling_replaces_the_old_time() -> None:
+    schedule = LiveAgeSchedule()
+    first, second = UUID(int=1), UUID(int=2)
+    # "3min" ago becomes "4min" in 50 seconds, "2h" ahead becomes "1h" in 30 minutes
+    schedule.schedule_column("entry", [(first, -190.0), (second, None)], NOW)
+    schedule.schedule(second, "due", NOW + timedelta(hours=2, minutes=30), NOW)
+    schedule.schedule(second, "entry", None, NOW)
+
+    assert len(schedule) == 2
+    assert schedule.next_deadline() == (NOW + timedelta(seconds=50)).timestamp()
+    assert schedule.pop_due(NOW + timedelta(seconds=49)) == []
+    assert schedule.pop_due(NOW + timedelta(seconds=50)) == [(first, "entry")]
+
+    # the due date moved to "5h" ahead, which becomes "4h" in 10 minutes, the old entry of the cell is outdated
+    schedule.schedule(second, "due", NOW + timedelta(hours=5, minutes=10), NOW)
+    assert schedule.pop_due(NOW + timedelta(minutes=5)) == []
+    assert schedule.pop_due(NOW + timedelta(minutes=11)) == [(second, "due")]
+    assert schedule.next_deadline() is None
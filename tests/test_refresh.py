@@ -0,0 +1,194 @@
+import asyncio
+from datetime import datetime
+from uuid import uuid4
+
+import pytest
+
+import task_tui.refresh as refresh_mod
+from task_tui.data_models import Status, Task
+from task_tui.refresh import RefreshPipeline, RefreshRequest, RefreshScheduler, SyncState
+
+
+def test_independent_phases_run_concurrently() -> None:
+    async def slow(value: str) -> str:
+        await asyncio.sleep(0.1)
+        return value
+
+    pipeline = RefreshPipeline()
+    pipeline.add_phase("context", lambda: slow("ctx"))
+    pipeline.add_phase("columns", lambda: slow("cols"))
+    pipeline.add_phase("config", lambda: slow("cfg"))
+
+    async def run() -> tuple[dict[str, object], float]:
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        results = await pipeline.run()
+        return results, loop.time() - started
+
+    results, elapsed = asyncio.run(run())
+
+    assert results == {"context": "ctx", "columns": "cols", "config": "cfg"}
+    assert elapsed < 0.25
+    assert sorted(t.name for t in pipeline.timings) == ["columns", "config", "context"]
+
+
+def test_dependent_phase_receives_results_and_waits() -> None:
+    order: list[str] = []
+
+    async def context() -> str:
+        await asyncio.sleep(0.05)
+        order.append("context")
+        return "project:Work"
+
+    async def export(read_filter: str) -> list[str]:
+        order.append("export")
+        return [read_filter]
+
+    pipeline = RefreshPipeline()
+    pipeline.add_phase("context", context)
+    pipeline.add_phase("export", export, depends_on=("context",))
+
+    results = asyncio.run(pipeline.run())
+
+    assert results["export"] == ["project:Work"]
+    assert order == ["context", "export"]
+    export_timing = next(t for t in pipeline.timings if t.name == "export")
+    assert export_timing.started >= 0.05
+
+
+def test_unknown_or_duplicate_phases_are_rejected() -> None:
+    async def noop() -> None:
+        return None
+
+    pipeline = RefreshPipeline()
+    pipeline.add_phase("context", noop)
+    with pytest.raises(ValueError, match="already part"):
+        pipeline.add_phase("context", noop)
+    with pytest.raises(ValueError, match="unknown phase"):
+        pipeline.add_phase("export", noop, depends_on=("columns",))
+
+
+def test_failing_phase_propagates_original_error() -> None:
+    async def fail() -> None:
+        raise ValueError("task show failed")
+
+    async def hang() -> None:
+        await asyncio.sleep(10)
+
+    pipeline = RefreshPipeline()
+    pipeline.add_phase("columns", fail)
+    pipeline.add_phase("context", hang)
+
+    with pytest.raises(ValueError, match="task show failed"):
+        asyncio.run(pipeline.run())
+
+
+def test_sync_state_tracks_high_water_mark(monkeypatch: pytest.MonkeyPatch) -> None:
+    clock = [1000.0]
+    monkeypatch.setattr(refresh_mod.time, "monotonic", lambda: clock[0])
+    state = SyncState(full_resync_interval=60.0)
+    assert state.full_sync_due()
+    assert state.modified_after() is None
+
+    state.record_full_sync([_task(datetime(2024, 1, 1, 8)), _task(datetime(2024, 1, 1, 9))])
+    assert not state.full_sync_due()
+    assert state.modified_after() == datetime(2024, 1, 1, 8, 59, 59)
+
+    state.record_incremental_sync([])
+    assert state.high_water == datetime(2024, 1, 1, 9)
+    state.record_incremental_sync([_task(datetime(2024, 1, 1, 10))])
+    assert state.high_water == datetime(2024, 1, 1, 10)
+    assert (state.full_syncs, state.incremental_syncs) == (1, 2)
+
+    clock[0] += 61.0
+    assert state.full_sync_due()
+
+    state.record_full_sync([])
+    state.invalidate()
+    assert state.full_sync_due()
+
+
+def _task(modified: datetime) -> Task:
+    return Task(
+        id=1,
+        description="task",
+        entry=modified.isoformat(),
+        modified=modified.isoformat(),
+        status=Status.PENDING,
+        uuid=uuid4(),
+        urgency=0.0,
+    )
+
+
+def test_burst_of_requests_is_merged_into_one_refresh() -> None:
+    refreshes: list[RefreshRequest] = []
+
+    async def refresh(request: RefreshRequest) -> None:
+        refreshes.append(request)
+
+    scheduler = RefreshScheduler(refresh, debounce=0.01)
+
+    async def run() -> None:
+        starts = [
+            scheduler.request(RefreshRequest(select_task_id=3)),
+            scheduler.request(RefreshRequest(full=True)),
+            scheduler.request(RefreshRequest()),
+        ]
+        assert starts == [True, False, False]
+        await scheduler.drain()
+
+    asyncio.run(run())
+
+    assert refreshes == [RefreshRequest(select_task_id=3, full=True)]
+    assert (scheduler.requested, scheduler.executed, scheduler.cancelled) == (3, 1, 0)
+
+
+def test_request_cancels_stale_refresh_and_runs_one_at_a_time() -> None:
+    started: list[RefreshRequest] = []
+    finished: list[RefreshRequest] = []
+    running = 0
+    max_running = 0
+
+    async def refresh(request: RefreshRequest) -> None:
+        nonlocal running, max_running
+        started.append(request)
+        running += 1
+        max_running = max(max_running, running)
+        try:
+            await asyncio.sleep(0.1)
+            finished.append(request)
+        finally:
+            running -= 1
+
+    scheduler = RefreshScheduler(refresh, debounce=0.01)
+
+    async def run() -> None:
+        scheduler.request(RefreshRequest(select_task_id=1, full=True))
+        drain = asyncio.create_task(scheduler.drain())
+        await asyncio.sleep(0.05)
+        # the export of the first refresh is running and becomes stale
+        assert not scheduler.request(RefreshRequest(select_task_id=2))
+        await drain
+
+    asyncio.run(run())
+
+    assert started == [RefreshRequest(1, True), RefreshRequest(2, True)]
+    assert finished == [RefreshRequest(2, True)]
+    assert max_running == 1
+    assert (scheduler.requested, scheduler.executed, scheduler.cancelled) == (2, 1, 1)
+
+
+def test_failed_refresh_is_raised_and_allows_new_drain() -> None:
+    async def refresh(request: RefreshRequest) -> None:
+        raise RuntimeError("export failed")
+
+    scheduler = RefreshScheduler(refresh, debounce=0)
+
+    async def run() -> None:
+        scheduler.request(RefreshRequest())
+        with pytest.raises(RuntimeError, match="export failed"):
+            await scheduler.drain()
+
+    asyncio.run(run())
+
+    assert scheduler.request(RefreshRequest())
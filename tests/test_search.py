@@ -0,0 +1,72 @@
+from datetime import datetime
+from uuid import UUID
+
+import pytest
+
+from task_tui.data_models import Annotation, Status, Task
+from task_tui.search import SearchIndex
+
+
+def make_task(task_id: int, description: str, annotations: list[str] | None = None) -> Task:
+    timestamp = datetime(2024, 1, 1, 12, 0, 0)
+    return Task(
+        id=task_id,
+        description=description,
+        entry=timestamp,
+        modified=timestamp,
+        status=Status.PENDING,
+        uuid=UUID(int=task_id),
+        urgency=0.0,
+        annotations=None if annotations is None else [Annotation(description=text) for text in annotations],
+    )
+
+
+TASKS = {
+    "1": make_task(1, "Write the Quarterly report"),
+    "2": make_task(2, "Call the plumber", ["ask about the report"]),
+    "3": make_task(3, "Report bug in parser", ["see https://example.com/issues/42"]),
+    "4": make_task(4, "Pay rent"),
+}
+
+
+@pytest.mark.parametrize(
+    "query,expected",
+    [
+        ("report", {"1", "2", "3"}),
+        ("REPORT", {"1", "2", "3"}),
+        ("port", {"1", "2", "3"}),
+        ("e", {"1", "2", "3", "4"}),
+        ("nt", {"4"}),
+        ("the report", {"2"}),
+        ("quarterly report", {"1"}),
+        ("report bug", {"3"}),
+        # several words have to follow each other as in the query
+        ("report the", set()),
+        ("issues/42", {"3"}),
+        # the description and the annotations are searched separately
+        ("plumber ask", set()),
+        ("missing", set()),
+        ("   ", set()),
+    ],
+)
+def test_search(query: str, expected: set[str]) -> None:
+    index = SearchIndex(TASKS.items())
+
+    assert index.search(query) == expected
+
+
+def test_changed_and_removed_tasks_are_reindexed() -> None:
+    index = SearchIndex(TASKS.items())
+
+    index.set_task("4", make_task(4, "Pay rent", ["report sent"]))
+    index.set_task("1", make_task(1, "Write the yearly summary"))
+    index.remove_task("3")
+    index.set_task("5", make_task(5, "Read the reports"))
+
+    assert index.search("report") == {"2", "4", "5"}
+    assert index.search("quarterly") == set()
+    assert index.search("yearly") == {"1"}
+    assert index.search("parser") == set()
+    assert len(index) == 4
+    # words that no task contains anymore are dropped from the vocabulary
+    assert "quarterly" not in index._keys_by_word
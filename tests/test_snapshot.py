@@ -0,0 +1,102 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from uuid import UUID
+
+import pytest
+
+from task_tui.config import Config
+from task_tui.data_models import Status, Task, VirtualTag
+from task_tui.snapshot import Snapshot, default_snapshot_path, load_snapshot, save_snapshot
+
+HEADINGS = [("id", "ID"), ("description", "Description")]
+
+
+def make_task(task_id: int) -> Task:
+    timestamp = datetime(2024, 1, 1, 12, 0, 0)
+    return Task.model_validate(
+        {
+            "id": task_id,
+            "description": f"task {task_id}",
+            "entry": timestamp,
+            "modified": timestamp,
+            "status": Status.PENDING,
+            "uuid": UUID(int=task_id),
+            "urgency": float(task_id),
+            "tags": {"next"},
+            "virtual_tags": {VirtualTag.TAGGED},
+            # a UDA
+            "estimate": "2h",
+        }
+    )
+
+
+@pytest.fixture()
+def data_dir(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    taskrc = tmp_path / "taskrc"
+    taskrc.write_text("weekstart monday\n")
+    data_dir = tmp_path / "data"
+    data_dir.mkdir()
+    (data_dir / "taskchampion.sqlite3").write_bytes(b"")
+    monkeypatch.setenv("TASKRC", str(taskrc))
+    monkeypatch.setenv("TASKDATA", str(data_dir))
+    return data_dir
+
+
+def test_snapshot_round_trip(data_dir: Path, tmp_path: Path) -> None:
+    path = tmp_path / "cache" / "next.task.snapshot"
+    tasks = [make_task(1), make_task(2)]
+
+    save_snapshot(path, Snapshot(tasks, Config("report.next.sort urgency-\ncontext"), HEADINGS))
+    snapshot = load_snapshot(path)
+
+    assert snapshot is not None
+    assert snapshot.headings == HEADINGS
+    assert snapshot.config.report_sorts == {"next": "urgency-"}
+    assert snapshot.config.settings["context"] == ""
+    # the virtual tags are recomputed by the store
+    assert snapshot.tasks == [task.model_copy(update={"virtual_tags": set()}) for task in tasks]
+    assert snapshot.tasks[0].model_extra == {"estimate": "2h"}
+
+
+@pytest.mark.parametrize("changed_file", ["taskrc", "data/taskchampion.sqlite3", "data/new.data"])
+def test_snapshot_is_outdated_after_taskwarrior_wrote(data_dir: Path, tmp_path: Path, changed_file: str) -> None:
+    path = tmp_path / "next.task.snapshot"
+    save_snapshot(path, Snapshot([make_task(1)], Config(""), HEADINGS))
+
+    changed_path = tmp_path / changed_file
+    changed_path.touch()
+    os.utime(changed_path, ns=(0, 1))
+
+    assert load_snapshot(path) is None
+
+
+def test_missing_or_unreadable_snapshots_are_ignored(data_dir: Path, tmp_path: Path) -> None:
+    path = tmp_path / "next.task.snapshot"
+    assert load_snapshot(path) is None
+
+    path.write_bytes(b"not a snapshot")
+    assert load_snapshot(path) is None
+
+
+def test_snapshots_are_cached_by_report(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+
+    assert default_snapshot_path("next", "task") == tmp_path / "task-tui" / "next.task.snapshot"
+
+
+def test_concurrent_saves_leave_a_complete_snapshot(data_dir: Path, tmp_path: Path) -> None:
+    path = tmp_path / "cache" / "next.task.snapshot"
+    config = Config("report.next.sort urgency-")
+    snapshots = [Snapshot([make_task(task_id) for task_id in range(1, 200)], config, HEADINGS) for _ in range(8)]
+
+    # e.g. several TUI panes showing the same report
+    with ThreadPoolExecutor(len(snapshots)) as executor:
+        list(executor.map(lambda snapshot: save_snapshot(path, snapshot), snapshots))
+
+    snapshot = load_snapshot(path)
+    assert snapshot is not None
+    assert len(snapshot.tasks) == 199
+    # no temporary file is left behind
+    assert list(path.parent.iterdir()) == [path]
@@ -0,0 +1,18 @@
+from task_tui.sorting import SortKey, parse_sort, priority_ranks
+
+
+def test_sort_setting_is_parsed() -> None:
+    assert parse_sort("project+/,urgency-, description") == [
+        SortKey("project", descending=False, group_break=True),
+        SortKey("urgency", descending=True),
+        SortKey("description"),
+    ]
+    assert parse_sort("") == []
+    assert [str(key) for key in parse_sort("project+/,urgency-")] == ["project+/", "urgency-"]
+
+
+def test_priorities_rank_from_lowest_to_highest() -> None:
+    ranks = priority_ranks(["H", "M", "L", ""])
+
+    assert ranks["H"] > ranks["M"] > ranks["L"] > ranks[None]
+    assert priority_ranks(["high", "low"])[None] < priority_ranks(["high", "low"])["low"]
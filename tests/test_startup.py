@@ -0,0 +1,57 @@
+import os
+import re
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+SRC_DIR = Path(__file__).parent.parent / "src"
+# `-X importtime` writes `import time: <self us> | <cumulative us> | <module>`, indenting the module by its nesting
+IMPORT_TIME_LINE = re.compile(r"^import time:\s+\d+ \|\s+(\d+) \|( +)(\S+)$")
+
+# the total import time of each command in ms, a few times what they take on a laptop, so that only a regression such
+# as importing Textual again fails and not a slow machine
+IMPORT_BUDGETS = {
+    "--help": 600,
+    "health": 900,
+}
+# modules that the command must not import at all
+FORBIDDEN_IMPORTS = {
+    "--help": {"textual", "pydantic"},
+    "health": {"textual"},
+}
+
+
+def import_times(command: str, cwd: Path) -> dict[str, float]:
+    """Run task-tui with `-X importtime` and return the cumulative import time in ms of every module it imports."""
+    # task-tui writes its log to the working directory
+    completed_process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-m", "task_tui.main", command],
+        capture_output=True,
+        text=True,
+        cwd=cwd,
+        env={**os.environ, "PYTHONPATH": str(SRC_DIR)},
+        timeout=60,
+    )
+    times: dict[str, float] = {}
+    for line in completed_process.stderr.splitlines():
+        match = IMPORT_TIME_LINE.match(line)
+        if match:
+            # nested imports are included in the time of the top-level import, which has a single space of indentation
+            nested = len(match.group(2)) > 1
+            times[match.group(3)] = 0.0 if nested else int(match.group(1)) / 1000
+    return times
+
+
+@pytest.mark.parametrize("command", IMPORT_BUDGETS)
+def test_commands_import_within_budget(command: str, tmp_path: Path) -> None:
+    # the first run writes the bytecode caches
+    import_times(command, tmp_path)
+    times = import_times(command, tmp_path)
+
+    # `python -m` runs task_tui.main as `__main__`, the package is imported first
+    assert "task_tui" in times
+    assert not FORBIDDEN_IMPORTS[command] & times.keys()
+    slowest = sorted(times.items(), key=lambda item: item[1])[-5:]
+    assert sum(times.values()) <= IMPORT_BUDGETS[command], f"slowest imports: {slowest}"
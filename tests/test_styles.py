@@ -0,0 +1,127 @@
+from datetime import datetime
+from typing import Any
+from uuid import UUID
+
+import pytest
+from rich.color import Color
+from rich.style import Style
+
+from task_tui.config import Config
+from task_tui.data_models import Annotation, Status, Task, VirtualTag
+from task_tui.styles import ColorRules
+
+RED = Style(color=Color.from_ansi(1))
+GREEN = Style(color=Color.from_ansi(2))
+BLUE = Style(color=Color.from_ansi(4))
+
+
+def make_task(task_id: int = 1, **fields: object) -> Task:
+    timestamp = datetime(2024, 1, 1, 12, 0, 0)
+    return Task.model_validate(
+        {
+            "id": task_id,
+            "description": "Write the report",
+            "entry": timestamp,
+            "modified": timestamp,
+            "status": Status.PENDING,
+            "uuid": UUID(int=task_id),
+            "urgency": 0.0,
+            **fields,
+        }
+    )
+
+
+def make_rules(precedence: str, *color_lines: str) -> ColorRules:
+    return Config("\n".join([f"rule.precedence.color {precedence}", *color_lines])).color_rules
+
+
+@pytest.mark.parametrize(
+    "fields,expected",
+    [
+        ({"project": "Home"}, RED),
+        # rules match projects leftmost, which includes the subprojects
+        ({"project": "Home.Garden"}, RED),
+        ({"project": "Work"}, Style()),
+        ({}, BLUE),
+    ],
+)
+def test_project_rules(fields: dict[str, Any], expected: Style) -> None:
+    rules = make_rules("project.", "color.project.Home red", "color.project.none blue")
+
+    assert rules.style_for(make_task(**fields)) == expected
+
+
+@pytest.mark.parametrize(
+    "fields,expected",
+    [
+        ({"tags": {"next"}}, RED),
+        ({"tags": {"someday"}}, Style()),
+        ({}, BLUE),
+    ],
+)
+def test_tag_rules(fields: dict[str, Any], expected: Style) -> None:
+    rules = make_rules("tag.", "color.tag.next red", "color.tag.none blue")
+
+    assert rules.style_for(make_task(**fields)) == expected
+
+
+@pytest.mark.parametrize(
+    "fields,expected",
+    [
+        ({}, RED),
+        ({"description": "Call the plumber", "annotations": [Annotation(description="about the report")]}, RED),
+        ({"description": "Call the plumber"}, Style()),
+    ],
+)
+def test_keyword_rules(fields: dict[str, Any], expected: Style) -> None:
+    rules = make_rules("keyword.", "color.keyword.report red")
+
+    assert rules.style_for(make_task(**fields)) == expected
+
+
+@pytest.mark.parametrize(
+    "fields,expected",
+    [
+        ({"priority": "H"}, RED),
+        ({"priority": "L"}, Style()),
+        ({}, BLUE),
+        # UDAs that aren't modelled are kept as extra fields of the task, `uda.estimate` comes before `uda.priority.none`
+        ({"estimate": "2h"}, GREEN),
+    ],
+)
+def test_uda_rules(fields: dict[str, Any], expected: Style) -> None:
+    rules = make_rules("uda.", "color.uda.priority.H red", "color.uda.priority.none blue", "color.uda.estimate green")
+
+    assert rules.style_for(make_task(**fields)) == expected
+
+
+def test_earlier_precedence_entries_win() -> None:
+    rules = make_rules(
+        "overdue,tag.,project.",
+        "color.overdue red",
+        "color.tag.next green underline",
+        "color.project.Home blue on blue",
+        # not in the precedence, so it doesn't style tasks
+        "color.due bold",
+    )
+    task = make_task(project="Home", tags={"next"}, virtual_tags={VirtualTag.OVERDUE, VirtualTag.DUE})
+
+    assert rules.style_for(task) == Style(color=Color.from_ansi(1), bgcolor=Color.from_ansi(4), underline=True)
+
+
+def test_rules_of_an_entry_are_applied_in_alphabetical_order() -> None:
+    rules = make_rules("tag.", "color.tag.b green", "color.tag.a red")
+
+    # `tag.a` comes first, so it wins
+    assert rules.style_for(make_task(tags={"a", "b"})) == RED
+
+
+def test_styles_are_memoized_by_the_attributes_the_rules_look_at() -> None:
+    rules = make_rules("overdue,project.", "color.overdue red", "color.project.Home blue")
+    tasks = [make_task(task_id, project="Home" if task_id % 2 else None, description=f"task {task_id}") for task_id in range(1, 101)]
+
+    styles = [rules.style_for(task) for task in tasks]
+
+    assert styles[0] == BLUE and styles[1] == Style()
+    # descriptions, tags and virtual tags without a rule don't matter, so only the two projects are styled
+    assert rules._style_for_key.cache_info().misses == 2
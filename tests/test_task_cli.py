@@ -1,4 +1,7 @@
-from datetime import datetime
+import asyncio
+from contextlib import aclosing
+from datetime import UTC, datetime
+from pathlib import Path
 from types import SimpleNamespace
 from typing import cast
 from uuid import uuid4
@@ -6,7 +9,7 @@ from uuid import uuid4
 import pytest
 
 from task_tui.data_models import ContextInfo, Status, Task
-from task_tui.task_cli import TaskCli
+from task_tui.task_cli import AsyncTaskCli, TaskCli
 
 
 def _make_task(start: datetime | None = None) -> Task:
@@ -96,6 +99,48 @@ def test_annotate_task_uses_task_cli(cli_with_spy: tuple[TaskCli, list[tuple[str
     assert calls[1] == (str(task.uuid), "annotate", "note")
 
 
+def test_bulk_mutations_pass_all_uuids_to_one_call(monkeypatch: pytest.MonkeyPatch) -> None:
+    calls: list[tuple[str, ...]] = []
+
+    async def fake_run(self: AsyncTaskCli, *args: str) -> SimpleNamespace:
+        calls.append(args)
+        return SimpleNamespace(stdout="", stderr="", returncode=0)
+
+    monkeypatch.setattr(AsyncTaskCli, "_run_task", fake_run, raising=False)
+    cli = AsyncTaskCli()
+    tasks = [_make_task(), _make_task()]
+    uuids = tuple(str(task.uuid) for task in tasks)
+
+    async def mutate() -> None:
+        await cli.set_tasks_done(tasks)
+        await cli.modify_tasks(tasks, "project:Home +tag")
+        await cli.delete_tasks([])
+
+    asyncio.run(mutate())
+
+    bulk_overrides = ("rc.confirmation=off", "rc.bulk=0", "rc.recurrence.confirmation=no")
+    assert calls == [
+        (*bulk_overrides, *uuids, "done"),
+        (*bulk_overrides, *uuids, "modify", "project:Home", "+tag"),
+    ]
+
+
+def test_async_bulk_mutation_raises_on_failure(monkeypatch: pytest.MonkeyPatch) -> None:
+    calls: list[tuple[str, ...]] = []
+
+    async def fake_run(self: AsyncTaskCli, *args: str) -> SimpleNamespace:
+        calls.append(args)
+        return SimpleNamespace(stdout="", stderr="Task not found", returncode=1)
+
+    monkeypatch.setattr(AsyncTaskCli, "_run_task", fake_run, raising=False)
+    tasks = [_make_task(), _make_task()]
+
+    with pytest.raises(ValueError, match="Task not found"):
+        asyncio.run(AsyncTaskCli().stop_tasks(tasks))
+    assert len(calls) == 1
+    assert calls[0][-3:] == (str(tasks[0].uuid), str(tasks[1].uuid), "stop")
+
+
 def test_delete_task_uses_task_cli(cli_with_spy: tuple[TaskCli, list[tuple[str, ...]]]) -> None:
     cli, calls = cli_with_spy
     task = _make_task()
@@ -145,7 +190,7 @@ def test_export_tasks_applies_context_filter(monkeypatch: pytest.MonkeyPatch) ->
         if args == ("_get", "rc.context.work"):
             return SimpleNamespace(stdout="", returncode=0)
         if "export" in args:
-            return SimpleNamespace(stdout=task_json, returncode=0)
+            return SimpleNamespace(stdout=f"[\n{task_json}\n]", returncode=0)
         return SimpleNamespace(stdout="", returncode=0)
 
     monkeypatch.setattr(TaskCli, "_run_task", fake_run, raising=False)
@@ -154,5 +199,127 @@ def test_export_tasks_applies_context_filter(monkeypatch: pytest.MonkeyPatch) ->
     tasks = cli.export_tasks("next")
 
     export_calls = [call for call in calls if "export" in call]
-    assert export_calls == [("rc.json.array=0", "rc.defaultheight=0", "project:Work", "+next", "export", "next")]
+    assert export_calls == [("rc.json.array=1", "rc.defaultheight=0", "project:Work", "+next", "export", "next")]
     assert len(tasks) == 1
+
+
+def test_async_export_tasks_applies_context_filter(monkeypatch: pytest.MonkeyPatch) -> None:
+    calls: list[tuple[str, ...]] = []
+    task_json = (
+        '{"id":1,"description":"task","entry":"2024-01-01T00:00:00","modified":"2024-01-01T00:00:00",'
+        '"status":"pending","uuid":"00000000-0000-0000-0000-000000000001","urgency":0.0}'
+    )
+
+    async def fake_run(self: AsyncTaskCli, *args: str) -> SimpleNamespace:
+        calls.append(args)
+        if args == ("_get", "rc.context"):
+            return SimpleNamespace(stdout="work\n", returncode=0)
+        if args == ("_get", "rc.context.work.read"):
+            return SimpleNamespace(stdout="project:Work +next\n", returncode=0)
+        if "export" in args:
+            return SimpleNamespace(stdout=f"[\n{task_json}\n]", returncode=0)
+        return SimpleNamespace(stdout="", returncode=0)
+
+    monkeypatch.setattr(AsyncTaskCli, "_run_task", fake_run, raising=False)
+    cli = AsyncTaskCli()
+
+    tasks = asyncio.run(cli.export_tasks("next"))
+
+    export_calls = [call for call in calls if "export" in call]
+    assert export_calls == [("rc.json.array=1", "rc.defaultheight=0", "project:Work", "+next", "export", "next")]
+    assert len(tasks) == 1
+
+
+def test_async_modify_task_raises_on_failure(monkeypatch: pytest.MonkeyPatch) -> None:
+    async def fake_run(self: AsyncTaskCli, *args: str) -> SimpleNamespace:
+        return SimpleNamespace(stdout="", stderr="No such attribute\n", returncode=1)
+
+    monkeypatch.setattr(AsyncTaskCli, "_run_task", fake_run, raising=False)
+
+    with pytest.raises(ValueError, match="No such attribute"):
+        asyncio.run(AsyncTaskCli().modify_task(_make_task(), "foo:bar"))
+
+
+def test_async_run_task_kills_cancelled_process() -> None:
+    cli = AsyncTaskCli()
+    cli.base_command = "sleep"
+
+    async def run_and_cancel() -> float:
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        run = asyncio.create_task(cli._run_task("10"))
+        await asyncio.sleep(0.1)
+        run.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await run
+        return loop.time() - started
+
+    assert asyncio.run(run_and_cancel()) < 5
+
+
+def test_export_arguments_restrict_to_modified_tasks() -> None:
+    cli = AsyncTaskCli()
+
+    arguments = cli._export_arguments("next", "project:A or project:B", datetime(2024, 3, 4, 5, 6, 7, tzinfo=UTC))
+
+    assert arguments == [
+        "rc.json.array=0",
+        "rc.defaultheight=0",
+        "(",
+        "project:A",
+        "or",
+        "project:B",
+        ")",
+        "modified.after:20240304T050607Z",
+        "export",
+        "next",
+    ]
+    assert cli._parse_export("") == []
+
+
+def test_stream_tasks_yields_before_export_finishes(tmp_path: Path) -> None:
+    task_json = (
+        '{"id":%d,"description":"task","entry":"2024-01-01T00:00:00","modified":"2024-01-01T00:00:00",'
+        '"status":"pending","uuid":"00000000-0000-0000-0000-00000000000%d","urgency":0.0}'
+    )
+    fake_task = tmp_path / "task"
+    # exec, so that killing the process closes stdout instead of leaving an orphaned sleep holding it open
+    fake_task.write_text(f"#!/bin/sh\necho '{task_json % (1, 1)}'\necho\nexec sleep 10\n")
+    fake_task.chmod(0o755)
+    cli = AsyncTaskCli()
+    cli.base_command = str(fake_task)
+
+    async def read_first() -> tuple[list[int], float]:
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        ids: list[int] = []
+        async with aclosing(cli.stream_tasks("next", read_filter="")) as stream:
+            async for task in stream:
+                ids.append(task.id)
+                break
+        return ids, loop.time() - started
+
+    ids, elapsed = asyncio.run(read_first())
+
+    assert ids == [1]
+    assert elapsed < 5
+
+
+def test_report_columns_are_read_from_the_loaded_config(monkeypatch: pytest.MonkeyPatch) -> None:
+    calls: list[tuple[str, ...]] = []
+
+    async def fake_run(self: AsyncTaskCli, *args: str) -> SimpleNamespace:
+        calls.append(args)
+        return SimpleNamespace(stdout="report.next.columns id,description\nreport.next.labels ID,Description\n", returncode=0)
+
+    monkeypatch.setattr(AsyncTaskCli, "_run_task", fake_run, raising=False)
+    cli = AsyncTaskCli()
+
+    async def load() -> list[list[tuple[str, str]]]:
+        await cli.get_config()
+        return [await cli.get_report_columns("next") for _ in range(2)]
+
+    assert asyncio.run(load()) == [[("id", "ID"), ("description", "Description")]] * 2
+    assert calls == [("show", "rc.defaultwidth=0")]
+    with pytest.raises(ValueError, match="report missing"):
+        asyncio.run(cli.get_report_columns("missing"))
@@ -0,0 +1,81 @@
+from datetime import UTC, datetime, timedelta
+from uuid import UUID
+
+import pytest
+
+from task_tui.config import Config
+from task_tui.data_models import Annotation, Status, Task, VirtualTag
+from task_tui.urgency import UrgencyModel
+
+NOW = datetime(2024, 1, 10, 12, 0, 0, tzinfo=UTC)
+
+
+def make_task(task_id: int, **fields: object) -> Task:
+    return Task.model_validate(
+        {
+            "id": task_id,
+            "description": f"task {task_id}",
+            "entry": NOW,
+            "modified": NOW,
+            "status": Status.PENDING,
+            "uuid": UUID(int=task_id),
+            "urgency": 0.0,
+        }
+        | fields
+    )
+
+
+@pytest.mark.parametrize(
+    "fields,expected",
+    [
+        ({}, 0.0),
+        # project 1, the `next` tag 15, one tag 0.8 and 73 of 365 days of age 0.4
+        ({"project": "work", "tags": {"next"}, "entry": NOW - timedelta(days=73, hours=20)}, 17.2),
+        # due now 8.8, priority H 6 and two annotations 0.9
+        ({"due": NOW, "priority": "H", "annotations": [Annotation(description="a"), Annotation(description="b")]}, 15.7),
+        # a week overdue 12, active 4 and scheduled in the past 5
+        ({"due": NOW - timedelta(days=7), "start": NOW, "scheduled": NOW - timedelta(days=1)}, 21.0),
+        # more than two weeks until due 2.4 and scheduled in the future 0
+        ({"due": NOW + timedelta(days=20), "scheduled": NOW + timedelta(days=1)}, 2.4),
+        ({"status": Status.WAITING, "wait": NOW + timedelta(days=1)}, -3.0),
+        ({"virtual_tags": {VirtualTag.BLOCKED}}, -5.0),
+        ({"virtual_tags": {VirtualTag.BLOCKING}}, 8.0),
+    ],
+)
+def test_default_coefficients(fields: dict[str, object], expected: float) -> None:
+    assert UrgencyModel(Config("")).compute([make_task(1, **fields)], NOW) == [pytest.approx(expected)]
+
+
+def test_configured_coefficients() -> None:
+    config = Config(
+        "\n".join(
+            [
+                "urgency.user.project.work.coefficient   2.0",
+                "urgency.user.keyword.urgent.coefficient 3.0",
+                "urgency.uda.estimate.coefficient        0.5",
+                "urgency.project.coefficient             0",
+                "urgency.age.max                         10",
+            ]
+        )
+    )
+    model = UrgencyModel(config)
+    tasks = [
+        make_task(1, project="work.meetings", description="urgent call"),
+        make_task(2, project="workshop", estimate="2h"),
+        make_task(3, entry=NOW - timedelta(days=15)),
+    ]
+
+    assert model.compute(tasks, NOW) == [pytest.approx(5.0), pytest.approx(0.5), pytest.approx(2.0)]
+
+
+def test_blocking_tasks_inherit_the_urgency_of_the_tasks_they_block() -> None:
+    model = UrgencyModel(Config("urgency.inherit 1"))
+    blocked = make_task(1, tags={"next"}, virtual_tags={VirtualTag.BLOCKED, VirtualTag.BLOCKING})
+    blocked_twice = make_task(2, virtual_tags={VirtualTag.BLOCKED})
+    blocking = make_task(3, virtual_tags={VirtualTag.BLOCKING})
+    dependents = {blocking.uuid: [blocked], blocked.uuid: [blocked_twice]}
+
+    urgencies = model.compute([blocking, blocked, blocked_twice], NOW, lambda task: dependents.get(task.uuid, []))
+
+    # `next` 15, one tag 0.8, blocked -5 and blocking 8 is 18.8, plus 0.01 for blocking
+    assert urgencies == [pytest.approx(18.82), pytest.approx(18.81), pytest.approx(-5.0)]
@@ -1,17 +1,19 @@
+import asyncio
+import gc
 from datetime import datetime, timedelta
-from typing import Iterable, Set, cast
+from typing import AsyncIterator, Iterable, Set, cast
 from uuid import UUID
 
+import pytest
 from rich.color import Color
 from rich.style import Style
 
 from task_tui.config import Config
 from task_tui.data_models import Status, Task, VirtualTag
-from task_tui.utils import format_vague_datetime, format_vague_duration, get_style_for_task
+from task_tui.utils import batched_async, format_vague_datetime, format_vague_duration, gc_paused, get_style_for_task, vague_duration_changes_in
 
 
 def make_config(color_lines: Iterable[str], precedence: str) -> Config:
-    # Avoid blank or malformed lines; Config._get_config expects key and value on each line
     cfg_str = "\n".join(
         [
             f"rule.precedence.color {precedence}",
@@ -118,3 +120,45 @@ class TestVagueFormatting:
         assert format_vague_datetime(reference + timedelta(days=1), reference) == "1d"
         assert format_vague_datetime(reference - timedelta(hours=2), reference) == "-2h"
         assert format_vague_datetime(None, reference) == ""
+
+    @pytest.mark.parametrize(
+        "seconds,expected",
+        [
+            (-42.5, 0.5),
+            (-(3 * 60 + 10), 50),
+            (2 * 3600 + 1800, 1800.001),
+            (-86400 * 20, 86400),
+            (86400 * 400, 86400 * 16.75 + 0.001),
+            (0.5, 1.5),
+        ],
+    )
+    def test_vague_duration_changes_in(self, seconds: float, expected: float) -> None:
+        changes_in = vague_duration_changes_in(seconds)
+
+        assert changes_in == pytest.approx(expected)
+        assert format_vague_duration(seconds - changes_in) != format_vague_duration(seconds)
+
+
+def test_batched_async_groups_items() -> None:
+    async def numbers() -> AsyncIterator[int]:
+        for number in range(5):
+            yield number
+
+    async def collect() -> list[list[int]]:
+        return [batch async for batch in batched_async(numbers(), 2)]
+
+    assert asyncio.run(collect()) == [[0, 1], [2, 3], [4]]
+
+
+def test_gc_paused_restores_collector_state() -> None:
+    with gc_paused():
+        assert not gc.isenabled()
+    assert gc.isenabled()
+
+    gc.disable()
+    try:
+        with gc_paused():
+            pass
+        assert not gc.isenabled()
+    finally:
+        gc.enable()